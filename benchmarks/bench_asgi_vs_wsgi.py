@@ -0,0 +1,115 @@
+"""
+Slot search throughput and latency: the DRF view under WSGI vs the async view under ASGI.
+
+Both applications are driven in-process with the same number of concurrent
+clients: WSGI through a thread pool (one thread per worker, as a threaded
+server would), ASGI through asyncio tasks on a single event loop. Two mixes
+are measured: pre-warmed dates (the cache-hit path that dominates traffic) and
+a cold cache where every date is asked for MISS_REPEAT times, so one request
+in MISS_REPEAT computes its slots.
+"""
+from benchmarks.common import benchmark_database
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time, timedelta
+import asyncio
+import statistics
+import time as clock
+
+CONCURRENCY = 32
+REQUESTS = 2000
+DAYS = 14
+MISS_REPEAT = 4
+
+
+def percentiles(latencies):
+    cuts = statistics.quantiles(latencies, n=100)
+    return cuts[49], cuts[94], cuts[98]
+
+
+def report(name, elapsed, latencies):
+    p50, p95, p99 = percentiles(latencies)
+    print(f"{name:>5} {len(latencies) / elapsed:>9.0f} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f}")
+
+
+def run_wsgi(paths):
+    from django.db import connection
+    from django.test import Client
+
+    def fetch(path):
+        started = clock.perf_counter()
+        response = Client().get(path)
+        assert response.status_code == 200, response.status_code
+        return (clock.perf_counter() - started) * 1000
+
+    def fetch_and_close(path):
+        try:
+            return fetch(path)
+        finally:
+            connection.close()
+
+    started = clock.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        latencies = list(pool.map(fetch_and_close, paths))
+    return clock.perf_counter() - started, latencies
+
+
+async def run_asgi(paths):
+    from django.test import AsyncClient
+
+    queue = asyncio.Queue()
+    for path in paths:
+        queue.put_nowait(path)
+    latencies = []
+
+    async def worker():
+        client = AsyncClient()
+        while not queue.empty():
+            path = queue.get_nowait()
+            started = clock.perf_counter()
+            response = await client.get(path)
+            assert response.status_code == 200, response.status_code
+            latencies.append((clock.perf_counter() - started) * 1000)
+
+    started = clock.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return clock.perf_counter() - started, latencies
+
+
+def run():
+    from django.core.cache import cache
+    from core.models import User, Availability
+    from core.services.booking_service import BookingService
+    from core.services.slot_cache import SlotCache
+
+    owner = User.objects.create(name="Owner", email="owner@example.com", timezone="UTC")
+    for weekday in range(7):
+        Availability.objects.create(calendar_owner=owner, day_of_week=weekday,
+                                    start_time=time(9, 0), end_time=time(17, 0))
+
+    def reset_cache(warm_days=()):
+        cache.clear()
+        if SlotCache.backend.local is not None:
+            SlotCache.backend.local.clear()
+        for day in warm_days:
+            BookingService.get_available_slots(owner, day)
+
+    def paths(prefix, days):
+        return [f"{prefix}/calendar/{owner.id}/available-slots/?date={days[i % len(days)]}" for i in range(REQUESTS)]
+
+    warm_days = [date.today() + timedelta(days=offset) for offset in range(1, DAYS + 1)]
+    cold_days = [date.today() + timedelta(days=offset) for offset in range(1, REQUESTS // MISS_REPEAT + 1)]
+
+    print(f"{CONCURRENCY} concurrent clients, {REQUESTS} requests")
+    for mix, days, warm in (("cache hits", warm_days, warm_days),
+                            (f"cold cache, 1 miss in {MISS_REPEAT}", cold_days, ())):
+        print(f"\n{mix}")
+        print(f"{'':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        reset_cache(warm)
+        report("wsgi", *run_wsgi(paths("/api", days)))
+        reset_cache(warm)
+        report("asgi", *asyncio.run(run_asgi(paths("/api/async", days))))
+
+
+if __name__ == '__main__':
+    with benchmark_database():
+        run()
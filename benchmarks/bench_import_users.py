@@ -0,0 +1,55 @@
+"""
+Bulk import of calendar owners: ImportService against one serializer save per row.
+
+Both sides import the same CSV of owners with one weekly rule each; the per-row
+baseline is what onboarding through the users and set-availability APIs costs.
+"""
+from benchmarks.common import benchmark_database
+from io import StringIO
+import time
+
+ROWS = 10000
+
+
+def csv_text(prefix):
+    return "name,email,timezone,day_of_week,start_time,end_time\n" + "".join(
+        f"Owner {index},{prefix}{index}@example.com,UTC,{index % 7},09:00,17:00\n" for index in range(ROWS)
+    )
+
+
+def per_row_import(text):
+    from core.models import Availability
+    from core.serializers import UserSerializer
+    import csv
+
+    for record in csv.DictReader(StringIO(text)):
+        serializer = UserSerializer(data=record)
+        serializer.is_valid(raise_exception=True)
+        owner = serializer.save()
+        Availability.objects.create(
+            calendar_owner=owner, day_of_week=int(record['day_of_week']),
+            start_time=record['start_time'], end_time=record['end_time'],
+        )
+
+
+def run():
+    from core.services.import_service import ImportService
+
+    bulk_text = csv_text("bulk")
+    started = time.perf_counter()
+    report = ImportService.import_records(ImportService.read_csv(StringIO(bulk_text)))
+    bulk_seconds = time.perf_counter() - started
+    assert report['failed'] == 0, report['errors'][:5]
+
+    started = time.perf_counter()
+    per_row_import(csv_text("row"))
+    row_seconds = time.perf_counter() - started
+
+    print(f"{ROWS} owners with one rule each")
+    print(f"ImportService, chunks of 1000: {bulk_seconds:7.2f} s ({ROWS / bulk_seconds:8.0f} rows/s)")
+    print(f"one serializer save per row:   {row_seconds:7.2f} s ({ROWS / row_seconds:8.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    with benchmark_database():
+        run()
@@ -0,0 +1,54 @@
+"""
+ListMeetingsView query cost as an owner's meeting history grows.
+
+The date-range and upcoming queries should stay flat: they seek into the
+(calendar_owner, date, ...) indexes instead of scanning the owner's history.
+"""
+from benchmarks.common import benchmark_database, measure
+from datetime import date, time, timedelta
+from django.db import connection
+
+
+def seed_history(owner, days, meetings_per_day=8):
+    from core.models import Meeting
+
+    first_day = date.today() - timedelta(days=days)
+    Meeting.objects.bulk_create([
+        Meeting(
+            calendar_owner=owner, invitee_name="Invitee", invitee_email="invitee@example.com",
+            date=first_day + timedelta(days=offset), start_time=time(9 + slot, 0), end_time=time(9 + slot, 30),
+            status='booked',
+        )
+        for offset in range(days + 30)
+        for slot in range(meetings_per_day)
+    ], batch_size=2000)
+
+
+def run():
+    from core.models import User
+    from core.services.meeting_service import MeetingService
+
+    start_date = date.today()
+    end_date = start_date + timedelta(days=7)
+    print(f"{'history (days)':>15} {'meetings':>9} {'range ms':>9} {'upcoming ms':>12}")
+
+    for index, days in enumerate((30, 365, 3650)):
+        owner = User.objects.create(name=f"Owner {index}", email=f"owner{index}@example.com", timezone="UTC")
+        seed_history(owner, days)
+
+        range_query = lambda: list(MeetingService.list_meetings(owner, start_date, end_date)  # noqa: E731
+                                   .order_by('date', 'start_time', 'id')[:10])
+        upcoming_query = lambda: list(MeetingService.list_meetings(owner, upcoming=True)  # noqa: E731
+                                      .order_by('date', 'start_time', 'id')[:10])
+        print(f"{days:>15} {owner.meetings.count():>9} {measure(range_query):>9.3f} {measure(upcoming_query):>12.3f}")
+
+    queryset = MeetingService.list_meetings(owner, start_date, end_date).order_by('date', 'start_time', 'id')[:10]
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        print("\nPlan:", *(row[-1] for row in cursor.fetchall()), sep="\n  ")
+
+
+if __name__ == '__main__':
+    with benchmark_database():
+        run()
@@ -0,0 +1,56 @@
+"""
+Per-row cost of rendering meeting listings: MeetingSerializer + JSONRenderer vs the values() row encoders.
+
+Both sides include the database read, since skipping model instantiation is part
+of the saving; the export rows compare DjangoJSONEncoder with DjangoRowEncoder.
+"""
+from benchmarks.common import benchmark_database, measure
+from datetime import date, time, timedelta
+
+
+def run():
+    from django.core.serializers.json import DjangoJSONEncoder
+    from rest_framework.renderers import JSONRenderer
+    from core.models import User, Meeting
+    from core.serializers import MeetingSerializer
+    from core.services.json_rows import DjangoRowEncoder, drf_row_encoder
+    from core.services.meeting_service import EXPORT_FIELDS
+
+    owner = User.objects.create(name="Owner", email="owner@example.com", timezone="UTC")
+    Meeting.objects.bulk_create([
+        Meeting(
+            calendar_owner=owner, invitee_name=f"Invitee {index}", invitee_email=f"invitee{index}@example.com",
+            date=date.today() + timedelta(days=index // 8), start_time=time(9 + index % 8, 0),
+            end_time=time(9 + index % 8, 30), status='booked',
+        )
+        for index in range(1000)
+    ])
+    renderer = JSONRenderer()
+    django_encoder = DjangoRowEncoder(Meeting, EXPORT_FIELDS)
+
+    print(f"{'rows':>5} {'drf us/row':>11} {'fast us/row':>12} {'export us/row':>14} {'fast export us/row':>19}")
+    for rows in (10, 100, 1000):
+        # A fresh queryset per call, so neither side reuses a cached result
+        meetings = lambda: Meeting.objects.order_by('date', 'start_time', 'id')[:rows]  # noqa: E731
+
+        def drf_path():
+            return renderer.render(MeetingSerializer(meetings(), many=True).data)
+
+        def fast_path():
+            encoder = drf_row_encoder(MeetingSerializer, JSONRenderer)
+            return encoder.encode_list(meetings().values(*encoder.sources)).encode()
+
+        assert drf_path() == fast_path()
+        export_rows = list(meetings().values(*EXPORT_FIELDS))
+        json_encoder = DjangoJSONEncoder(separators=(',', ':'))
+        export = lambda: [json_encoder.encode(row) for row in export_rows]  # noqa: E731
+        fast_export = lambda: [django_encoder.encode(row) for row in export_rows]  # noqa: E731
+
+        timings = [measure(operation, repeat=20) * 1000 / rows
+                   for operation in (drf_path, fast_path, export, fast_export)]
+        print(f"{rows:>5} {timings[0]:>11.2f} {timings[1]:>12.2f} {timings[2]:>14.2f} {timings[3]:>19.2f}")
+
+
+if __name__ == '__main__':
+    with benchmark_database():
+        run()
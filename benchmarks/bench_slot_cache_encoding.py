@@ -0,0 +1,41 @@
+"""
+Size and decode cost of one cached slot day: pickled slot dicts vs packed start minutes.
+
+The row size is what the database cache stores (base64 of the pickle). The
+decode columns time the cache-side unpickle alone and the full path to the
+slots a response needs.
+"""
+from benchmarks.common import measure
+from core.services import free_time
+from core.services.booking_service import BookingService
+from datetime import date
+import base64
+import pickle
+
+
+def legacy_entry(starts, search_date):
+    # The format cached before entries were packed
+    return {'calendar_owner': 1, 'search_date': search_date, 'time_slots': free_time.slots_from_starts(starts)}
+
+
+def run():
+    search_date = date(2025, 1, 27)
+    repeat = 2000
+    print(f"{'slots':>6} {'format':>7} {'row bytes':>10} {'unpickle us':>12} {'to slots us':>12}")
+
+    for slot_count in (1, 8, 23):
+        starts = [free_time.SLOT_MINUTES * index for index in range(slot_count)]
+        formats = (
+            ('dicts', pickle.dumps(legacy_entry(starts, search_date)), lambda value: value),
+            ('packed', pickle.dumps(free_time.pack_starts(starts)),
+             lambda value: BookingService.day_slots(1, search_date, value)),
+        )
+        for name, pickled, decode in formats:
+            row_bytes = len(base64.b64encode(pickled))
+            unpickle = measure(lambda: [pickle.loads(pickled) for _ in range(repeat)], repeat=5) * 1000 / repeat
+            to_slots = measure(lambda: [decode(pickle.loads(pickled)) for _ in range(repeat)], repeat=5) * 1000 / repeat
+            print(f"{slot_count:>6} {name:>7} {row_bytes:>10} {unpickle:>12.2f} {to_slots:>12.2f}")
+
+
+if __name__ == '__main__':
+    run()
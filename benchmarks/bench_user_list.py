@@ -0,0 +1,65 @@
+"""
+UserListCreateView at tenant scale: prefix search, cursor pages and full dumps.
+
+Compares the Lower() range search with istartswith, a deep cursor page with the
+first one, and the peak Python memory of a streamed dump with serializing the
+whole table at once. The plan of the range search should use user_email_lower_idx.
+"""
+from benchmarks.common import benchmark_database, measure
+from django.db import connection
+import tracemalloc
+
+USERS = 50000
+
+
+def peak_memory_mb(operation):
+    tracemalloc.start()
+    try:
+        operation()
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def run():
+    from django.test import Client
+    from core.models import User
+    from core.pagenation import UserCursorPagination
+    from core.serializers import UserSerializer
+    from core.services.user_service import UserService
+
+    User.objects.bulk_create([
+        User(name=f"User {index:06d}", email=f"user{index:06d}@example.com") for index in range(USERS)
+    ], batch_size=5000)
+    client = Client()
+    last_id = User.objects.order_by('-id').values_list('id', flat=True)[0]
+
+    range_search = lambda: list(UserService.search_users(email_prefix="USER0421"))  # noqa: E731
+    like_search = lambda: list(User.objects.filter(email__istartswith="USER0421").order_by('id'))  # noqa: E731
+    print(f"{USERS} users")
+    print(f"prefix search, Lower() range:  {measure(range_search):8.3f} ms")
+    print(f"prefix search, istartswith:    {measure(like_search):8.3f} ms")
+
+    # A cursor pointing 100 users before the end of the table
+    cursor = UserCursorPagination().make_cursor([last_id - 100])
+    last_page = lambda: client.get('/api/users/', {'cursor': cursor})  # noqa: E731
+    print(f"last cursor page (100 users):  {measure(last_page, 20):8.3f} ms")
+    print(f"first cursor page (100 users): {measure(lambda: client.get('/api/users/'), 20):8.3f} ms")
+
+    def streamed_dump():
+        for _ in client.get('/api/users/', {'stream': 'true'}).streaming_content:
+            pass
+
+    print(f"peak memory, streamed dump:    {peak_memory_mb(streamed_dump):8.1f} MB")
+    serialized_table = lambda: UserSerializer(User.objects.all(), many=True).data  # noqa: E731
+    print(f"peak memory, serialized table: {peak_memory_mb(serialized_table):8.1f} MB")
+
+    sql, params = UserService.search_users(email_prefix="user0421").query.sql_with_params()
+    with connection.cursor() as db_cursor:
+        db_cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        print("\nPlan:", *(row[-1] for row in db_cursor.fetchall()), sep="\n  ")
+
+
+if __name__ == '__main__':
+    with benchmark_database():
+        run()
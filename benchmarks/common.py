@@ -0,0 +1,50 @@
+"""
+Shared setup for the benchmark scripts.
+
+Benchmarks run against a throwaway test database, never the development one:
+
+    python -m benchmarks.bench_list_meetings
+
+It is file-backed, so concurrent clients wait on SQLite's write lock as in production.
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'calendar_system.settings')
+os.environ.setdefault('TEST_DATABASE_NAME', 'test_db.sqlite3')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+from django.test.runner import DiscoverRunner  # noqa: E402
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Create the test database for the duration of a benchmark and drop it afterwards.
+    """
+    setup_test_environment()
+    runner = DiscoverRunner(verbosity=0)
+    old_config = runner.setup_databases()
+    try:
+        yield
+    finally:
+        runner.teardown_databases(old_config)
+        teardown_test_environment()
+
+
+def measure(operation, repeat=50):
+    """
+    Median wall time of operation() in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 from pathlib import Path
+import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -80,6 +81,11 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # In-memory by default; the threaded booking tests switch to a temporary file of their own.
+        # TEST_DATABASE_NAME=test_db.sqlite3 runs everything against a file, as the benchmarks do.
+        'TEST': {
+            'NAME': os.environ.get('TEST_DATABASE_NAME'),
+        },
     }
 }
 
@@ -90,6 +96,25 @@ CACHES = {
     }
 }
 
+# In-process LRU tier in front of the default cache for computed time slots (0 disables it)
+SLOT_CACHE_LOCAL_MAX_ENTRIES = 1024
+SLOT_CACHE_LOCAL_TIMEOUT = 60  # seconds
+
+# Single-flight slot computation on cache misses
+SLOT_CACHE_LEASE_TIMEOUT = 10  # seconds a computing caller holds its lease
+SLOT_CACHE_LEASE_WAIT = 2  # seconds other callers wait for its result before computing themselves
+SLOT_CACHE_STALE_WINDOW = 0  # seconds the previous slots may be served during a recomputation (0 disables it)
+
+# Age at which a meeting change is listed by the changes feed. Bookings stamp last_modified after taking
+# the owner-day lock, so only the insert itself (and the free-slot refresh) runs between stamp and commit
+MEETING_CHANGES_SETTLE_SECONDS = 5
+
+# Threads available to the async views for blocking work (slot computation, booking transactions)
+ASYNC_SYNC_POOL_SIZE = 8
+
+# Materialized per-day free slots (core.FreeSlotDay); run rebuild_free_slot_store after enabling it
+FREE_SLOT_STORE_ENABLED = False
+
 
 
 # Password validation
@@ -0,0 +1,145 @@
+"""
+Async (ASGI) variants of the slot search and booking APIs.
+
+DRF views are synchronous, so these are plain Django async views returning the
+same JSON as their DRF counterparts. Cache hits and owner lookups use Django's
+async cache and ORM APIs. Pieces that only exist synchronously (slot computation,
+serializer validation, the booking transaction) run in a bounded thread pool
+instead of Django's single sync thread, so a slow computation never holds up the
+event loop or the other requests' ORM calls.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views import View
+from .models import User
+from .serializers import MeetingSerializer
+from .services.booking_service import BookingService
+from .services.slot_cache import SlotCache
+from .views import SearchAvailableSlotsView, include_token, parse_date_range
+import asyncio
+import json
+
+_sync_pool = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'ASYNC_SYNC_POOL_SIZE', 8), thread_name_prefix='core-sync'
+)
+
+
+def _call_and_release(func, *args):
+    try:
+        return func(*args)
+    finally:
+        # Pool threads live outside the request cycle, so they tidy up their connection like a request would
+        close_old_connections()
+
+
+async def run_sync(func, *args):
+    """
+    Run a blocking callable in the bounded pool and await its result.
+    """
+    return await asyncio.get_running_loop().run_in_executor(_sync_pool, _call_and_release, func, *args)
+
+
+class AsyncAPIView(View):
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True  # JSON API, exempt like every DRF view
+        return view
+
+
+class AsyncSearchAvailableSlotsView(AsyncAPIView):
+    """
+    Async slot search for a specific date or date range; same parameters and response as the DRF view.
+    """
+    async def get(self, request, user_id):
+        try:
+            calendar_owner = await User.objects.aget(id=user_id)
+        except User.DoesNotExist:
+            return JsonResponse({"error": "User not found"}, status=404)
+
+        is_range = 'start_date' in request.GET or 'end_date' in request.GET
+        if is_range:
+            try:
+                start_date, end_date = parse_date_range(request.GET, SearchAvailableSlotsView.max_range_days)
+            except ValueError as e:
+                return JsonResponse({"error": str(e)}, status=400)
+        else:
+            search_date_str = request.GET.get('date')
+            if not search_date_str:
+                return JsonResponse({"error": "Date is required (YYYY-MM-DD)."}, status=400)
+            try:
+                start_date = end_date = datetime.strptime(search_date_str, "%Y-%m-%d").date()
+            except ValueError:
+                return JsonResponse({"error": "Invalid date format. Use YYYY-MM-DD."}, status=400)
+
+        # Token-less searches carry the DRF view's ETag (see slot_search_etag) and answer If-None-Match with 304
+        with_token = include_token(request.GET)
+        etag = None
+        if not with_token:
+            dates = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+            version_tag = await SlotCache.aversion_tag(calendar_owner.id, dates)
+            etag = quote_etag(f"{'range' if is_range else 'date'}-{version_tag}")
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                return not_modified
+
+        if is_range:
+            available_slots = await run_sync(
+                BookingService.get_available_slots_for_range, calendar_owner, start_date, end_date
+            )
+        else:
+            # A cache hit never leaves the event loop; a miss is computed (single-flight) in the pool
+            _, packed_starts = await SlotCache.aget(calendar_owner.id, start_date)
+            if packed_starts is None:
+                available_slots = await run_sync(BookingService.get_available_slots, calendar_owner, start_date)
+            else:
+                available_slots = BookingService.day_slots(calendar_owner.id, start_date, packed_starts)
+
+        if not with_token:
+            response = JsonResponse({"available_slots": available_slots}, safe=False)
+            response['ETag'] = etag
+            return response
+
+        if is_range:
+            token = BookingService.generate_range_booking_token(calendar_owner.id, available_slots)
+        else:
+            token = BookingService.generate_booking_token(calendar_owner.id, start_date, available_slots['time_slots'])
+        return JsonResponse({"token": token, "available_slots": available_slots}, safe=False)
+
+
+class AsyncBookAppointmentView(AsyncAPIView):
+    """
+    Async booking; same request body and response as the DRF view.
+    """
+    async def post(self, request):
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON body."}, status=400)
+
+        serializer = MeetingSerializer(data=data)
+        if not await run_sync(serializer.is_valid):
+            return JsonResponse(serializer.errors, status=400)
+
+        validated_data = serializer.validated_data
+        calendar_owner = validated_data['calendar_owner']
+        token = validated_data['token']
+        try:
+            BookingService.validate_token_and_slot(
+                calendar_owner, token, validated_data['date'], validated_data['start_time'], validated_data['end_time']
+            )
+            serializer.instance = await run_sync(BookingService.book_appointment, {
+                **validated_data,
+                'status': 'booked',
+                'token': BookingService.token_fingerprint(token),
+            })
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        await run_sync(BookingService.remove_cached_slots, calendar_owner, validated_data['date'])
+        return JsonResponse(serializer.data, status=201)
@@ -10,3 +10,10 @@ class MeetingStatus(Enum):
     @classmethod
     def choices(cls):
         return [(status.value, status.name.capitalize()) for status in cls]
+
+    @classmethod
+    def active(cls):
+        """
+        Statuses that occupy a slot in the owner's calendar.
+        """
+        return [cls.BOOKED.value, cls.RESCHEDULED.value]
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.models import User
+from core.services.free_slot_store import FreeSlotStore
+
+
+class Command(BaseCommand):
+    help = "Compare the materialized free slots with freshly computed ones and report (or fix) the differences."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', type=int, action='append', dest='owner_ids',
+                            help='Only check this owner; can be repeated')
+        parser.add_argument('--fix', action='store_true', help='Recompute the rows that differ')
+        parser.add_argument('--batch-size', type=int, default=100, help='Owners checked per batch (default: 100)')
+
+    def handle(self, *args, **options):
+        owners = User.objects.order_by('id')
+        if options['owner_ids']:
+            owners = owners.filter(id__in=options['owner_ids'])
+        owner_ids = list(owners.values_list('id', flat=True))
+
+        drift = []
+        batch_size = options['batch_size']
+        for offset in range(0, len(owner_ids), batch_size):
+            drift.extend(FreeSlotStore.find_drift(owner_ids[offset:offset + batch_size]))
+
+        for owner_id, day in drift:
+            self.stdout.write(f"Owner {owner_id} on {day}: stored slots differ")
+
+        if drift and options['fix']:
+            for owner_id in sorted({owner_id for owner_id, _ in drift}):
+                FreeSlotStore.refresh_days(owner_id, [day for drift_owner, day in drift if drift_owner == owner_id])
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(drift)} owner-days."))
+        elif drift:
+            raise CommandError(f"{len(drift)} owner-days differ; run again with --fix or rebuild_free_slot_store.")
+        else:
+            self.stdout.write(self.style.SUCCESS("The free slot store is consistent."))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.services.import_service import ImportService, IMPORT_CHUNK_SIZE, IMPORT_FORMATS
+import time
+
+
+class Command(BaseCommand):
+    help = "Create calendar owners and their availability rules from a CSV or NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, dest='import_format',
+                            help='Input format (default: from the file extension)')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE,
+                            help=f'Rows validated and written per transaction (default: {IMPORT_CHUNK_SIZE})')
+
+    def handle(self, *args, **options):
+        import_format = options['import_format'] or ImportService.format_for_file_name(options['path'])
+        if import_format is None:
+            raise CommandError("Cannot tell the format from the file name; pass --format csv or --format ndjson.")
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+
+        started = time.perf_counter()
+
+        def progress(report):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{report['rows']} rows, {report['failed']} failed, {report['users_created']} users created "
+                f"({report['rows'] / elapsed if elapsed else 0:.0f} rows/s)"
+            )
+
+        try:
+            with open(options['path'], encoding='utf-8-sig', errors='replace', newline='') as lines:
+                report = ImportService.import_records(
+                    ImportService.read(lines, import_format), options['chunk_size'], progress
+                )
+        except OSError as e:
+            raise CommandError(f"Cannot read {options['path']}: {e}")
+
+        for error in report['errors']:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['rows'] - report['failed']} of {report['rows']} rows: {report['users_created']} users "
+            f"and {report['rules_created']} availability rules created in {elapsed:.2f}s."
+        ))
+
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import now
+from datetime import timedelta
+from core.services.booking_service import BookingService
+
+
+class Command(BaseCommand):
+    help = "Delete the booking lock rows of past days."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-days', type=int, default=0,
+                            help='Also keep the locks of this many days before today (default: 0)')
+
+    def handle(self, *args, **options):
+        if options['keep_days'] < 0:
+            raise CommandError("--keep-days must not be negative.")
+        before = now().date() - timedelta(days=options['keep_days'])
+        deleted = BookingService.prune_booking_locks(before)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} booking locks of days before {before}."))
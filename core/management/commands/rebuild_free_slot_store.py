@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from django.utils.timezone import now
+from datetime import timedelta
+from core.models import User, FreeSlotDay
+from core.services.free_slot_store import FreeSlotStore
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized free slots of every owner (or the given ones) for a window of days."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', type=int, action='append', dest='owner_ids',
+                            help='Only rebuild this owner; can be repeated')
+        parser.add_argument('--start-date', help='First day to materialize (YYYY-MM-DD, default: today)')
+        parser.add_argument('--days', type=int, default=90, help='Number of days to materialize (default: 90)')
+        parser.add_argument('--batch-size', type=int, default=100, help='Owners computed per batch (default: 100)')
+
+    def handle(self, *args, **options):
+        start_date = parse_date(options['start_date']) if options['start_date'] else now().date()
+        if start_date is None:
+            raise CommandError("Invalid --start-date. Use YYYY-MM-DD.")
+        if options['days'] < 1:
+            raise CommandError("--days must be at least 1.")
+        dates = [start_date + timedelta(days=offset) for offset in range(options['days'])]
+
+        owners = User.objects.order_by('id')
+        if options['owner_ids']:
+            owners = owners.filter(id__in=options['owner_ids'])
+        owner_ids = list(owners.values_list('id', flat=True))
+
+        # Rows outside the window are dropped and materialized again on demand. A row that exists again
+        # by the time a batch is saved was written by a booking after the delete, so it is kept.
+        FreeSlotDay.objects.filter(calendar_owner_id__in=owner_ids).delete()
+
+        batch_size = options['batch_size']
+        for offset in range(0, len(owner_ids), batch_size):
+            batch = owner_ids[offset:offset + batch_size]
+            FreeSlotStore.insert_days(FreeSlotStore.compute_days(batch, dates))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Materialized {len(dates)} days for {len(owner_ids)} owners starting {start_date}."
+        ))
@@ -0,0 +1,82 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils.dateparse import parse_date
+from django.utils.timezone import now
+from datetime import timedelta
+from core.models import User
+from core.services.booking_service import BookingService
+import os
+import time
+
+
+def _init_worker():
+    # Connections inherited from the parent process must never be shared with it
+    import django
+    django.setup()
+    connections.close_all()
+
+
+def _warm_chunk(owner_ids, dates, stale_only):
+    return len(owner_ids), *BookingService.warm_slot_cache(owner_ids, dates, stale_only)
+
+
+class Command(BaseCommand):
+    help = "Precompute the available slots of every owner (or the given ones) over the next days into the slot cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', type=int, action='append', dest='owner_ids',
+                            help='Only warm this owner; can be repeated')
+        parser.add_argument('--start-date', help='First day to warm (YYYY-MM-DD, default: today)')
+        parser.add_argument('--days', type=int, default=14, help='Number of days to warm (default: 14)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Worker processes (default: CPU count; 1 runs in this process)')
+        parser.add_argument('--chunk-size', type=int, default=50,
+                            help='Owners per worker task, read with one batched query (default: 50)')
+        parser.add_argument('--stale-only', action='store_true',
+                            help='Only compute owner-days without a current cache entry, e.g. on a schedule')
+
+    def handle(self, *args, **options):
+        start_date = parse_date(options['start_date']) if options['start_date'] else now().date()
+        if start_date is None:
+            raise CommandError("Invalid --start-date. Use YYYY-MM-DD.")
+        if options['days'] < 1 or options['workers'] < 1 or options['chunk_size'] < 1:
+            raise CommandError("--days, --workers and --chunk-size must be at least 1.")
+        dates = [start_date + timedelta(days=offset) for offset in range(options['days'])]
+
+        owners = User.objects.order_by('id')
+        if options['owner_ids']:
+            owners = owners.filter(id__in=options['owner_ids'])
+        owner_ids = list(owners.values_list('id', flat=True))
+        chunk_size = options['chunk_size']
+        chunks = [owner_ids[offset:offset + chunk_size] for offset in range(0, len(owner_ids), chunk_size)]
+
+        started = time.perf_counter()
+        totals = {'owners': 0, 'warmed': 0, 'skipped': 0}
+
+        def report(owners, warmed, skipped):
+            totals['owners'] += owners
+            totals['warmed'] += warmed
+            totals['skipped'] += skipped
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{totals['owners']}/{len(owner_ids)} owners, {totals['warmed']} owner-days warmed, "
+                f"{totals['skipped']} fresh ({totals['warmed'] / elapsed if elapsed else 0:.0f} owner-days/s)"
+            )
+
+        if options['workers'] == 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                report(*_warm_chunk(chunk, dates, options['stale_only']))
+        else:
+            # Forked workers would otherwise inherit this process's open connections
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=options['workers'], initializer=_init_worker) as executor:
+                futures = [executor.submit(_warm_chunk, chunk, dates, options['stale_only']) for chunk in chunks]
+                for future in as_completed(futures):
+                    report(*future.result())
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Warmed {totals['warmed']} owner-days ({totals['skipped']} already fresh) for {len(owner_ids)} owners "
+            f"over {len(dates)} days in {elapsed:.2f}s."
+        ))
@@ -0,0 +1,16 @@
+# Generated by Django 4.2.18 on 2026-10-16 22:29
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_cachedkey'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='CachedKey',
+        ),
+    ]
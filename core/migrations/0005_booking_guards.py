@@ -0,0 +1,57 @@
+# Generated by Django 4.2.18 on 2026-10-16 22:30
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+import django.db.models.deletion
+
+ACTIVE_STATUSES = ['booked', 'rescheduled']
+
+
+def cancel_double_bookings(apps, schema_editor):
+    """
+    Keep the earliest active meeting of each owner, date and start time, and cancel the later double bookings.
+    """
+    Meeting = apps.get_model('core', 'Meeting')
+    duplicated_slots = (
+        Meeting.objects.filter(status__in=ACTIVE_STATUSES)
+        .values('calendar_owner', 'date', 'start_time')
+        .annotate(first_id=Min('id'), count=Count('id'))
+        .filter(count__gt=1)
+    )
+    for slot in duplicated_slots:
+        Meeting.objects.filter(
+            status__in=ACTIVE_STATUSES, calendar_owner=slot['calendar_owner'],
+            date=slot['date'], start_time=slot['start_time'],
+        ).exclude(id=slot['first_id']).update(status='cancelled')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_delete_cachedkey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('locked_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(cancel_double_bookings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='meeting',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['booked', 'rescheduled'])), fields=('calendar_owner', 'date', 'start_time'), name='unique_active_meeting_slot'),
+        ),
+        migrations.AddField(
+            model_name='bookinglock',
+            name='calendar_owner',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='booking_locks', to='core.user'),
+        ),
+        migrations.AddConstraint(
+            model_name='bookinglock',
+            constraint=models.UniqueConstraint(fields=('calendar_owner', 'date'), name='unique_booking_lock_owner_date'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.18 on 2026-10-16 22:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_booking_guards'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='availability',
+            index=models.Index(fields=['calendar_owner', 'specific_date'], name='availability_owner_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='availability',
+            index=models.Index(condition=models.Q(('specific_date__isnull', True)), fields=['calendar_owner', 'day_of_week'], name='availability_owner_weekly_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['calendar_owner', 'date', 'status'], name='meeting_owner_date_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(condition=models.Q(('status__in', ['booked', 'rescheduled'])), fields=['calendar_owner', 'date', 'start_time', 'end_time'], name='meeting_owner_date_active_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.18 on 2026-10-16 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['calendar_owner', 'date', 'start_time', 'id'], name='meeting_owner_keyset_idx'),
+        ),
+    ]
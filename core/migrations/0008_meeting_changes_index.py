@@ -0,0 +1,17 @@
+# Generated by Django 4.2.18 on 2026-10-16 22:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_meeting_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meeting',
+            index=models.Index(fields=['calendar_owner', 'last_modified', 'id'], name='meeting_owner_modified_idx'),
+        ),
+    ]
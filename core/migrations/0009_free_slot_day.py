@@ -0,0 +1,28 @@
+# Generated by Django 4.2.18 on 2026-10-16 22:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_meeting_changes_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FreeSlotDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('slot_starts', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('calendar_owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='free_slot_days', to='core.user')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='freeslotday',
+            constraint=models.UniqueConstraint(fields=('calendar_owner', 'date'), name='unique_free_slot_day'),
+        ),
+    ]
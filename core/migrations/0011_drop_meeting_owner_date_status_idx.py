@@ -0,0 +1,17 @@
+# Generated by Django 4.2.18 on 2026-10-16 23:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_user_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='meeting',
+            name='meeting_owner_date_status_idx',
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from .enums import MeetingStatus
 import pytz
 
@@ -12,6 +13,13 @@ class User(models.Model):
         default='UTC',
         choices=[(timezone, timezone) for timezone in pytz.all_timezones])
 
+    class Meta:
+        indexes = [
+            # Case-insensitive prefix searches are range scans on the lowercased values
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+            models.Index(Lower('name'), name='user_name_lower_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -28,6 +36,16 @@ class Availability(models.Model):
     start_time = models.TimeField()
     end_time = models.TimeField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['calendar_owner', 'specific_date'], name='availability_owner_date_idx'),
+            models.Index(
+                fields=['calendar_owner', 'day_of_week'],
+                condition=models.Q(specific_date__isnull=True),
+                name='availability_owner_weekly_idx',
+            ),
+        ]
+
     def __str__(self):
         if self.specific_date:
             return f"{self.calendar_owner.name} - {self.specific_date} ({self.start_time} to {self.end_time})"
@@ -53,10 +71,56 @@ class Meeting(models.Model):
     token = models.CharField(max_length=100, unique=True, null=True, blank=True)
     last_modified = models.DateTimeField(auto_now=True)  # Auto-updates on save
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of an owner's meetings seeks on (date, start_time, id)
+            models.Index(fields=['calendar_owner', 'date', 'start_time', 'id'], name='meeting_owner_keyset_idx'),
+            # The changes feed seeks on (last_modified, id)
+            models.Index(fields=['calendar_owner', 'last_modified', 'id'], name='meeting_owner_modified_idx'),
+            # Overlap checks only look at meetings that occupy the calendar
+            models.Index(
+                fields=['calendar_owner', 'date', 'start_time', 'end_time'],
+                condition=models.Q(status__in=MeetingStatus.active()),
+                name='meeting_owner_date_active_idx',
+            ),
+        ]
+        constraints = [
+            # Two active meetings can never start at the same time for the same owner
+            models.UniqueConstraint(
+                fields=['calendar_owner', 'date', 'start_time'],
+                condition=models.Q(status__in=MeetingStatus.active()),
+                name='unique_active_meeting_slot',
+            ),
+        ]
+
     def __str__(self):
         return f"Meeting with {self.invitee_name} on {self.date} at {self.start_time} ({self.status})"
 
 
-class CachedKey(models.Model):
-    owner_id = models.IntegerField()
-    cache_key = models.CharField(max_length=255)
+class BookingLock(models.Model):
+    # One row per owner-day, updated first in every booking transaction so bookings for that day run one at a time
+    calendar_owner = models.ForeignKey('User', on_delete=models.CASCADE, related_name='booking_locks')
+    date = models.DateField()
+    locked_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['calendar_owner', 'date'], name='unique_booking_lock_owner_date'),
+        ]
+
+
+
+class FreeSlotDay(models.Model):
+    # Materialized bookable slots of one owner-day, read by slot search when FREE_SLOT_STORE_ENABLED is set
+    calendar_owner = models.ForeignKey('User', on_delete=models.CASCADE, related_name='free_slot_days')
+    date = models.DateField()
+    slot_starts = models.BinaryField()  # free_time.pack_starts() of the slot start minutes
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['calendar_owner', 'date'], name='unique_free_slot_day'),
+        ]
+
+    def __str__(self):
+        return f"Free slots of {self.calendar_owner.name} on {self.date}"
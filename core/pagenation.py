@@ -1,6 +1,130 @@
-from rest_framework.pagination import PageNumberPagination
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+import binascii
+import json
 
 class MeetingPagination(PageNumberPagination):
     page_size = 10  # Number of meetings per page (default)
     page_size_query_param = 'page_size'  # Allow client to set custom page size
     max_page_size = 100  # Maximum allowed page size
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination seeking on a unique, ascending tuple of fields instead of COUNT + OFFSET.
+
+    Cursors are opaque to clients: they encode the ordering values of the row a page
+    starts after (or ends before, for a previous link) and the direction.
+    """
+    ordering = ('id',)  # Must end with a unique field
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        position, reverse = self.decode_cursor(request)
+
+        if position is not None:
+            queryset = queryset.filter(self._seek(position, reverse))
+        ordering = [f'-{name}' if reverse else name for name in self.ordering]
+
+        # One extra row tells whether there is a page beyond this one
+        rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_position = self.get_position(rows[-1]) if rows and (has_more or reverse) else None
+        self.previous_position = self.get_position(rows[0]) if rows and (has_more if reverse else position is not None) else None
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def encode_cursor(self, position, reverse):
+        if position is None:
+            return None
+        cursor = self.make_cursor(position, reverse)
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def make_cursor(self, position, reverse=False):
+        payload = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        return urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        """
+        Return (ordering values, reverse) from the cursor query parameter, or (None, False) on the first page.
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            values = payload['p']
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.ordering, values)
+            ]
+            return position, bool(payload['r'])
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_position(self, row):
+        # Dates and times travel as ISO strings and are parsed back by their model field
+        values = [row[name] if isinstance(row, dict) else getattr(row, name) for name in self.ordering]
+        return [value if isinstance(value, int) else str(value) for value in values]
+
+    def _seek(self, position, reverse):
+        # (a, b, c) > (x, y, z)  <=>  a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        lookup = 'lt' if reverse else 'gt'
+        condition = Q()
+        for index, name in enumerate(self.ordering):
+            equal = {prefix: value for prefix, value in zip(self.ordering[:index], position[:index])}
+            condition |= Q(**equal, **{f'{name}__{lookup}': position[index]})
+        return condition
+
+
+class MeetingCursorPagination(KeysetPagination):
+    ordering = ('date', 'start_time', 'id')  # Backed by the (calendar_owner, date, start_time, id) index
+
+
+class MeetingChangesPagination(KeysetPagination):
+    ordering = ('last_modified', 'id')  # Backed by the (calendar_owner, last_modified, id) index
+    page_size = 100
+    max_page_size = 500
+
+
+class UserCursorPagination(KeysetPagination):
+    ordering = ('id',)
+    page_size = 100
+    max_page_size = 1000
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from django.db import transaction
+from django.db.models import Q
 from .models import User
 from .models import Availability
 from .models import Meeting
@@ -8,6 +10,7 @@ from datetime import datetime, time, date
 import pytz
 from django.utils.timezone import now
 from .services.booking_service import BookingService
+from .services.free_slot_store import FreeSlotStore
 
 class UserSerializer(serializers.ModelSerializer):
     timezone = serializers.ChoiceField(choices=[(tz, tz) for tz in pytz.all_timezones], default="UTC")
@@ -26,6 +29,28 @@ class AvailabilitySerializer(serializers.ModelSerializer):
         fields = ['id', 'day_of_week', 'specific_date', 'start_time', 'end_time']
 
 
+def validate_availability_entry(entry):
+    """
+    Check that an availability rule targets exactly one weekly day or date and that its times are ordered.
+    """
+    day_of_week = entry.get("day_of_week")
+    specific_date = entry.get("specific_date")
+    start_time = entry["start_time"]
+    end_time = entry["end_time"]
+
+    if day_of_week is None and not specific_date:
+        raise serializers.ValidationError(
+            "Each availability must have either 'day_of_week' or 'specific_date'."
+        )
+    if day_of_week is not None and specific_date:
+        raise serializers.ValidationError(
+            "Do not provide both 'day_of_week' and 'specific_date' in one entry."
+        )
+
+    if start_time >= end_time:
+        raise serializers.ValidationError("start_time must be before end_time.")
+
+
 class SetAvailabilitySerializer(serializers.Serializer):
     user_id = serializers.IntegerField()
     availabilities = AvailabilitySerializer(many=True)
@@ -41,54 +66,91 @@ class SetAvailabilitySerializer(serializers.Serializer):
         data["user"] = user
         
         for entry in data["availabilities"]:
-            day_of_week = entry.get("day_of_week")
-            specific_date = entry.get("specific_date")
-            start_time = entry["start_time"]
-            end_time = entry["end_time"]
-
-            if day_of_week is None and not specific_date:
-                raise serializers.ValidationError(
-                    "Each availability must have either 'day_of_week' or 'specific_date'."
-                )
-            if day_of_week is not None and specific_date:
-                raise serializers.ValidationError(
-                    "Do not provide both 'day_of_week' and 'specific_date' in one entry."
-                )
-            
-            if start_time >= end_time:
-                raise serializers.ValidationError("start_time must be before end_time.")
+            validate_availability_entry(entry)
 
         return data
 
     def save(self, **kwargs):
         user = self.validated_data["user"]
 
-        # remove al cached slots
-        BookingService.remove_cached_slots(user)
-
-
+        # Group the new rules per weekly day or specific date; each group replaces the stored one
+        new_rules = {}
         for entry in self.validated_data["availabilities"]:
             day_of_week = entry.get("day_of_week")
             specific_date = entry.get("specific_date")
-            start_time = entry["start_time"]
-            end_time = entry["end_time"]
-            
-            # Delete old records for the same day_of_week or specific_date
-            if day_of_week is not None:
-                user.availabilities.filter(day_of_week=day_of_week, specific_date__isnull=True).delete()
-            elif specific_date is not None:
-                user.availabilities.filter(specific_date=specific_date).delete()
-            else:
-                raise serializers.ValidationError("Each availability must have either 'day_of_week' or 'specific_date'.")
-            
-            # Create new availability, storing times exactly as the user gave them
-            Availability.objects.create(
-                calendar_owner=user,
-                day_of_week=day_of_week,
-                specific_date=specific_date,
-                start_time=start_time,  # local time as provided
-                end_time=end_time       # local time as provided
-            )
+            key = (None, specific_date) if specific_date is not None else (day_of_week, None)
+            # Store times exactly as the user gave them (local time)
+            new_rules.setdefault(key, []).append((entry["start_time"], entry["end_time"]))
+
+        if not new_rules:
+            return
+
+        weekdays = {day_of_week for day_of_week, specific_date in new_rules if specific_date is None}
+        dates = {specific_date for _, specific_date in new_rules if specific_date is not None}
+
+        with transaction.atomic():
+            replaced = Q()
+            if weekdays:
+                replaced |= Q(day_of_week__in=weekdays, specific_date__isnull=True)
+            if dates:
+                replaced |= Q(specific_date__in=dates)
+
+            old_ids = {}
+            old_rules = {}
+            for rule_id, day_of_week, specific_date, start_time, end_time in user.availabilities.filter(
+                replaced
+            ).values_list('id', 'day_of_week', 'specific_date', 'start_time', 'end_time'):
+                key = (None, specific_date) if specific_date is not None else (day_of_week, None)
+                old_ids.setdefault(key, []).append(rule_id)
+                old_rules.setdefault(key, []).append((start_time, end_time))
+
+            # Only days whose rules actually differ are rewritten and invalidated
+            changed = [key for key, ranges in new_rules.items() if sorted(ranges) != sorted(old_rules.get(key, []))]
+            if not changed:
+                return
+
+            Availability.objects.filter(id__in=[rule_id for key in changed for rule_id in old_ids.get(key, [])]).delete()
+            Availability.objects.bulk_create([
+                Availability(
+                    calendar_owner=user,
+                    day_of_week=day_of_week,
+                    specific_date=specific_date,
+                    start_time=start_time,
+                    end_time=end_time
+                )
+                for day_of_week, specific_date in changed
+                for start_time, end_time in new_rules[(day_of_week, specific_date)]
+            ])
+
+            if FreeSlotStore.enabled():
+                FreeSlotStore.refresh_days(
+                    user.id, [specific_date for _, specific_date in changed if specific_date is not None]
+                )
+                FreeSlotStore.refresh_weekdays(
+                    user.id, {day_of_week for day_of_week, specific_date in changed if specific_date is None}
+                )
+
+        # remove cached slots of the changed days only
+        BookingService.remove_cached_days(
+            user,
+            dates=[specific_date for _, specific_date in changed if specific_date is not None],
+            weekdays=[day_of_week for day_of_week, specific_date in changed if specific_date is None],
+        )
+
+
+class ImportUserSerializer(serializers.Serializer):
+    """
+    One row of a bulk import: a calendar owner, matched by email, and optionally their availability rules.
+    """
+    name = serializers.CharField(max_length=100)
+    email = serializers.EmailField(max_length=254)
+    timezone = serializers.ChoiceField(choices=[(tz, tz) for tz in pytz.all_timezones], default="UTC")
+    availabilities = AvailabilitySerializer(many=True, required=False)
+
+    def validate(self, data):
+        for entry in data.get("availabilities", []):
+            validate_availability_entry(entry)
+        return data
 
 
 class MeetingSerializer(serializers.ModelSerializer):
@@ -97,6 +159,9 @@ class MeetingSerializer(serializers.ModelSerializer):
     class Meta:
         model = Meeting
         fields = ['id', 'calendar_owner', 'invitee_name', 'invitee_email', 'date', 'start_time', 'end_time', 'status', 'token']
+        # DRF would turn the conditional unique_active_meeting_slot constraint into an unconditional
+        # unique-together check; overlaps are validated inside the booking transaction instead
+        validators = []
 
     def validate_status(self, value):
         if value not in [status.value for status in MeetingStatus]:
@@ -115,8 +180,13 @@ class MeetingSerializer(serializers.ModelSerializer):
         return data
 
 
+class BulkBookingItemSerializer(MeetingSerializer):
+    # Owners of a batch are resolved with a single query instead of one lookup per booking
+    calendar_owner = serializers.IntegerField()
 
+    class Meta(MeetingSerializer.Meta):
+        fields = ['calendar_owner', 'invitee_name', 'invitee_email', 'date', 'start_time', 'end_time', 'token']
 
 
-
-
+class BulkBookingSerializer(serializers.Serializer):
+    bookings = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=100)
@@ -1,10 +1,23 @@
 from django.utils.timezone import make_aware
-from django.core.cache import cache
-from datetime import datetime, timedelta
-from django.db.models import Q
-from core.models import Meeting, Availability, CachedKey
+from django.core import signing
+from datetime import timedelta
+from django.db.models import Q, Exists, OuterRef, Value
+from django.db import transaction, IntegrityError, OperationalError
+from django.utils.timezone import now
+from core.models import User, Meeting, Availability, BookingLock
+from core.enums import MeetingStatus
+from core.services import free_time
+from core.services.slot_cache import SlotCache
+from core.services.free_slot_store import FreeSlotStore
 import hashlib
-import uuid, pytz
+import random
+import time
+import pytz
+
+BOOKING_TOKEN_SALT = 'core.booking-token'
+BOOKING_TOKEN_MAX_AGE = 3600  # 1 hour
+BOOKING_RETRIES = 5
+BOOKING_RETRY_DELAY = 0.02  # seconds, doubled on every retry
 
 
 class BookingService:
@@ -13,156 +26,451 @@ class BookingService:
         """
         Get available time slots for a calendar owner on a specific date.
         """
-        # --- 1) Check if cached results exist ---
-        cache_key = f"timeslots_user_{calendar_owner.id}_{search_date}"
-        cached_slots = cache.get(cache_key)
-        if cached_slots:
-            return cached_slots
+        # --- 1) Cached results, or one computation shared by every concurrent caller ---
+        packed_starts = SlotCache.get_or_compute(
+            calendar_owner.id, search_date,
+            lambda: BookingService.compute_packed_starts(calendar_owner, search_date),
+        )
+        return BookingService.day_slots(calendar_owner.id, search_date, packed_starts)
+
+    @staticmethod
+    def day_slots(calendar_owner_id, search_date, packed_starts):
+        """
+        Decode packed slot start minutes (free_time.pack_starts) into the slots result of a date.
+
+        The slot cache and the free-slot store only hold the packed form; slots are
+        expanded into time objects here, once per response.
+        """
+        return {
+            'calendar_owner': calendar_owner_id,
+            'search_date': search_date,
+            'time_slots': free_time.slots_from_starts(free_time.unpack_starts(packed_starts)),
+        }
+
+    @staticmethod
+    def compute_packed_starts(calendar_owner, search_date):
+        """
+        Compute the packed slot start minutes of a date, the form stored in the slot cache.
+        """
+        # --- 2) With the materialized store, this is a single indexed read ---
+        if FreeSlotStore.enabled():
+            return FreeSlotStore.get_or_build_days(calendar_owner.id, [search_date])[search_date]
 
-        availabilities = calendar_owner.availabilities.filter(
+        # --- 3) Specific-date rules override the weekly ones ---
+        availabilities = list(calendar_owner.availabilities.filter(
             specific_date=search_date
-        )
+        ))
 
-        if not availabilities.exists():
+        if not availabilities:
             availabilities = calendar_owner.availabilities.filter(
                 specific_date__isnull=True,
                 day_of_week=search_date.weekday()
             )
 
-        # --- 3) Fetch relevant meetings on this date ---
+        # --- 4) Fetch relevant meetings on this date ---
         meetings = calendar_owner.meetings.filter(
             date=search_date,
             status__in=['booked', 'rescheduled']
         )
 
-        # --- 4) Generate 1-hour slots for each availability and filter out overlaps ---
-        time_slots = []
-        for availability in availabilities:
-            start_datetime = datetime.combine(search_date, availability.start_time)
-            end_datetime = datetime.combine(search_date, availability.end_time)
-
-            current_start = start_datetime
-            while current_start + timedelta(hours=1) <= end_datetime:
-                current_end = current_start + timedelta(hours=1)
-
-                # Check overlap with any meeting
-                if not any(
-                    (current_start.time() < m.end_time and current_end.time() > m.start_time)
-                    for m in meetings
-                ):
-                    time_slots.append({
-                        "start_time": current_start.time(),  # Use time() to extract time part
-                        "end_time": current_end.time()      # Use time() to extract time part
-                    })
-
-                current_start = current_end
-        
-        availabile_slots = {}
-        availabile_slots['calendar_owner'] = calendar_owner.id
-        availabile_slots['search_date'] = search_date
-        availabile_slots['time_slots'] = time_slots
+        # --- 5) Find the 1-hour slots of each availability, skipping busy intervals ---
+        slot_starts = free_time.day_slot_starts(
+            [(availability.start_time, availability.end_time) for availability in availabilities],
+            [(meeting.start_time, meeting.end_time) for meeting in meetings],
+        )
+        return free_time.pack_starts(slot_starts)
+
+
+    @staticmethod
+    def load_day_schedules(owner_ids, dates):
+        """
+        Batch-load availability rules and active meetings for several owners and dates.
+
+        Returns {(owner_id, date): (availability_ranges, meeting_ranges)} with every
+        range as a (start_time, end_time) pair, using two queries in total.
+        """
+        dates = sorted(set(dates))
+        first_date, last_date = dates[0], dates[-1]
+
+        specific_rules = {}
+        weekly_rules = {}
+        availabilities = Availability.objects.filter(
+            calendar_owner_id__in=owner_ids
+        ).filter(
+            Q(specific_date__range=(first_date, last_date)) |
+            Q(specific_date__isnull=True, day_of_week__in={day.weekday() for day in dates})
+        ).order_by('id').values_list('calendar_owner_id', 'day_of_week', 'specific_date', 'start_time', 'end_time')
+        for owner_id, day_of_week, specific_date, start_time, end_time in availabilities:
+            if specific_date is not None:
+                specific_rules.setdefault((owner_id, specific_date), []).append((start_time, end_time))
+            else:
+                weekly_rules.setdefault((owner_id, day_of_week), []).append((start_time, end_time))
+
+        meeting_ranges = {}
+        meetings = Meeting.objects.filter(
+            calendar_owner_id__in=owner_ids,
+            date__range=(first_date, last_date),
+            status__in=MeetingStatus.active()
+        ).values_list('calendar_owner_id', 'date', 'start_time', 'end_time')
+        for owner_id, meeting_date, start_time, end_time in meetings:
+            meeting_ranges.setdefault((owner_id, meeting_date), []).append((start_time, end_time))
+
+        schedules = {}
+        for owner_id in owner_ids:
+            for day in dates:
+                # Specific-date rules override the weekly ones, as in get_available_slots
+                availability_ranges = specific_rules.get((owner_id, day)) or weekly_rules.get((owner_id, day.weekday()), [])
+                schedules[(owner_id, day)] = (availability_ranges, meeting_ranges.get((owner_id, day), []))
+        return schedules
 
-        # --- 5) Cache the time slots for performance ---
-        cache.set(cache_key, availabile_slots, timeout=3600)  # 1 hour
+    @staticmethod
+    def get_available_slots_for_range(calendar_owner, start_date, end_date):
+        """
+        Get available time slots for a calendar owner for every date between start_date and end_date (inclusive).
+        """
+        dates = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
 
-        # store the cache key in the database
-        CachedKey.objects.create(owner_id=calendar_owner.id, cache_key=cache_key)   
+        # --- 1) Reuse single-day results that are already cached, in one round-trip ---
+        _, cached_days = SlotCache.get_many(calendar_owner.id, dates)
 
-        return availabile_slots
+        # --- 2) Load rules and meetings for the remaining dates in two queries and compute in memory ---
+        # Results are not written back per day, so the number of round-trips stays constant.
+        missing_dates = [day for day in dates if day not in cached_days]
+        if missing_dates and FreeSlotStore.enabled():
+            cached_days.update(FreeSlotStore.get_or_build_days(calendar_owner.id, missing_dates))
+        elif missing_dates:
+            schedules = BookingService.load_day_schedules([calendar_owner.id], missing_dates)
+            for day in missing_dates:
+                availability_ranges, meeting_ranges = schedules[(calendar_owner.id, day)]
+                cached_days[day] = free_time.pack_starts(free_time.day_slot_starts(availability_ranges, meeting_ranges))
 
+        return [BookingService.day_slots(calendar_owner.id, day, cached_days[day]) for day in dates]
 
     @staticmethod
-    def generate_booking_token(calendar_owner_id, search_date):
+    def warm_slot_cache(owner_ids, dates, stale_only=False):
         """
-        Generate a unique booking token for a search request.
+        Precompute and cache the slots of several owners over several dates.
+
+        Rules and meetings of all the owners are read with two queries. With
+        stale_only, owner-days whose current cache entry exists are skipped.
+        Returns (warmed, skipped) owner-day counts.
         """
-        token = hashlib.sha256(f"{calendar_owner_id}_{search_date}_{uuid.uuid4()}".encode()).hexdigest()
-        return token
+        # --- 1) Current cache keys, and which of them are already filled ---
+        cache_keys = {}
+        for owner_id in owner_ids:
+            keys, cached_days = SlotCache.get_many(owner_id, dates)
+            for day in dates:
+                if not (stale_only and day in cached_days):
+                    cache_keys[(owner_id, day)] = keys[day]
+
+        skipped = len(owner_ids) * len(dates) - len(cache_keys)
+        if not cache_keys:
+            return 0, skipped
+
+        # --- 2) Compute every missing owner-day from one batched snapshot ---
+        schedules = BookingService.load_day_schedules(
+            sorted({owner_id for owner_id, _ in cache_keys}), sorted({day for _, day in cache_keys})
+        )
+        entries = {}
+        for (owner_id, day), cache_key in cache_keys.items():
+            availability_ranges, meeting_ranges = schedules[(owner_id, day)]
+            entries[cache_key] = free_time.pack_starts(free_time.day_slot_starts(availability_ranges, meeting_ranges))
+
+        # --- 3) Write them back in one round-trip ---
+        SlotCache.set_many(entries)
+        return len(entries), skipped
+
+    @staticmethod
+    def get_common_slots(owner_ids, start_date, end_date):
+        """
+        Get the slots on each date between start_date and end_date (inclusive) where every owner is free.
+
+        A common slot is one that every owner's own search offers, so it can be booked
+        with each owner's token: the owners' slot starts (stepped from the start of
+        their own availability windows) are intersected.
+        """
+        dates = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+        schedules = BookingService.load_day_schedules(owner_ids, dates)
+
+        common_days = []
+        for day in dates:
+            common_starts = None
+            for owner_id in owner_ids:
+                availability_ranges, meeting_ranges = schedules[(owner_id, day)]
+                owner_starts = free_time.day_slot_starts(availability_ranges, meeting_ranges)
+                common_starts = set(owner_starts) if common_starts is None else common_starts.intersection(owner_starts)
+                if not common_starts:
+                    break
+
+            common_days.append({
+                'search_date': day,
+                'time_slots': free_time.slots_from_starts(sorted(common_starts or ())),
+            })
+        return common_days
+
+    @staticmethod
+    def generate_booking_token(calendar_owner_id, search_date, time_slots=()):
+        """
+        Generate a signed booking token for a search request.
+        """
+        return BookingService._sign_booking_offer(calendar_owner_id, {search_date: time_slots})
+
+    @staticmethod
+    def generate_range_booking_token(calendar_owner_id, days):
+        """
+        Generate a single signed booking token covering every day of a range search.
+        """
+        return BookingService._sign_booking_offer(
+            calendar_owner_id, {day['search_date']: day['time_slots'] for day in days}
+        )
+
+    @staticmethod
+    def _sign_booking_offer(calendar_owner_id, offered_slots):
+        """
+        Sign the owner, dates and offered slot start minutes so a booking can be checked without any lookup.
+
+        The signature carries a timestamp, which is how the token expires.
+        """
+        payload = {
+            'o': calendar_owner_id,
+            'd': {
+                str(day): [free_time.to_minutes(slot['start_time']) for slot in time_slots]
+                for day, time_slots in offered_slots.items()
+            },
+        }
+        return signing.dumps(payload, salt=BOOKING_TOKEN_SALT, compress=True)
+
+    @staticmethod
+    def token_fingerprint(token):
+        """
+        Fixed-length digest of a booking token, stored on the meeting so each token is redeemed only once.
+        """
+        return hashlib.sha256(token.encode()).hexdigest()
 
     @staticmethod
     def remove_cached_slots(calendar_owner, search_date=None):
         """
         Remove cached time slots for a calendar owner after a booking.
         """
-        if search_date:
-            cache_key = f"timeslots_user_{calendar_owner.id}_{search_date}"
-            cache.delete(cache_key)
-        else:
-            keys = CachedKey.objects.filter(owner_id=calendar_owner.id).values_list('cache_key', flat=True)
-            for key in keys:
-                cache.delete(key)
-            # Clear all entries for this owner in the database
-            CachedKey.objects.filter(owner_id=calendar_owner.id).delete()
+        SlotCache.invalidate(calendar_owner.id, search_date)
 
     @staticmethod
-    def remove_cached_token(token):
+    def remove_cached_days(calendar_owner, dates=(), weekdays=()):
         """
-        Remove cached token after a booking.
+        Remove cached time slots for specific dates and weekdays after an availability change.
         """
-        cache.delete(token)
-
+        SlotCache.invalidate_days(calendar_owner.id, dates=dates, weekdays=weekdays)
 
     @staticmethod
     def validate_token_and_slot(calendar_owner, token, date, start_time, end_time):
         """
         Validate if the token is valid and the requested slot is available.
         """
-        available_slots = cache.get(token)
-        if not available_slots:
+        try:
+            offer = signing.loads(token, salt=BOOKING_TOKEN_SALT, max_age=BOOKING_TOKEN_MAX_AGE)
+        except signing.BadSignature:
             raise ValueError("Invalid or expired token. Please search for available slots again.")
         
-        if calendar_owner.id != available_slots['calendar_owner']:
+        if calendar_owner.id != offer['o']:
             raise ValueError("The token does not match the calendar owner.")
         
-        if date != available_slots['search_date']:
+        # Range searches sign every day of the range into a single token
+        offered_starts = offer['d'].get(str(date))
+        if offered_starts is None:
             raise ValueError("The token does not match the search date.")
-        
 
         # Check if the requested slot matches the token's available slots
-        start_time = start_time
-        end_time = end_time
         slot_matches = any(
-            slot['start_time'] == start_time and 
-            slot['end_time'] == end_time
-            for slot in available_slots['time_slots']
+            free_time.from_minutes(start) == start_time and
+            free_time.from_minutes(start + free_time.SLOT_MINUTES) == end_time
+            for start in offered_starts
         )
         if not slot_matches:
             raise ValueError("The requested time slot was not retrieved from the available slots.")
 
     @staticmethod
-    def validate_availability(calendar_owner, start_time, end_time):
+    def lock_owner_day(calendar_owner, date):
         """
-        Validate if the requested time slot is available for the calendar owner.
+        Take the owner-day booking lock for the rest of the current transaction.
+
+        The UPDATE holds a row lock (or SQLite's write lock) until commit, so
+        concurrent bookings for the same owner and date are serialized.
         """
-        specific_availability = calendar_owner.availabilities.filter(
-            specific_date=start_time.date(),
-            start_time__lte=start_time.time(),
-            end_time__gte=end_time.time()
-        ).exists()
+        locked = BookingLock.objects.filter(calendar_owner=calendar_owner, date=date).update(locked_at=now())
+        if not locked:
+            # A concurrent first booking of the day makes this raise IntegrityError, which is retried
+            BookingLock.objects.create(calendar_owner=calendar_owner, date=date)
 
-        # Check default availability if no specific rules exist
-        if not specific_availability:
-            default_availability = calendar_owner.availabilities.filter(
-                specific_date__isnull=True,
-                day_of_week=start_time.weekday(),
-                start_time__lte=start_time.time(),
-                end_time__gte=end_time.time()
-            ).exists()
+    @staticmethod
+    def prune_booking_locks(before):
+        """
+        Delete the owner-day booking locks of dates before `before` and return how many were removed.
 
-            if not default_availability:
-                raise ValueError("The requested time does not fit into any available time slot.")
+        Lock rows are only needed while their day can still be booked; one is created again if needed.
+        """
+        deleted, _ = BookingLock.objects.filter(date__lt=before).delete()
+        return deleted
 
     @staticmethod
-    def validate_no_overlap(calendar_owner, date, start_time, end_time):
+    def book_appointment(meeting_fields):
         """
-        Validate if the requested time slot overlaps with existing meetings.
+        Check for overlaps and insert the meeting atomically, retrying briefly on lock or constraint conflicts.
         """
-        overlapping_meetings = Meeting.objects.filter(
-            calendar_owner=calendar_owner,
-            date=date,
-            start_time__lt=end_time,
-            end_time__gt=start_time,
-            status__in=['booked', 'rescheduled']
-        ).exists()
-        if overlapping_meetings:
+        calendar_owner = meeting_fields['calendar_owner']
+        date = meeting_fields['date']
+
+        def book():
+            BookingService.lock_owner_day(calendar_owner, date)
+            BookingService.validate_slot(
+                calendar_owner, date, meeting_fields['start_time'], meeting_fields['end_time'],
+                meeting_fields.get('token')
+            )
+            return Meeting.objects.create(**meeting_fields)
+
+        return BookingService._atomic_with_retries(book)
+
+    @staticmethod
+    def book_appointments(bookings):
+        """
+        Book several slots at once and return one (meeting, error) pair per booking, in order.
+
+        Each booking is a dict of meeting fields with the raw `token`. Every owner-day
+        involved is locked and loaded once, the slots are checked in memory (also
+        against each other), the accepted meetings are inserted with one bulk_create
+        and caches are invalidated once per affected owner-day.
+        """
+        results = [(None, None)] * len(bookings)
+
+        # --- 1) Tokens are stateless, so they can be checked before touching the database ---
+        candidates = []
+        for index, booking in enumerate(bookings):
+            try:
+                BookingService.validate_token_and_slot(
+                    booking['calendar_owner'], booking['token'],
+                    booking['date'], booking['start_time'], booking['end_time']
+                )
+            except ValueError as e:
+                results[index] = (None, str(e))
+            else:
+                candidates.append((index, booking))
+        if not candidates:
+            return results
+
+        owner_days = sorted({(booking['calendar_owner'].id, booking['date']) for _, booking in candidates})
+        owners = {booking['calendar_owner'].id: booking['calendar_owner'] for _, booking in candidates}
+
+        def book():
+            outcomes = {}
+            # --- 2) Lock owner-days in a fixed order so concurrent batches cannot deadlock ---
+            for owner_id, day in owner_days:
+                BookingService.lock_owner_day(owners[owner_id], day)
+
+            # --- 3) One snapshot of rules, meetings and redeemed tokens for the whole batch ---
+            schedules = BookingService.load_day_schedules(list(owners), [day for _, day in owner_days])
+            fingerprints = {BookingService.token_fingerprint(booking['token']) for _, booking in candidates}
+            used_fingerprints = set(Meeting.objects.filter(token__in=fingerprints).values_list('token', flat=True))
+
+            busy = {}
+            meetings = []
+            for index, booking in candidates:
+                owner_day = (booking['calendar_owner'].id, booking['date'])
+                availability_ranges, meeting_ranges = schedules[owner_day]
+                if owner_day not in busy:
+                    busy[owner_day] = free_time.busy_intervals(meeting_ranges)
+                start = free_time.to_minutes(booking['start_time'])
+                end = free_time.to_minutes(booking['end_time'], round_up=True)
+                fingerprint = BookingService.token_fingerprint(booking['token'])
+
+                if fingerprint in used_fingerprints:
+                    outcomes[index] = "This token has already been used. Please search for available slots again."
+                elif not any(window_start <= start and end <= window_end for window_start, window_end
+                             in free_time.availability_windows(availability_ranges)):
+                    outcomes[index] = "The requested time does not fit into any available time slot."
+                elif any(start < busy_end and end > busy_start for busy_start, busy_end in busy[owner_day]):
+                    outcomes[index] = "The requested time slot is already booked."
+                else:
+                    busy[owner_day].append((start, end))
+                    # Redeemed by this booking, so a later booking of the batch cannot reuse it
+                    used_fingerprints.add(fingerprint)
+                    meeting = Meeting(**{**booking, 'status': MeetingStatus.BOOKED.value, 'token': fingerprint})
+                    meetings.append((index, meeting))
+
+            # --- 4) Insert everything that passed in one statement ---
+            Meeting.objects.bulk_create([meeting for _, meeting in meetings])
+            if FreeSlotStore.enabled():
+                # bulk_create sends no post_save, so the store is refreshed here, under the day locks
+                booked_days = {}
+                for _, meeting in meetings:
+                    booked_days.setdefault(meeting.calendar_owner_id, set()).add(meeting.date)
+                for owner_id, days in booked_days.items():
+                    FreeSlotStore.refresh_days(owner_id, sorted(days))
+            outcomes.update(meetings)
+            return outcomes
+
+        try:
+            outcomes = BookingService._atomic_with_retries(book)
+        except ValueError as e:
+            for index, _ in candidates:
+                results[index] = (None, str(e))
+            return results
+
+        # --- 5) Invalidate each affected owner-day once ---
+        booked_owner_days = set()
+        for index, outcome in outcomes.items():
+            if isinstance(outcome, Meeting):
+                results[index] = (outcome, None)
+                booked_owner_days.add((outcome.calendar_owner, outcome.date))
+            else:
+                results[index] = (None, outcome)
+        for calendar_owner, day in booked_owner_days:
+            BookingService.remove_cached_slots(calendar_owner, day)
+        return results
+
+    @staticmethod
+    def _atomic_with_retries(operation):
+        """
+        Run operation in a transaction, retrying briefly when it hits a lock or a constraint conflict.
+        """
+        for attempt in range(BOOKING_RETRIES + 1):
+            try:
+                with transaction.atomic():
+                    return operation()
+            except (IntegrityError, OperationalError):
+                # The retry re-runs the checks, which report a slot taken in the meantime
+                if attempt == BOOKING_RETRIES:
+                    raise ValueError("The calendar is busy. Please try booking again.")
+                time.sleep(BOOKING_RETRY_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5))
+
+    @staticmethod
+    def validate_slot(calendar_owner, date, start_time, end_time, token_fingerprint=None):
+        """
+        Validate token reuse, availability-rule coverage and meeting overlap for a slot in a single query.
+        """
+        rules = Availability.objects.filter(calendar_owner=OuterRef('pk'))
+        covers_slot = Q(start_time__lte=start_time, end_time__gte=end_time)
+        token_used = Exists(Meeting.objects.filter(token=token_fingerprint)) if token_fingerprint else Value(False)
+
+        checks = User.objects.filter(pk=calendar_owner.pk).annotate(
+            token_used=token_used,
+            has_specific=Exists(rules.filter(specific_date=date)),
+            fits_specific=Exists(rules.filter(covers_slot, specific_date=date)),
+            fits_weekly=Exists(rules.filter(covers_slot, specific_date__isnull=True, day_of_week=date.weekday())),
+            overlaps=Exists(Meeting.objects.filter(
+                calendar_owner=OuterRef('pk'),
+                date=date,
+                start_time__lt=end_time,
+                end_time__gt=start_time,
+                status__in=MeetingStatus.active()
+            )),
+        ).values('token_used', 'has_specific', 'fits_specific', 'fits_weekly', 'overlaps').first()
+
+        if checks is None:
+            raise ValueError("The calendar owner does not exist.")
+        if checks['token_used']:
+            raise ValueError("This token has already been used. Please search for available slots again.")
+        # Specific-date rules override the weekly ones, as in get_available_slots
+        fits = checks['fits_specific'] if checks['has_specific'] else checks['fits_weekly']
+        if not fits:
+            raise ValueError("The requested time does not fit into any available time slot.")
+        if checks['overlaps']:
             raise ValueError("The requested time slot is already booked.")
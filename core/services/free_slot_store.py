@@ -0,0 +1,139 @@
+"""
+Optional materialized store of each owner-day's bookable slots (FreeSlotDay).
+
+When FREE_SLOT_STORE_ENABLED is set, a slot-cache miss is answered by a single
+indexed read of the owner-day row instead of recomputing it from Availability
+and Meeting. Rows are refreshed, inside the writing transaction, for exactly the
+days a booking or a rule change touches; days that were never searched or
+rebuilt are materialized on first read.
+
+Writes that bypass the booking and availability code paths (raw SQL, queryset
+update(), moving a meeting to another date) are not tracked: run
+`check_free_slot_store` to detect drift and `rebuild_free_slot_store` to repair it.
+The store must also be rebuilt after it was disabled for a while.
+"""
+from django.conf import settings
+from core.models import FreeSlotDay
+from core.services import free_time
+
+
+class FreeSlotStore:
+    @staticmethod
+    def enabled():
+        return getattr(settings, 'FREE_SLOT_STORE_ENABLED', False)
+
+    @staticmethod
+    def get_days(owner_id, dates):
+        """
+        Return {date: packed slot starts} for the dates that are materialized, in one query.
+
+        Rows are stored in the slot cache's format (free_time.pack_starts), so they are returned undecoded.
+        """
+        rows = FreeSlotDay.objects.filter(calendar_owner_id=owner_id, date__in=dates).values_list('date', 'slot_starts')
+        return {day: bytes(slot_starts) for day, slot_starts in rows}
+
+    @staticmethod
+    def get_or_build_days(owner_id, dates):
+        """
+        Return {date: packed slot starts} for every date, materializing the missing ones.
+        """
+        days = FreeSlotStore.get_days(owner_id, dates)
+        missing_dates = [day for day in dates if day not in days]
+        if missing_dates:
+            starts = FreeSlotStore.compute_days([owner_id], missing_dates)
+            # Readers hold no booking lock: a row a booking wrote meanwhile is fresher than this one
+            FreeSlotStore.insert_days(starts)
+            days.update({day: free_time.pack_starts(starts[(owner_id, day)]) for day in missing_dates})
+        return days
+
+    @staticmethod
+    def compute_days(owner_ids, dates):
+        """
+        Compute {(owner_id, date): slot start minutes} from the rules and meetings, in two queries.
+        """
+        from core.services.booking_service import BookingService  # BookingService reads through this store
+
+        schedules = BookingService.load_day_schedules(owner_ids, dates)
+        return {
+            owner_day: free_time.day_slot_starts(availability_ranges, meeting_ranges)
+            for owner_day, (availability_ranges, meeting_ranges) in schedules.items()
+        }
+
+    @staticmethod
+    def refresh_days(owner_id, dates):
+        """
+        Recompute and upsert the given dates of an owner; returns {date: packed slot starts}.
+        """
+        if not dates:
+            return {}
+        starts = FreeSlotStore.compute_days([owner_id], dates)
+        FreeSlotStore.save_days(starts)
+        return {day: free_time.pack_starts(starts[(owner_id, day)]) for day in dates}
+
+    @staticmethod
+    def refresh_weekdays(owner_id, weekdays):
+        """
+        Recompute the materialized dates of an owner falling on the given weekdays (0 = Monday).
+        """
+        if not weekdays:
+            return
+        # iso_week_day runs from 1 = Monday, one ahead of date.weekday()
+        dates = list(FreeSlotDay.objects.filter(
+            calendar_owner_id=owner_id, date__iso_week_day__in=[weekday + 1 for weekday in weekdays],
+        ).values_list('date', flat=True))
+        FreeSlotStore.refresh_days(owner_id, dates)
+
+    @staticmethod
+    def save_days(starts):
+        """
+        Upsert {(owner_id, date): slot start minutes} in one statement.
+        """
+        FreeSlotDay.objects.bulk_create(
+            [
+                FreeSlotDay(calendar_owner_id=owner_id, date=day, slot_starts=free_time.pack_starts(day_starts))
+                for (owner_id, day), day_starts in starts.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['calendar_owner', 'date'],
+            update_fields=['slot_starts', 'updated_at'],
+        )
+
+    @staticmethod
+    def insert_days(starts):
+        """
+        Insert {(owner_id, date): slot start minutes} in one statement, keeping rows that already exist.
+
+        For writers outside the booking lock, whose slots may predate a concurrent booking's refresh.
+        """
+        FreeSlotDay.objects.bulk_create(
+            [
+                FreeSlotDay(calendar_owner_id=owner_id, date=day, slot_starts=free_time.pack_starts(day_starts))
+                for (owner_id, day), day_starts in starts.items()
+            ],
+            ignore_conflicts=True,
+        )
+
+    @staticmethod
+    def find_drift(owner_ids, dates=None):
+        """
+        Compare materialized rows with freshly computed slots.
+
+        Returns the (owner_id, date) pairs whose stored slots are wrong. Only stored
+        rows are checked unless dates is given, in which case missing rows count too.
+        """
+        rows = FreeSlotDay.objects.filter(calendar_owner_id__in=owner_ids)
+        if dates is not None:
+            rows = rows.filter(date__in=dates)
+        stored = {
+            (owner_id, day): free_time.unpack_starts(bytes(slot_starts))
+            for owner_id, day, slot_starts in rows.values_list('calendar_owner_id', 'date', 'slot_starts')
+        }
+        checked_dates = sorted(dates if dates is not None else {day for _, day in stored})
+        if not checked_dates:
+            return []
+
+        expected = FreeSlotStore.compute_days(owner_ids, checked_dates)
+        return sorted(
+            owner_day for owner_day, starts in expected.items()
+            if (owner_day in stored or dates is not None) and stored.get(owner_day) != starts
+        )
@@ -0,0 +1,122 @@
+"""
+Free-time engine: turns availability windows and busy meetings into bookable slots.
+
+All arithmetic is done on integer minutes since midnight. Busy intervals are
+sorted and merged once, after which every candidate slot is checked against
+them with a forward-only sweep, so a day costs O((slots + meetings) log meetings)
+instead of comparing every slot with every meeting.
+"""
+from bisect import bisect_right
+from datetime import time
+import struct
+
+SLOT_MINUTES = 60
+MINUTES_PER_DAY = 24 * 60
+
+
+def to_minutes(value, round_up=False):
+    """
+    Convert a time to minutes since midnight. Partial minutes are dropped unless round_up is set.
+    """
+    minutes = value.hour * 60 + value.minute
+    if round_up and (value.second or value.microsecond):
+        minutes += 1
+    return minutes
+
+
+def from_minutes(minutes):
+    """
+    Convert minutes since midnight back to a time.
+    """
+    return time(minutes // 60, minutes % 60)
+
+
+def merge_intervals(intervals):
+    """
+    Sort (start, end) intervals and merge the ones that overlap or touch.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def availability_windows(time_ranges):
+    """
+    Convert (start_time, end_time) pairs into minute windows, shrinking partial minutes inwards.
+    """
+    return [(to_minutes(start, round_up=True), to_minutes(end)) for start, end in time_ranges]
+
+
+def busy_intervals(time_ranges):
+    """
+    Convert (start_time, end_time) pairs into merged minute intervals, growing partial minutes outwards.
+    """
+    return merge_intervals(
+        (to_minutes(start), to_minutes(end, round_up=True)) for start, end in time_ranges
+    )
+
+
+def free_slot_starts(windows, busy, duration=SLOT_MINUTES):
+    """
+    Return the start minute of every slot of `duration` minutes that fits a window and avoids all busy intervals.
+
+    Slots are stepped from the start of each window, in window order, exactly as
+    they would be offered to an invitee. `busy` must be sorted and merged.
+    """
+    busy_ends = [end for _, end in busy]
+    starts = []
+    for window_start, window_end in windows:
+        index = bisect_right(busy_ends, window_start)
+        slot_start = window_start
+        while slot_start + duration <= window_end:
+            while index < len(busy) and busy_ends[index] <= slot_start:
+                index += 1
+            if index < len(busy) and busy[index][0] < slot_start + duration:
+                # Jump to the first slot boundary at or after the end of the busy interval
+                steps = -(-(busy_ends[index] - slot_start) // duration)
+                slot_start += steps * duration
+                continue
+            starts.append(slot_start)
+            slot_start += duration
+    return starts
+
+
+def day_slot_starts(availability_ranges, meeting_ranges, duration=SLOT_MINUTES):
+    """
+    Return the start minute of every free slot of one day, from its (start_time, end_time) rules and meetings.
+    """
+    return free_slot_starts(
+        availability_windows(availability_ranges),
+        busy_intervals(meeting_ranges),
+        duration,
+    )
+
+
+def slots_from_starts(starts, duration=SLOT_MINUTES):
+    """
+    Expand slot start minutes into {"start_time", "end_time"} dicts.
+    """
+    return [
+        {"start_time": from_minutes(start), "end_time": from_minutes(start + duration)}
+        for start in starts
+    ]
+
+
+def pack_starts(starts):
+    """
+    Pack slot start minutes into a compact byte string, two bytes per slot, keeping their order.
+    """
+    return struct.pack(f'<{len(starts)}H', *starts)
+
+
+def unpack_starts(data):
+    """
+    Inverse of pack_starts.
+    """
+    return list(struct.unpack(f'<{len(data) // 2}H', data))
@@ -0,0 +1,141 @@
+"""
+iCalendar (RFC 5545) rendering of an owner's meetings for calendar subscriptions.
+
+Meeting dates and times are stored in the owner's timezone; events are written
+in UTC so every client places them correctly without a VTIMEZONE block.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Max
+from core.enums import MeetingStatus
+from core.services.meeting_service import MeetingService
+from core.utils import convert_to_utc
+import hashlib
+import pytz
+
+FEED_CACHE_TIMEOUT = 3600  # 1 hour
+FEED_CHUNK_SIZE = 500
+FEED_FIELDS = ['id', 'invitee_name', 'invitee_email', 'date', 'start_time', 'end_time', 'status', 'last_modified']
+EVENT_STATUS = {
+    MeetingStatus.PENDING.value: 'TENTATIVE',
+    MeetingStatus.BOOKED.value: 'CONFIRMED',
+    MeetingStatus.RESCHEDULED.value: 'CONFIRMED',
+}
+
+
+# Control characters other than HTAB, which may not appear in a content line; CR/LF are handled by each caller
+CONTROL_CHARACTERS = dict.fromkeys([*range(0x09), *range(0x0A, 0x20), 0x7F])
+
+
+def escape_text(value):
+    text = str(value).replace('\r\n', '\n').replace('\r', '\n')
+    return (
+        text.translate(CONTROL_CHARACTERS | {0x0A: '\n'})
+        .replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+    )
+
+
+def param_value(value):
+    """
+    Quoted parameter value: no escaping exists there, so line breaks become spaces and DQUOTE is dropped.
+    """
+    return str(value).translate(CONTROL_CHARACTERS | {0x0D: ' ', 0x0A: ' ', ord('"'): None})
+
+
+def cal_address(email):
+    """
+    mailto: URI of an address, without the whitespace or control characters that could break the line.
+    """
+    return 'mailto:' + ''.join(char for char in str(email) if char.isprintable() and not char.isspace())
+
+
+def fold_line(line):
+    """
+    Fold a content line into chunks of at most 75 octets, continuation lines starting with a space.
+    """
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Never split a multi-byte character
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode('utf-8'))
+        start, limit = end, 74
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def format_utc(value):
+    return value.astimezone(pytz.UTC).strftime('%Y%m%dT%H%M%SZ')
+
+
+def feed_version(calendar_owner):
+    """
+    Version of the owner's feed: changes with any meeting change, including deletions, or a timezone change.
+    """
+    summary = MeetingService.list_meetings(calendar_owner).aggregate(
+        count=Count('id'), last_modified=Max('last_modified')
+    )
+    last_modified = summary['last_modified'].timestamp() if summary['last_modified'] else 0
+    version = f"{summary['count']}-{last_modified}-{calendar_owner.timezone}-{calendar_owner.name}"
+    return hashlib.sha1(version.encode()).hexdigest()
+
+
+def feed_cache_key(calendar_owner, version):
+    return f"ics_feed_user_{calendar_owner.id}_{version}"
+
+
+def render_event(meeting, timezone_str):
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:meeting-{meeting['id']}@calendar-booking-system",
+        f"DTSTAMP:{format_utc(meeting['last_modified'])}",
+        f"LAST-MODIFIED:{format_utc(meeting['last_modified'])}",
+        f"DTSTART:{format_utc(convert_to_utc(meeting['date'], meeting['start_time'], timezone_str))}",
+        f"DTEND:{format_utc(convert_to_utc(meeting['date'], meeting['end_time'], timezone_str))}",
+        f"SUMMARY:{escape_text('Meeting with ' + meeting['invitee_name'])}",
+        f"ATTENDEE;CN=\"{param_value(meeting['invitee_name'])}\":{cal_address(meeting['invitee_email'])}",
+        f"STATUS:{EVENT_STATUS.get(meeting['status'], 'CONFIRMED')}",
+        'END:VEVENT',
+    ]
+    return ''.join(fold_line(line) for line in lines)
+
+
+def render_feed(calendar_owner):
+    """
+    Yield the feed piece by piece, reading meetings in fixed-size chunks.
+    """
+    yield ''.join(fold_line(line) for line in [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Calendar Booking System//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f"X-WR-CALNAME:{escape_text(calendar_owner.name)}",
+        f"X-WR-TIMEZONE:{calendar_owner.timezone}",
+    ])
+    meetings = (
+        MeetingService.list_meetings(calendar_owner)
+        .order_by('date', 'start_time', 'id')
+        .values(*FEED_FIELDS)
+        .iterator(chunk_size=FEED_CHUNK_SIZE)
+    )
+    for meeting in meetings:
+        yield render_event(meeting, calendar_owner.timezone)
+    yield fold_line('END:VCALENDAR')
+
+
+def stream_feed(calendar_owner, version):
+    """
+    Stream the rendered feed and cache it under its version once it has been sent in full.
+    """
+    rendered = []
+    for chunk in render_feed(calendar_owner):
+        rendered.append(chunk)
+        yield chunk
+    cache.set(feed_cache_key(calendar_owner, version), ''.join(rendered), timeout=FEED_CACHE_TIMEOUT)
+
+
+def get_cached_feed(calendar_owner, version):
+    return cache.get(feed_cache_key(calendar_owner, version))
@@ -0,0 +1,204 @@
+"""
+Bulk onboarding of calendar owners and their availability rules from CSV or NDJSON.
+
+Input is read line by line and handled in chunks: every row is validated on its
+own, then each chunk is written in one transaction with bulk_create. Invalid
+rows are reported with their line number and never stop the run. Slot caches
+(and the free-slot store, when enabled) are refreshed once per affected owner
+after the last chunk; owners created by the import have nothing cached yet.
+
+Rows hold `name`, `email` and an optional `timezone`. Owners are matched by
+email: existing ones keep their details and only get the rules of the file. A
+row may also carry one rule in `day_of_week`/`specific_date`/`start_time`/`end_time`
+columns, or, in NDJSON, a list of rules under `availabilities`; rows of the same
+owner add up. As with set-availability, the rules of a weekly day or a date
+replace the ones stored for it.
+"""
+from django.db import transaction, DatabaseError
+from itertools import islice
+from core.models import User, Availability
+from core.serializers import ImportUserSerializer
+from core.services.free_slot_store import FreeSlotStore
+from core.services.slot_cache import SlotCache
+from rest_framework import serializers
+import csv
+import json
+import os
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_FORMATS = ('csv', 'ndjson')
+RULE_FIELDS = ('day_of_week', 'specific_date', 'start_time', 'end_time')
+
+
+class ImportService:
+    @staticmethod
+    def read_csv(lines):
+        """
+        Yield (line number, row, error) for each record of a CSV file with a header line.
+        """
+        reader = csv.DictReader(lines)
+        for record in reader:
+            if None in record:
+                yield reader.line_num, None, "Too many columns."
+                continue
+            yield (reader.line_num, *ImportService._row_from_columns(record))
+
+    @staticmethod
+    def read_ndjson(lines):
+        """
+        Yield (line number, row, error) for each non-blank line of an NDJSON file.
+        """
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_number, None, "Invalid JSON."
+                continue
+            if isinstance(record, dict) and any(field in record for field in RULE_FIELDS):
+                yield (line_number, *ImportService._row_from_columns(record))
+                continue
+            yield line_number, record, None
+
+    @staticmethod
+    def _row_from_columns(record):
+        """
+        Return (row, error): blank cells become missing values, and flat rule columns a one-rule list.
+        """
+        row = {key: value for key, value in record.items() if value not in ('', None)}
+        rule = {field: row.pop(field) for field in RULE_FIELDS if field in row}
+        if rule:
+            if not isinstance(row.get('availabilities', []), list):
+                return None, "availabilities must be a list."
+            row['availabilities'] = [*row.get('availabilities', []), rule]
+        return row, None
+
+    @staticmethod
+    def read(lines, import_format):
+        return ImportService.read_csv(lines) if import_format == 'csv' else ImportService.read_ndjson(lines)
+
+    @staticmethod
+    def format_for_file_name(file_name):
+        """
+        Guess the import format from a file extension, or None.
+        """
+        extension = os.path.splitext(file_name or '')[1].lower()
+        return {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}.get(extension)
+
+    @staticmethod
+    def import_records(records, chunk_size=IMPORT_CHUNK_SIZE, progress=None):
+        """
+        Import (line number, row, error) records chunk by chunk and return a report.
+
+        The report counts rows, failed rows, created users and created rules, and lists
+        {"line", "error"} for every failed row. progress(report) is called after each chunk.
+        """
+        report = {'rows': 0, 'failed': 0, 'users_created': 0, 'rules_created': 0, 'errors': []}
+        replaced_days = set()  # (owner_id, day_of_week, specific_date) whose stored rules are already replaced
+        affected = {}  # owner_id -> (dates, weekdays) whose rules changed
+        created_ids = set()
+        validator = ImportUserSerializer()
+
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            report['rows'] += len(chunk)
+
+            # --- 1) Validate every row on its own, so one bad row does not reject the chunk ---
+            valid = []
+            for line_number, row, error in chunk:
+                if error is None:
+                    try:
+                        valid.append((line_number, validator.run_validation(row)))
+                        continue
+                    except serializers.ValidationError as e:
+                        error = e.detail
+                report['errors'].append({'line': line_number, 'error': error})
+
+            # --- 2) Write the valid rows of the chunk in one transaction ---
+            if valid:
+                try:
+                    with transaction.atomic():
+                        new_ids, rules = ImportService._write_chunk(valid, replaced_days)
+                except DatabaseError as e:
+                    report['errors'].extend({'line': line_number, 'error': str(e)} for line_number, _ in valid)
+                else:
+                    report['users_created'] += len(new_ids)
+                    created_ids.update(new_ids)
+                    report['rules_created'] += sum(len(ranges) for ranges in rules.values())
+                    replaced_days.update(rules)
+                    for owner_id, day_of_week, specific_date in rules:
+                        dates, weekdays = affected.setdefault(owner_id, (set(), set()))
+                        if specific_date is not None:
+                            dates.add(specific_date)
+                        else:
+                            weekdays.add(day_of_week)
+
+            report['failed'] = len(report['errors'])
+            if progress is not None:
+                progress(report)
+
+        # --- 3) Refresh derived slot data once per owner whose rules changed ---
+        # New owners' version counters are seeded on first read, so only existing owners need a bump
+        SlotCache.invalidate_owners(sorted(set(affected) - created_ids))
+        if FreeSlotStore.enabled():
+            for owner_id, (dates, weekdays) in affected.items():
+                FreeSlotStore.refresh_days(owner_id, sorted(dates))
+                FreeSlotStore.refresh_weekdays(owner_id, weekdays)
+        return report
+
+    @staticmethod
+    def _write_chunk(valid, replaced_days):
+        """
+        Create the chunk's missing users and replace the rules of its days.
+
+        Returns (ids of the users created, {(owner_id, day_of_week, specific_date): [(start_time, end_time)]}).
+        """
+        # Users: one lookup for the chunk's emails, one insert for the new ones
+        owner_ids = dict(User.objects.filter(
+            email__in={data['email'] for _, data in valid}
+        ).values_list('email', 'id'))
+        new_users = {}
+        for _, data in valid:
+            if data['email'] not in owner_ids and data['email'] not in new_users:
+                new_users[data['email']] = User(name=data['name'], email=data['email'], timezone=data['timezone'])
+        User.objects.bulk_create(new_users.values())
+        new_ids = dict(User.objects.filter(email__in=list(new_users)).values_list('email', 'id'))
+        owner_ids.update(new_ids)
+
+        # Rules, grouped per weekly day or specific date like set-availability
+        rules = {}
+        for _, data in valid:
+            for entry in data.get('availabilities', []):
+                specific_date = entry.get('specific_date')
+                day_of_week = entry.get('day_of_week') if specific_date is None else None
+                rules.setdefault((owner_ids[data['email']], day_of_week, specific_date), []).append(
+                    (entry['start_time'], entry['end_time'])
+                )
+
+        # A day's stored rules are replaced the first time the file mentions it; later rows add to it
+        first_seen = set(rules) - replaced_days
+        if first_seen:
+            stored = Availability.objects.filter(
+                calendar_owner_id__in={owner_id for owner_id, _, _ in first_seen}
+            ).values_list('id', 'calendar_owner_id', 'day_of_week', 'specific_date')
+            Availability.objects.filter(id__in=[
+                rule_id for rule_id, owner_id, day_of_week, specific_date in stored
+                if (owner_id, day_of_week if specific_date is None else None, specific_date) in first_seen
+            ]).delete()
+
+        Availability.objects.bulk_create([
+            Availability(
+                calendar_owner_id=owner_id,
+                day_of_week=day_of_week,
+                specific_date=specific_date,
+                start_time=start_time,
+                end_time=end_time,
+            )
+            for (owner_id, day_of_week, specific_date), ranges in rules.items()
+            for start_time, end_time in ranges
+        ], batch_size=IMPORT_CHUNK_SIZE)
+        return set(new_ids.values()), rules
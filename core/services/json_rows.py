@@ -0,0 +1,178 @@
+"""
+Serializer-free JSON encoding of values() rows, for read-heavy list and export paths.
+
+Going through a ModelSerializer builds a model instance per row, then runs every
+field through its serializer field and the generic JSON encoder. When the fields
+are known up front, a row encoder can be compiled once per response instead: one
+small function per column, picked from the field type, turns a values() row
+straight into JSON text.
+
+Each encoder reproduces byte for byte the output it stands in for:
+
+- DRFRowEncoder: a serializer's readable fields rendered by a DRF JSONRenderer;
+- DjangoRowEncoder: json.dumps(row, cls=DjangoJSONEncoder, separators=(',', ':')).
+"""
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.db import models
+from django.dispatch import receiver
+from functools import lru_cache
+from json.encoder import encode_basestring, encode_basestring_ascii
+from rest_framework import ISO_8601, fields as drf_fields, relations
+from rest_framework.compat import SHORT_SEPARATORS, LONG_SEPARATORS
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+import json
+
+
+def _integer(value):
+    return str(int(value))
+
+
+class RowEncoder:
+    """
+    Compiled encoder of values() rows into JSON objects.
+
+    `columns` is a list of (JSON key, values() name, value encoder) triples; the
+    value encoders return JSON text and are never called with None.
+    """
+    def __init__(self, columns, encode_string, item_separator=',', key_separator=':'):
+        self.sources = [source for _, source, _ in columns]
+        self.encode_string = encode_string
+        self.item_separator = item_separator
+        self.key_separator = key_separator
+        self._columns = [
+            (encode_string(key) + key_separator, source, encode) for key, source, encode in columns
+        ]
+
+    def encode(self, row):
+        parts = []
+        for prefix, source, encode in self._columns:
+            value = row[source]
+            parts.append(prefix + ('null' if value is None else encode(value)))
+        return '{' + self.item_separator.join(parts) + '}'
+
+    def encode_list(self, rows):
+        return '[' + self.item_separator.join([self.encode(row) for row in rows]) + ']'
+
+    def stream_list(self, rows):
+        """
+        Yield the same JSON text as encode_list(), one row at a time.
+        """
+        yield '['
+        separator = ''
+        for row in rows:
+            yield separator + self.encode(row)
+            separator = self.item_separator
+        yield ']'
+
+
+class DRFRowEncoder(RowEncoder):
+    """
+    Encode rows exactly as `renderer` would render `serializer.to_representation()` of the same objects.
+
+    Raises ValueError for a readable field without a fast encoder.
+    """
+    def __init__(self, serializer, renderer):
+        self.renderer = renderer
+        ensure_ascii = renderer.ensure_ascii
+        encode_string = encode_basestring_ascii if ensure_ascii else self._encode_unicode_string
+        separators = SHORT_SEPARATORS if renderer.compact else LONG_SEPARATORS
+        # Page envelopes only hold counts, links and None, which encode the same with the plain encoder
+        self._encode_value = json.JSONEncoder(ensure_ascii=ensure_ascii, separators=separators).encode
+        columns = [
+            (field.field_name, field.source, self._field_encoder(field, encode_string))
+            for field in serializer.fields.values() if not field.write_only
+        ]
+        super().__init__(columns, encode_string, *separators)
+
+    @staticmethod
+    def _encode_unicode_string(value):
+        # JSONRenderer escapes these two after encoding, so the output is a strict JavaScript subset
+        return encode_basestring(value).replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+
+    def _field_encoder(self, field, encode_string):
+        if isinstance(field, relations.PrimaryKeyRelatedField) and field.pk_field is None:
+            return _integer  # values() returns the related primary key itself
+        if isinstance(field, drf_fields.IntegerField):
+            return _integer
+        if isinstance(field, drf_fields.ChoiceField):
+            choices = field.choice_strings_to_values
+            return lambda value: encode_string(str(choices.get(str(value), value)))
+        if isinstance(field, drf_fields.CharField):
+            return lambda value: encode_string(str(value))
+        if isinstance(field, (drf_fields.DateField, drf_fields.TimeField)) and \
+                not isinstance(field, drf_fields.DateTimeField):
+            default_format = api_settings.DATE_FORMAT if isinstance(field, drf_fields.DateField) \
+                else api_settings.TIME_FORMAT
+            output_format = getattr(field, 'format', default_format)
+            # A None format passes the value through to the renderer's encoder, which is not reproduced
+            if output_format is not None and output_format.lower() == ISO_8601:
+                return lambda value: '"' + value.isoformat() + '"'
+            if output_format is not None:
+                return lambda value: encode_string(value.strftime(output_format))
+        raise ValueError(f"No fast JSON encoder for {field.__class__.__name__} '{field.field_name}'.")
+
+    def render_page(self, page, rows):
+        """
+        Render a paginated response body ({..., 'results': rows}) to bytes.
+        """
+        parts = [
+            self.encode_string(key) + self.key_separator +
+            (self.encode_list(rows) if key == 'results' else self._encode_value(value))
+            for key, value in page.items()
+        ]
+        body = '{' + self.item_separator.join(parts) + '}'
+        if not self.renderer.ensure_ascii:
+            body = body.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+        return body.encode()
+
+
+@lru_cache(maxsize=None)
+def drf_row_encoder(serializer_class, renderer_class):
+    """
+    Shared DRFRowEncoder of a serializer class and a renderer class, compiled on first use.
+    """
+    return DRFRowEncoder(serializer_class(), renderer_class())
+
+
+@receiver(setting_changed)
+def _clear_drf_row_encoders(setting, **kwargs):
+    # Field formats come from the REST_FRAMEWORK settings, like DRF's own reload_api_settings
+    if setting == 'REST_FRAMEWORK':
+        drf_row_encoder.cache_clear()
+
+
+class DjangoRowEncoder(RowEncoder):
+    """
+    Encode rows of `model` exactly as json.dumps(row, cls=DjangoJSONEncoder, separators=(',', ':')) does.
+    """
+    def __init__(self, model, field_names):
+        columns = [
+            (name, name, self._field_encoder(model._meta.get_field(name)))
+            for name in field_names
+        ]
+        super().__init__(columns, encode_basestring_ascii)
+
+    @staticmethod
+    def _field_encoder(field):
+        if isinstance(field, (models.AutoField, models.IntegerField, models.ForeignKey)):
+            return _integer
+        if isinstance(field, (models.DateField, models.TimeField)):  # DateTimeField included
+            default = DjangoJSONEncoder().default
+            return lambda value: '"' + default(value) + '"'
+        if isinstance(field, models.CharField):
+            return encode_basestring_ascii
+        raise ValueError(f"No fast JSON encoder for {field.__class__.__name__} '{field.name}'.")
+
+
+def renders_plain_json(request):
+    """
+    True when the negotiated response is unindented JSON from DRF's JSONRenderer, which the fast paths reproduce.
+    """
+    renderer = getattr(request, 'accepted_renderer', None)
+    return (
+        isinstance(renderer, JSONRenderer) and renderer.encoder_class is JSONEncoder and
+        renderer.get_indent(request.accepted_media_type, {}) is None
+    )
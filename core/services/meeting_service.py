@@ -0,0 +1,79 @@
+from core.enums import MeetingStatus
+from core.models import Meeting
+from core.services.json_rows import DjangoRowEncoder
+from core.utils import now_in_timezone
+import csv
+
+EXPORT_FIELDS = [
+    'id', 'calendar_owner', 'invitee_name', 'invitee_email',
+    'date', 'start_time', 'end_time', 'status', 'last_modified',
+]
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """
+    File-like object whose write() hands the line back, so csv.writer can feed a generator.
+    """
+    def write(self, value):
+        return value
+
+
+class MeetingService:
+    @staticmethod
+    def list_meetings(calendar_owner, start_date=None, end_date=None, upcoming=False, include_cancelled=False):
+        """
+        Return the owner's meetings, filtered with plain range predicates on `date`.
+
+        Meeting dates and times are in the owner's timezone, so "upcoming" is evaluated there.
+        """
+        meetings = calendar_owner.meetings.all()
+        if not include_cancelled:
+            meetings = meetings.exclude(status=MeetingStatus.CANCELLED.value)
+
+        if start_date:
+            meetings = meetings.filter(date__gte=start_date)
+        if end_date:
+            meetings = meetings.filter(date__lte=end_date)
+
+        if upcoming:
+            local_now = now_in_timezone(calendar_owner.timezone)
+            today = local_now.date()
+            meetings = meetings.filter(date__gte=today).exclude(date=today, start_time__lt=local_now.time())
+
+        return meetings
+
+    @staticmethod
+    def export_rows(calendar_owner, start_date=None, end_date=None, modified_since=None):
+        """
+        Yield every meeting of the owner, cancelled ones included, as plain dicts read in fixed-size chunks.
+        """
+        meetings = MeetingService.list_meetings(calendar_owner, start_date, end_date, include_cancelled=True)
+        if modified_since:
+            meetings = meetings.filter(last_modified__gte=modified_since)
+
+        # values() skips model instantiation; iterator() keeps only one chunk in memory
+        return meetings.order_by('id').values(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    @staticmethod
+    def stream_ndjson(rows):
+        """
+        Encode rows as newline-delimited JSON, one line per meeting.
+        """
+        # Same bytes as DjangoJSONEncoder(separators=(',', ':')), without its per-value dispatch
+        encode = DjangoRowEncoder(Meeting, EXPORT_FIELDS).encode
+        for row in rows:
+            yield encode(row) + '\n'
+
+    @staticmethod
+    def stream_csv(rows):
+        """
+        Encode rows as CSV with a header line.
+        """
+        writer = csv.writer(_Echo())
+        yield writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            yield writer.writerow([
+                value.isoformat() if hasattr(value, 'isoformat') else value
+                for value in row.values()
+            ])
@@ -0,0 +1,326 @@
+"""
+Versioned cache for computed time slots.
+
+Every slot cache key embeds a per-owner, a per-owner-weekday and a per-owner-date
+generation counter. Invalidating an owner (or one of their weekdays or dates) bumps a counter instead of
+deleting keys one by one, so entries written under the old generation are simply
+never read again and age out through their timeout. The counters themselves
+expire after version_timeout, which outlasts the entries they guard; a counter
+that is gone is re-seeded from the clock, or falls back to 0 for dates whose
+entries were deleted when it was bumped, so no old entry is ever read again.
+
+Entries hold a date's free slot start minutes packed two bytes per slot
+(free_time.pack_starts) rather than pickled time objects; BookingService.day_slots
+decodes them when a response is built.
+
+Slot entries go through a two-tier cache (in-process LRU, then the shared
+cache). The generation counters are always read from the shared cache, which
+is what keeps every process's local tier coherent.
+
+Misses are single-flight: the first caller takes a short lease in the shared
+cache and computes the slots, while concurrent callers wait for its result, or,
+within the optional stale window, get the previous value straight away.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from core.services.tiered_cache import LocalLRUCache, TwoTierCache
+import hashlib
+import threading
+import time
+
+
+def _initial_version():
+    # Time-based, so a counter that was evicted never comes back at a value used before
+    return time.time_ns() // 1000
+
+
+def _build_backend():
+    max_entries = getattr(settings, 'SLOT_CACHE_LOCAL_MAX_ENTRIES', 1024)
+    local = LocalLRUCache(
+        max_entries=max_entries,
+        timeout=getattr(settings, 'SLOT_CACHE_LOCAL_TIMEOUT', 60),
+    ) if max_entries else None
+    return TwoTierCache(local=local, shared=cache)
+
+
+class _FlightCounters:
+    """
+    Per-process counters of how slot cache misses were resolved.
+    """
+    names = ('computations', 'coalesced', 'stale_served', 'lease_timeouts')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.names, 0)
+
+    def add(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+
+class SlotCache:
+    timeout = 3600  # 1 hour
+    version_timeout = 24 * 3600  # generation counters; at least `timeout`, so range searches do not pile them up
+    backend = _build_backend()
+    flights = _FlightCounters()
+    # While waiting on another caller's lease: first delay in seconds, doubled up to the maximum between polls
+    lease_poll_interval = 0.01
+    lease_poll_max_interval = 0.2
+    lease_check_every = 3  # polls of the entry per check that the lease is still held
+
+    @staticmethod
+    def _owner_version_key(owner_id):
+        return f"timeslots_version_user_{owner_id}"
+
+    @staticmethod
+    def _weekday_version_key(owner_id, weekday):
+        return f"timeslots_version_user_{owner_id}_weekday_{weekday}"
+
+    @staticmethod
+    def _date_version_key(owner_id, search_date):
+        return f"timeslots_version_user_{owner_id}_{search_date}"
+
+    @staticmethod
+    def _stale_key(owner_id, search_date):
+        return f"slotstarts_stale_user_{owner_id}_{search_date}"
+
+    @staticmethod
+    def _slots_key(owner_id, search_date, owner_version, weekday_version, date_version):
+        # The prefix names the entry format, so entries written in an older format are never decoded
+        return f"slotstarts_user_{owner_id}_{search_date}_v{owner_version}.{weekday_version}.{date_version}"
+
+    @staticmethod
+    def get_keys(owner_id, dates, seed_dates=False):
+        """
+        Build the current cache key of each date, reading every generation counter in one round-trip.
+
+        With seed_dates, missing date counters are seeded as well, so the keys never repeat an earlier generation.
+        """
+        version_keys = SlotCache._version_keys(owner_id, dates)
+        versions = cache.get_many(SlotCache._all_version_keys(version_keys))
+        missing = SlotCache._unseeded_versions(version_keys, versions, seed_dates)
+        if missing:
+            cache.set_many(missing, timeout=SlotCache.version_timeout)
+            versions.update(missing)
+        return SlotCache._keys_from_versions(owner_id, version_keys, versions)
+
+    @staticmethod
+    async def aget_keys(owner_id, dates, seed_dates=False):
+        """
+        Async variant of get_keys.
+        """
+        version_keys = SlotCache._version_keys(owner_id, dates)
+        versions = await cache.aget_many(SlotCache._all_version_keys(version_keys))
+        missing = SlotCache._unseeded_versions(version_keys, versions, seed_dates)
+        if missing:
+            await cache.aset_many(missing, timeout=SlotCache.version_timeout)
+            versions.update(missing)
+        return SlotCache._keys_from_versions(owner_id, version_keys, versions)
+
+    @staticmethod
+    def _version_keys(owner_id, dates):
+        return (
+            SlotCache._owner_version_key(owner_id),
+            {day.weekday(): SlotCache._weekday_version_key(owner_id, day.weekday()) for day in dates},
+            {day: SlotCache._date_version_key(owner_id, day) for day in dates},
+        )
+
+    @staticmethod
+    def _all_version_keys(version_keys):
+        owner_version_key, weekday_version_keys, date_version_keys = version_keys
+        return [owner_version_key, *weekday_version_keys.values(), *date_version_keys.values()]
+
+    @staticmethod
+    def _unseeded_versions(version_keys, versions, seed_dates):
+        # Owner and weekday counters are seeded on first read: their entries cannot be listed for
+        # deletion, so they must never fall back to a default value that was used before
+        owner_version_key, weekday_version_keys, date_version_keys = version_keys
+        return {
+            key: _initial_version()
+            for key in [
+                owner_version_key, *weekday_version_keys.values(),
+                *(date_version_keys.values() if seed_dates else ()),
+            ] if key not in versions
+        }
+
+    @staticmethod
+    def _keys_from_versions(owner_id, version_keys, versions):
+        owner_version_key, weekday_version_keys, date_version_keys = version_keys
+        return {
+            day: SlotCache._slots_key(
+                owner_id, day, versions[owner_version_key],
+                versions[weekday_version_keys[day.weekday()]],
+                versions.get(version_key, 0),
+            )
+            for day, version_key in date_version_keys.items()
+        }
+
+    @staticmethod
+    def get(owner_id, search_date):
+        """
+        Return (cache_key, cached_slots) for one date; cached_slots is None on a miss.
+        """
+        cache_key = SlotCache.get_keys(owner_id, [search_date])[search_date]
+        return cache_key, SlotCache.backend.get(cache_key)
+
+    @staticmethod
+    async def aget(owner_id, search_date):
+        """
+        Async variant of get.
+        """
+        cache_key = (await SlotCache.aget_keys(owner_id, [search_date]))[search_date]
+        return cache_key, await SlotCache.backend.aget(cache_key)
+
+    @staticmethod
+    def get_many(owner_id, dates):
+        """
+        Return ({date: cache_key}, {date: cached_slots}) for the dates that are cached.
+        """
+        cache_keys = SlotCache.get_keys(owner_id, dates)
+        dates_by_key = {cache_key: day for day, cache_key in cache_keys.items()}
+        cached = SlotCache.backend.get_many(list(dates_by_key))
+        return cache_keys, {dates_by_key[cache_key]: value for cache_key, value in cached.items()}
+
+    @staticmethod
+    def version_tag(owner_id, dates):
+        """
+        Opaque tag that changes whenever the slots of any of the dates may have changed, e.g. for an ETag.
+        """
+        cache_keys = SlotCache.get_keys(owner_id, dates, seed_dates=True)
+        return hashlib.sha1('|'.join(cache_keys[day] for day in dates).encode()).hexdigest()
+
+    @staticmethod
+    async def aversion_tag(owner_id, dates):
+        """
+        Async variant of version_tag.
+        """
+        cache_keys = await SlotCache.aget_keys(owner_id, dates, seed_dates=True)
+        return hashlib.sha1('|'.join(cache_keys[day] for day in dates).encode()).hexdigest()
+
+    @staticmethod
+    def get_or_compute(owner_id, search_date, compute):
+        """
+        Return the cached slots of a date, or compute() them once for all concurrent callers.
+        """
+        cache_key, cached_slots = SlotCache.get(owner_id, search_date)
+        if cached_slots is not None:
+            return cached_slots
+
+        stale_window = getattr(settings, 'SLOT_CACHE_STALE_WINDOW', 0)
+        lease_key = f"{cache_key}_lease"
+        # --- 1) The caller that wins the lease computes ---
+        if cache.add(lease_key, True, timeout=getattr(settings, 'SLOT_CACHE_LEASE_TIMEOUT', 10)):
+            try:
+                return SlotCache._compute_and_set(owner_id, search_date, cache_key, compute, stale_window)
+            finally:
+                cache.delete(lease_key)
+
+        # --- 2) Others serve the previous value while it is recent enough... ---
+        if stale_window:
+            stale_slots = cache.get(SlotCache._stale_key(owner_id, search_date))
+            if stale_slots is not None:
+                SlotCache.flights.add('stale_served')
+                return stale_slots
+
+        # --- 3) ...or wait for the lease holder's result ---
+        deadline = time.monotonic() + getattr(settings, 'SLOT_CACHE_LEASE_WAIT', 2)
+        interval, polls = SlotCache.lease_poll_interval, 0
+        while (remaining := deadline - time.monotonic()) > 0:
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, SlotCache.lease_poll_max_interval)
+            polls += 1
+            cached_slots = SlotCache.backend.get(cache_key)
+            if cached_slots is not None:
+                SlotCache.flights.add('coalesced')
+                return cached_slots
+            if polls % SlotCache.lease_check_every == 0 and cache.get(lease_key) is None:
+                break  # The lease holder gave up without a result
+
+        # The holder is too slow or failed: compute rather than fail the request
+        SlotCache.flights.add('lease_timeouts')
+        return SlotCache._compute_and_set(owner_id, search_date, cache_key, compute, stale_window)
+
+    @staticmethod
+    def _compute_and_set(owner_id, search_date, cache_key, compute, stale_window):
+        slots = compute()
+        SlotCache.flights.add('computations')
+        SlotCache.set(cache_key, slots)
+        if stale_window:
+            # Survives invalidation, so readers have something to show while the next value is computed
+            cache.set(SlotCache._stale_key(owner_id, search_date), slots, timeout=stale_window)
+        return slots
+
+    @staticmethod
+    def set(cache_key, slots):
+        SlotCache.backend.set(cache_key, slots, timeout=SlotCache.timeout)
+
+    @staticmethod
+    def set_many(entries):
+        """
+        Store several {cache_key: slots} entries in one round-trip.
+        """
+        SlotCache.backend.set_many(entries, timeout=SlotCache.timeout)
+
+    @staticmethod
+    def stats():
+        """
+        Hit, miss and eviction counters of this process's local tier, and how its misses were resolved.
+        """
+        return {**SlotCache.backend.stats(), **SlotCache.flights.snapshot()}
+
+    @staticmethod
+    def invalidate(owner_id, search_date=None):
+        """
+        Invalidate every cached date of an owner, or only search_date when given.
+        """
+        if search_date is None:
+            SlotCache._bump(SlotCache._owner_version_key(owner_id))
+        else:
+            SlotCache.invalidate_days(owner_id, dates=[search_date])
+
+    @staticmethod
+    def invalidate_owners(owner_ids):
+        """
+        Invalidate every cached date of several owners, with one read and one write of their counters.
+        """
+        SlotCache._bump_many([SlotCache._owner_version_key(owner_id) for owner_id in owner_ids])
+
+    @staticmethod
+    def invalidate_days(owner_id, dates=(), weekdays=()):
+        """
+        Invalidate the cached slots of specific dates and of every date falling on the given weekdays.
+        """
+        if dates:
+            # Drop the current entries as well, so an evicted counter falling back to 0 cannot revive them
+            for cache_key in SlotCache.get_keys(owner_id, dates).values():
+                SlotCache.backend.delete(cache_key)
+            SlotCache._bump_many([SlotCache._date_version_key(owner_id, day) for day in dates])
+
+        if weekdays:
+            SlotCache._bump_many([SlotCache._weekday_version_key(owner_id, weekday) for weekday in weekdays])
+
+    @staticmethod
+    def _bump(version_key):
+        SlotCache._bump_many([version_key])
+
+    @staticmethod
+    def _bump_many(version_keys):
+        # get + set rather than incr: incr on the database backend resets the key to the default timeout
+        versions = cache.get_many(version_keys)
+        cache.set_many({
+            key: versions[key] + 1 if key in versions else _initial_version()
+            for key in version_keys
+        }, timeout=SlotCache.version_timeout)
+
+
+@receiver(setting_changed)
+def _rebuild_backend(setting, **kwargs):
+    # The local tier is sized from settings when the module loads, so rebuild it when they are overridden
+    if setting in ('SLOT_CACHE_LOCAL_MAX_ENTRIES', 'SLOT_CACHE_LOCAL_TIMEOUT'):
+        SlotCache.backend = _build_backend()
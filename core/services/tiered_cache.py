@@ -0,0 +1,143 @@
+"""
+Two-tier cache: a bounded in-process LRU in front of a shared Django cache.
+
+The local tier only ever stores immutable values under keys that change when
+the underlying data changes (see SlotCache), so it never has to be invalidated
+across processes; stale entries simply stop being asked for and fall out of
+the LRU or expire.
+"""
+from collections import OrderedDict
+from django.core.cache import cache
+import threading
+import time
+
+_MISSING = object()
+
+
+class LocalLRUCache:
+    """
+    Thread-safe, bounded, TTL-aware LRU cache living in the current process.
+    """
+    def __init__(self, max_entries=1024, timeout=60):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, timeout=None):
+        if self.max_entries <= 0:
+            return
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+class TwoTierCache:
+    """
+    Read-through pair of caches: the local tier is checked first and filled from the shared tier on a hit there.
+    """
+    def __init__(self, local=None, shared=None):
+        self.local = local
+        self.shared = shared if shared is not None else cache
+
+    def get(self, key, default=None):
+        if self.local is not None:
+            value = self.local.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+        value = self.shared.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        if self.local is not None:
+            self.local.set(key, value)
+        return value
+
+    async def aget(self, key, default=None):
+        # The local tier never blocks, so only the shared tier is awaited
+        if self.local is not None:
+            value = self.local.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+        value = await self.shared.aget(key, _MISSING)
+        if value is _MISSING:
+            return default
+        if self.local is not None:
+            self.local.set(key, value)
+        return value
+
+    def get_many(self, keys):
+        found = {}
+        if self.local is not None:
+            for key in keys:
+                value = self.local.get(key, _MISSING)
+                if value is not _MISSING:
+                    found[key] = value
+        remaining = [key for key in keys if key not in found]
+        if remaining:
+            shared_found = self.shared.get_many(remaining)
+            if self.local is not None:
+                for key, value in shared_found.items():
+                    self.local.set(key, value)
+            found.update(shared_found)
+        return found
+
+    def set(self, key, value, timeout=None):
+        self.shared.set(key, value, timeout=timeout)
+        if self.local is not None:
+            self.local.set(key, value, timeout)
+
+    def set_many(self, entries, timeout=None):
+        self.shared.set_many(entries, timeout=timeout)
+        if self.local is not None:
+            for key, value in entries.items():
+                self.local.set(key, value, timeout)
+
+    def delete(self, key):
+        self.shared.delete(key)
+        if self.local is not None:
+            self.local.delete(key)
+
+    def stats(self):
+        return self.local.stats() if self.local is not None else {}
@@ -0,0 +1,39 @@
+from django.db.models.functions import Lower
+from core.models import User
+from core.utils import prefix_upper_bound
+
+DUMP_CHUNK_SIZE = 2000
+
+
+class UserService:
+    @staticmethod
+    def search_users(email_prefix=None, name_prefix=None):
+        """
+        Return the users whose email and/or name start with the given prefixes, ignoring case, in id order.
+
+        Each prefix becomes a range on the lowercased column, which the Lower() indexes
+        serve directly; istartswith would compile to a LIKE that most databases scan.
+        SQLite's LOWER() only folds ASCII letters, so a prefix with other characters
+        cannot be folded the same way in Python and falls back to istartswith.
+        """
+        users = User.objects.order_by('id')
+        for field, prefix in (('email', email_prefix), ('name', name_prefix)):
+            if not prefix:
+                continue
+            if not prefix.isascii():
+                users = users.filter(**{f'{field}__istartswith': prefix})
+                continue
+            prefix = prefix.lower()
+            alias = f'{field}_lower'
+            users = users.alias(**{alias: Lower(field)}).filter(**{f'{alias}__gte': prefix})
+            upper_bound = prefix_upper_bound(prefix)
+            if upper_bound is not None:
+                users = users.filter(**{f'{alias}__lt': upper_bound})
+        return users
+
+    @staticmethod
+    def dump_rows(users, fields):
+        """
+        Yield the users as values() dicts in primary-key order, holding one chunk in memory at a time.
+        """
+        return users.order_by('id').values(*fields).iterator(chunk_size=DUMP_CHUNK_SIZE)
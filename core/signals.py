@@ -0,0 +1,52 @@
+from django.core.signals import setting_changed
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import User, Meeting, Availability
+from .services.free_slot_store import FreeSlotStore
+
+
+@receiver(post_save, sender=Meeting)
+def refresh_meeting_day(sender, instance, raw=False, origin=None, **kwargs):
+    """
+    Keep the materialized free slots of a meeting's day in step with bookings, cancellations and deletions.
+    """
+    # Fixtures are loaded raw, and the owner's rows go away with the owner
+    if raw or isinstance(origin, User) or not FreeSlotStore.enabled():
+        return
+    FreeSlotStore.refresh_days(instance.calendar_owner_id, [instance.date])
+
+
+@receiver(post_save, sender=Availability)
+def refresh_availability_days(sender, instance, raw=False, origin=None, **kwargs):
+    """
+    Keep the materialized free slots in step with rules saved or deleted outside the bulk paths, e.g. in the admin.
+    """
+    if raw or isinstance(origin, User) or not FreeSlotStore.enabled():
+        return
+    if instance.specific_date is not None:
+        FreeSlotStore.refresh_days(instance.calendar_owner_id, [instance.specific_date])
+    else:
+        FreeSlotStore.refresh_weekdays(instance.calendar_owner_id, {instance.day_of_week})
+
+
+def connect_delete_receivers():
+    """
+    Listen to deletions only while the store is enabled.
+
+    Any post_delete receiver makes Django load and delete meetings and rules row by row, e.g. when an owner
+    is deleted, instead of in one DELETE.
+    """
+    for handler, sender in ((refresh_meeting_day, Meeting), (refresh_availability_days, Availability)):
+        if FreeSlotStore.enabled():
+            post_delete.connect(handler, sender=sender)
+        else:
+            post_delete.disconnect(handler, sender=sender)
+
+
+connect_delete_receivers()
+
+
+@receiver(setting_changed)
+def _reconnect_delete_receivers(setting, **kwargs):
+    if setting == 'FREE_SLOT_STORE_ENABLED':
+        connect_delete_receivers()
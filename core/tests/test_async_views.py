@@ -0,0 +1,117 @@
+from django.core.cache import cache
+from django.test import AsyncClient, TransactionTestCase
+from django.urls import reverse
+from asgiref.sync import sync_to_async
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from core.models import User, Availability, Meeting
+from core.services.booking_service import BookingService
+from datetime import date, time, timedelta
+
+
+class AsyncViewTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(name="John Doe", email="johndoe@example.com", timezone="UTC")
+        self.search_date = date.today() + timedelta(days=1)
+        Availability.objects.create(calendar_owner=self.user, specific_date=self.search_date,
+                                    start_time=time(9, 0), end_time=time(12, 0))
+        self.client = AsyncClient()
+
+    def search_url(self, user_id=None):
+        return reverse('async-search-available-slots', kwargs={'user_id': user_id or self.user.id})
+
+    async def test_search_matches_sync_view(self):
+        response = await self.client.get(self.search_url(), {'date': self.search_date.isoformat()})
+        self.assertEqual(response.status_code, 200)
+
+        sync_response = await sync_to_async(APIClient().get)(
+            reverse('search-available-slots', kwargs={'user_id': self.user.id}),
+            {'date': self.search_date.isoformat(), 'include_token': 'false'},
+        )
+        payload = response.json()
+        self.assertIn('token', payload)
+        self.assertEqual(payload['available_slots'], sync_response.json()['available_slots'])
+        self.assertEqual(len(payload['available_slots']['time_slots']), 3)
+
+    async def test_search_etag_shared_with_sync_view(self):
+        params = {'date': self.search_date.isoformat(), 'include_token': 'false'}
+        with patch.object(BookingService, 'generate_booking_token') as generate_booking_token:
+            response = await self.client.get(self.search_url(), params)
+        generate_booking_token.assert_not_called()
+        self.assertNotIn('token', response.json())
+
+        sync_response = await sync_to_async(APIClient().get)(
+            reverse('search-available-slots', kwargs={'user_id': self.user.id}), params,
+        )
+        self.assertEqual(response['ETag'], sync_response['ETag'])
+
+        with patch.object(BookingService, 'get_available_slots') as get_available_slots:
+            response = await self.client.get(self.search_url(), params,
+                                               headers={'If-None-Match': sync_response['ETag']})
+        self.assertEqual(response.status_code, 304)
+        get_available_slots.assert_not_called()
+
+        # A token is never "not modified"
+        response = await self.client.get(self.search_url(), {'date': self.search_date.isoformat()},
+                                         headers={'If-None-Match': sync_response['ETag']})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+    async def test_search_range(self):
+        response = await self.client.get(self.search_url(), {
+            'start_date': self.search_date.isoformat(),
+            'end_date': (self.search_date + timedelta(days=1)).isoformat(),
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['available_slots']), 2)
+
+    async def test_cache_hit_skips_computation(self):
+        await self.client.get(self.search_url(), {'date': self.search_date.isoformat()})
+        with patch.object(BookingService, 'get_available_slots') as get_available_slots:
+            response = await self.client.get(self.search_url(), {'date': self.search_date.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        get_available_slots.assert_not_called()
+
+    async def test_search_errors(self):
+        response = await self.client.get(self.search_url(user_id=999))
+        self.assertEqual(response.status_code, 404)
+        response = await self.client.get(self.search_url())
+        self.assertEqual(response.json(), {"error": "Date is required (YYYY-MM-DD)."})
+        response = await self.client.get(self.search_url(), {'date': '2024/01/01'})
+        self.assertEqual(response.status_code, 400)
+
+    async def test_book_appointment(self):
+        search = await self.client.get(self.search_url(), {'date': self.search_date.isoformat()})
+        data = {
+            "calendar_owner": self.user.id,
+            "invitee_name": "Invitee",
+            "invitee_email": "invitee@example.com",
+            "date": self.search_date.isoformat(),
+            "start_time": "09:00",
+            "end_time": "10:00",
+            "token": search.json()['token'],
+        }
+        response = await self.client.post(reverse('async-book-appointment'), data, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['status'], 'booked')
+        self.assertEqual(await Meeting.objects.filter(calendar_owner=self.user).acount(), 1)
+
+        # The booked slot is no longer offered
+        search = await self.client.get(self.search_url(), {'date': self.search_date.isoformat()})
+        self.assertEqual(len(search.json()['available_slots']['time_slots']), 2)
+
+        # The same slot cannot be booked twice
+        response = await self.client.post(reverse('async-book-appointment'), data, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    async def test_book_appointment_rejects_bad_input(self):
+        response = await self.client.post(reverse('async-book-appointment'), "not json",
+                                          content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        response = await self.client.post(reverse('async-book-appointment'), {
+            "calendar_owner": self.user.id, "invitee_name": "Invitee", "invitee_email": "invitee@example.com",
+            "date": self.search_date.isoformat(), "start_time": "09:00", "end_time": "10:00", "token": "bogus",
+        }, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", response.json())
@@ -1,9 +1,13 @@
 from django.test import TestCase
 from unittest.mock import MagicMock, patch
 from datetime import datetime, time, timedelta, date
-from core.models import Availability, Meeting
+from core.models import User, Availability, Meeting, BookingLock
 from django.core.cache import cache
 from core.services.booking_service import BookingService
+from core.services.slot_cache import SlotCache
+from core.services import free_time
+from django.core.management import call_command
+from io import StringIO
 
 class BookingServiceTestCase(TestCase):
     def setUp(self):
@@ -22,12 +26,12 @@ class BookingServiceTestCase(TestCase):
 
     def test_get_available_slots_cached(self):
         search_date = date.today()
-        cache_key = f"timeslots_user_{self.calendar_owner.id}_{search_date}"
-        cache.set(cache_key, [{'start_time': '09:00:00', 'end_time': '10:00:00'}], timeout=3600)
+        cache_key, _ = SlotCache.get(self.calendar_owner.id, search_date)
+        cache.set(cache_key, free_time.pack_starts([540]), timeout=3600)
 
         result = BookingService.get_available_slots(self.calendar_owner, search_date)
 
-        self.assertEqual(result, [{'start_time': '09:00:00', 'end_time': '10:00:00'}])
+        self.assertEqual(result['time_slots'], [{'start_time': time(9, 0), 'end_time': time(10, 0)}])
         cache.delete(cache_key)
 
     def test_get_available_slots_no_cache(self):
@@ -66,16 +70,9 @@ class BookingServiceTestCase(TestCase):
         self.assertTrue(len(token) > 0)
 
     def test_validate_token_and_slot(self):
-        token = 'valid_token'
-        available_slots = {
-            'calendar_owner': self.calendar_owner.id,
-            'search_date': date.today(),
-            'time_slots': [
-                {'start_time': time(9, 0), 'end_time': time(10, 0)},
-            ],
-        }
-
-        cache.set(token, available_slots, timeout=3600)
+        token = BookingService.generate_booking_token(
+            self.calendar_owner.id, date.today(), [{'start_time': time(9, 0), 'end_time': time(10, 0)}]
+        )
 
         try:
             BookingService.validate_token_and_slot(
@@ -84,83 +81,232 @@ class BookingServiceTestCase(TestCase):
         except ValueError:
             self.fail("validate_token_and_slot raised ValueError unexpectedly!")
 
-        cache.delete(token)
-
     def test_validate_token_and_slot_invalid_token(self):
         with self.assertRaises(ValueError):
             BookingService.validate_token_and_slot(
                 self.calendar_owner, 'invalid_token', date.today(), time(9, 0), time(10, 0)
             )
+
+    def test_validate_token_and_slot_tampered_token(self):
+        token = BookingService.generate_booking_token(
+            self.calendar_owner.id, date.today(), [{'start_time': time(9, 0), 'end_time': time(10, 0)}]
+        )
+        with self.assertRaises(ValueError):
+            BookingService.validate_token_and_slot(
+                self.calendar_owner, token[:-2] + 'xx', date.today(), time(9, 0), time(10, 0)
+            )
+
+    def test_validate_token_and_slot_expired_token(self):
+        with patch('django.core.signing.time.time', return_value=datetime.now().timestamp() - 7200):
+            token = BookingService.generate_booking_token(
+                self.calendar_owner.id, date.today(), [{'start_time': time(9, 0), 'end_time': time(10, 0)}]
+            )
+        with self.assertRaises(ValueError):
+            BookingService.validate_token_and_slot(
+                self.calendar_owner, token, date.today(), time(9, 0), time(10, 0)
+            )
     
     def test_validate_token_and_slot_invalid_calendar_owner(self):
-        token = 'valid_token'
-        available_slots = {
-            'calendar_owner': 2,
-            'search_date': date.today(),
-            'time_slots': [
-                {'start_time': time(9, 0), 'end_time': time(10, 0)},
-            ],
-        }
-
-        cache.set(token, available_slots, timeout=3600)
+        token = BookingService.generate_booking_token(
+            2, date.today(), [{'start_time': time(9, 0), 'end_time': time(10, 0)}]
+        )
         with self.assertRaises(ValueError):
             BookingService.validate_token_and_slot(
                 self.calendar_owner, token, date.today(), time(9, 0), time(10, 0)
             )
     
     def test_validate_token_and_slot_invalid_date(self):
-        token = 'valid_token'
-        available_slots = {
-            'calendar_owner': self.calendar_owner.id,
-            'search_date': date.today() - timedelta(days=1),
-            'time_slots': [
-                {'start_time': time(9, 0), 'end_time': time(10, 0)},
-            ],
-        }
-        cache.set(token, available_slots, timeout=3600)
+        token = BookingService.generate_booking_token(
+            self.calendar_owner.id, date.today() - timedelta(days=1),
+            [{'start_time': time(9, 0), 'end_time': time(10, 0)}]
+        )
         with self.assertRaises(ValueError):
             BookingService.validate_token_and_slot(
                 self.calendar_owner, token, date.today(), time(9, 0), time(10, 0)
             )
     
     def test_validate_token_and_slot_invalid_slot(self):
-        token = 'valid_token'
-        available_slots = {
-            'calendar_owner': self.calendar_owner.id,
-            'search_date': date.today(),
-            'time_slots': [
-                {'start_time': time(9, 0), 'end_time': time(10, 0)},
-            ],
-        }
-        cache.set(token, available_slots, timeout=3600)
+        token = BookingService.generate_booking_token(
+            self.calendar_owner.id, date.today(), [{'start_time': time(9, 0), 'end_time': time(10, 0)}]
+        )
         with self.assertRaises(ValueError):
             BookingService.validate_token_and_slot(
                 self.calendar_owner, token, date.today(), time(10, 0), time(11, 0)
             )
 
 
-    @patch('core.models.Meeting.objects.filter')
-    def test_validate_no_overlap(self, mock_filter):
-        mock_filter.return_value.exists.return_value = False
+class BookingServiceRangeTestCase(TestCase):
+    def setUp(self):
+        self.calendar_owner = User.objects.create(name="John Doe", email="johndoe@example.com", timezone="UTC")
+        # 2025-01-27 is a Monday
+        Availability.objects.create(calendar_owner=self.calendar_owner, day_of_week=0,
+                                    start_time=time(9, 0), end_time=time(12, 0))
+        Availability.objects.create(calendar_owner=self.calendar_owner, day_of_week=1,
+                                    start_time=time(14, 0), end_time=time(16, 0))
+        Availability.objects.create(calendar_owner=self.calendar_owner, specific_date=date(2025, 2, 3),
+                                    start_time=time(8, 0), end_time=time(9, 0))
+        Meeting.objects.create(calendar_owner=self.calendar_owner, invitee_name="Alice",
+                               invitee_email="alice@example.com", date=date(2025, 1, 27),
+                               start_time=time(10, 0), end_time=time(11, 0), status='booked')
+        Meeting.objects.create(calendar_owner=self.calendar_owner, invitee_name="Bob",
+                               invitee_email="bob@example.com", date=date(2025, 1, 28),
+                               start_time=time(14, 0), end_time=time(15, 0), status='cancelled')
+        cache.clear()
 
-        try:
-            BookingService.validate_no_overlap(self.calendar_owner, date.today(), time(9, 0), time(10, 0))
-        except ValueError:
-            self.fail("validate_no_overlap raised ValueError unexpectedly!")
+    def test_get_available_slots_for_range(self):
+        days = BookingService.get_available_slots_for_range(
+            self.calendar_owner, date(2025, 1, 27), date(2025, 2, 3)
+        )
+
+        self.assertEqual([day['search_date'] for day in days],
+                         [date(2025, 1, 27) + timedelta(days=offset) for offset in range(8)])
+        self.assertEqual(days[0]['time_slots'], [{'start_time': time(9, 0), 'end_time': time(10, 0)},
+                                                 {'start_time': time(11, 0), 'end_time': time(12, 0)}])
+        self.assertEqual(len(days[1]['time_slots']), 2)
+        self.assertEqual(days[2]['time_slots'], [])
+        # The specific date overrides the Monday rule
+        self.assertEqual(days[7]['time_slots'], [{'start_time': time(8, 0), 'end_time': time(9, 0)}])
+
+    def test_slot_cache_stores_packed_starts(self):
+        cache.clear()
+        day = BookingService.get_available_slots(self.calendar_owner, date(2025, 1, 27))
+
+        # Two bytes per slot start minute in the cache; slots are decoded for the response only
+        _, cached = SlotCache.get(self.calendar_owner.id, date(2025, 1, 27))
+        self.assertEqual(cached, free_time.pack_starts([540, 660]))
+        self.assertEqual(day['time_slots'], [{'start_time': time(9, 0), 'end_time': time(10, 0)},
+                                             {'start_time': time(11, 0), 'end_time': time(12, 0)}])
 
-        mock_filter.return_value.exists.return_value = True
+    def test_get_available_slots_for_range_matches_single_day(self):
+        start_date = date(2025, 1, 27)
+        days = BookingService.get_available_slots_for_range(self.calendar_owner, start_date, date(2025, 2, 3))
+        for day in days:
+            cache.clear()
+            self.assertEqual(day, BookingService.get_available_slots(self.calendar_owner, day['search_date']))
+
+    def test_get_available_slots_for_range_query_count(self):
+        # Seed the owner and weekday generation counters
+        SlotCache.get_keys(self.calendar_owner.id, [date(2025, 1, day) for day in range(1, 8)])
+
+        # Two cache reads (generation counters, then slots) plus one query each for availabilities and meetings
+        with self.assertNumQueries(4):
+            BookingService.get_available_slots_for_range(
+                self.calendar_owner, date(2025, 1, 1), date(2025, 1, 31)
+            )
+
+    def test_validate_token_and_slot_range(self):
+        days = BookingService.get_available_slots_for_range(
+            self.calendar_owner, date(2025, 1, 27), date(2025, 1, 28)
+        )
+        token = BookingService.generate_range_booking_token(self.calendar_owner.id, days)
+
+        BookingService.validate_token_and_slot(
+            self.calendar_owner, token, date(2025, 1, 28), time(14, 0), time(15, 0)
+        )
         with self.assertRaises(ValueError):
-            BookingService.validate_no_overlap(self.calendar_owner, date.today(), time(9, 0), time(10, 0))
+            BookingService.validate_token_and_slot(
+                self.calendar_owner, token, date(2025, 1, 29), time(14, 0), time(15, 0)
+            )
 
-    @patch('core.models.Availability.objects.filter')
-    def test_validate_availability(self, mock_filter):
-        # First call: No specific availability, Second call: No default availability
-        mock_filter.return_value.exists.side_effect = [False, True]
+    def test_book_appointment(self):
+        meeting_fields = {
+            'calendar_owner': self.calendar_owner, 'invitee_name': "Carol", 'invitee_email': "carol@example.com",
+            'date': date(2025, 1, 28), 'start_time': time(15, 0), 'end_time': time(16, 0),
+            'status': 'booked', 'token': BookingService.token_fingerprint('token'),
+        }
+        meeting = BookingService.book_appointment(meeting_fields)
 
-        # Should pass without raising an exception
-        try:
-            BookingService.validate_availability(
-                self.calendar_owner, datetime.now(), datetime.now() + timedelta(hours=1)
+        self.assertEqual(meeting.invitee_name, "Carol")
+        self.assertTrue(BookingLock.objects.filter(calendar_owner=self.calendar_owner, date=date(2025, 1, 28)).exists())
+
+        # The same token cannot be redeemed twice
+        with self.assertRaises(ValueError):
+            BookingService.book_appointment(dict(meeting_fields, start_time=time(14, 0), end_time=time(15, 0)))
+
+        # The same slot cannot be booked twice
+        with self.assertRaises(ValueError):
+            BookingService.book_appointment(dict(meeting_fields, token=None))
+
+    def test_validate_slot(self):
+        with self.assertNumQueries(1):
+            BookingService.validate_slot(self.calendar_owner, date(2025, 1, 28), time(15, 0), time(16, 0))
+
+        # Booked meeting on Monday 10:00-11:00
+        with self.assertRaisesMessage(ValueError, "already booked"):
+            BookingService.validate_slot(self.calendar_owner, date(2025, 1, 27), time(10, 0), time(11, 0))
+
+        # Outside the Monday rule
+        with self.assertRaisesMessage(ValueError, "does not fit"):
+            BookingService.validate_slot(self.calendar_owner, date(2025, 1, 27), time(12, 0), time(13, 0))
+
+        # 2025-02-03 is a Monday, but its specific rule (08:00-09:00) replaces the weekly one
+        with self.assertRaisesMessage(ValueError, "does not fit"):
+            BookingService.validate_slot(self.calendar_owner, date(2025, 2, 3), time(9, 0), time(10, 0))
+        BookingService.validate_slot(self.calendar_owner, date(2025, 2, 3), time(8, 0), time(9, 0))
+
+    def test_prune_booking_locks(self):
+        for day in (date(2025, 1, 27), date(2025, 1, 28), date(2025, 1, 29)):
+            BookingLock.objects.create(calendar_owner=self.calendar_owner, date=day)
+
+        self.assertEqual(BookingService.prune_booking_locks(date(2025, 1, 29)), 2)
+        self.assertEqual(list(BookingLock.objects.values_list('date', flat=True)), [date(2025, 1, 29)])
+
+        out = StringIO()
+        call_command('prune_booking_locks', stdout=out)
+        self.assertFalse(BookingLock.objects.exists())
+        self.assertIn("Deleted 1 booking locks", out.getvalue())
+
+    def test_get_common_slots(self):
+        other_owner = User.objects.create(name="Jane Doe", email="janedoe@example.com", timezone="UTC")
+        Availability.objects.create(calendar_owner=other_owner, day_of_week=0,
+                                    start_time=time(10, 0), end_time=time(17, 0))
+
+        with self.assertNumQueries(2):
+            days = BookingService.get_common_slots(
+                [self.calendar_owner.id, other_owner.id], date(2025, 1, 27), date(2025, 1, 28)
             )
-        except ValueError:
-            self.fail("validate_availability raised ValueError unexpectedly!")
\ No newline at end of file
+
+        self.assertEqual(days, [
+            {'search_date': date(2025, 1, 27),
+             'time_slots': [{'start_time': time(11, 0), 'end_time': time(12, 0)}]},
+            {'search_date': date(2025, 1, 28), 'time_slots': []},
+        ])
+
+    def test_get_common_slots_on_every_owner_grid(self):
+        # Monday grids 09:00/10:00/11:00 and 09:30/10:30/11:30 overlap in time but share no slot
+        offset_owner = User.objects.create(name="Jane Doe", email="janedoe@example.com", timezone="UTC")
+        Availability.objects.create(calendar_owner=offset_owner, day_of_week=0,
+                                    start_time=time(9, 30), end_time=time(12, 30))
+        other_owner = User.objects.create(name="Max Doe", email="maxdoe@example.com", timezone="UTC")
+        Availability.objects.create(calendar_owner=other_owner, day_of_week=0,
+                                    start_time=time(8, 30), end_time=time(12, 30))
+
+        days = BookingService.get_common_slots([other_owner.id, offset_owner.id], date(2025, 1, 27), date(2025, 1, 27))
+        self.assertEqual(days[0]['time_slots'], [{'start_time': time(9, 30), 'end_time': time(10, 30)},
+                                                 {'start_time': time(10, 30), 'end_time': time(11, 30)},
+                                                 {'start_time': time(11, 30), 'end_time': time(12, 30)}])
+
+        days = BookingService.get_common_slots(
+            [self.calendar_owner.id, offset_owner.id], date(2025, 1, 27), date(2025, 1, 27)
+        )
+        self.assertEqual(days[0]['time_slots'], [])
+
+    def test_warm_slot_cache(self):
+        dates = [date(2025, 1, 27), date(2025, 1, 28)]
+        self.assertEqual(BookingService.warm_slot_cache([self.calendar_owner.id], dates), (2, 0))
+
+        # Warmed days are served from the cache (the one query reads the cache table's generation counters),
+        # and a stale-only pass finds nothing to do
+        with self.assertNumQueries(1):
+            day = BookingService.get_available_slots(self.calendar_owner, date(2025, 1, 27))
+        self.assertEqual(day['time_slots'], [{'start_time': time(9, 0), 'end_time': time(10, 0)},
+                                             {'start_time': time(11, 0), 'end_time': time(12, 0)}])
+        self.assertEqual(BookingService.warm_slot_cache([self.calendar_owner.id], dates, stale_only=True), (0, 2))
+
+        BookingService.remove_cached_slots(self.calendar_owner, date(2025, 1, 28))
+        self.assertEqual(BookingService.warm_slot_cache([self.calendar_owner.id], dates, stale_only=True), (1, 1))
+
+    def test_warm_slot_cache_command(self):
+        out = StringIO()
+        call_command('warm_slot_cache', start_date='2025-01-27', days=3, workers=1, stdout=out)
+        self.assertIn("Warmed 3 owner-days (0 already fresh) for 1 owners over 3 days", out.getvalue())
@@ -0,0 +1,106 @@
+from django.test import TransactionTestCase
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import User, Availability, Meeting
+from core.services.booking_service import BookingService
+from datetime import date, time, timedelta
+import json
+import os
+import tempfile
+import threading
+
+
+class FileDatabaseTestCase(TransactionTestCase):
+    """
+    Runs its tests against a file-backed copy of the schema when the test database is in-memory SQLite.
+
+    Threads sharing an in-memory database fail at once on shared-cache table locks, where a
+    file-backed database makes concurrent writers wait on SQLite's write lock as in production.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls._memory_settings = None
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            cls._memory_settings = connections.settings[DEFAULT_DB_ALIAS]
+            cls._memory_connection = connections[DEFAULT_DB_ALIAS]
+            handle, cls._database_file = tempfile.mkstemp(suffix='.sqlite3')
+            os.close(handle)
+            # New connections of every thread, this one included, open the file from now on
+            connections.settings[DEFAULT_DB_ALIAS] = {**cls._memory_settings, 'NAME': cls._database_file}
+            connections[DEFAULT_DB_ALIAS] = connections.create_connection(DEFAULT_DB_ALIAS)
+            call_command('migrate', verbosity=0, interactive=False)
+            call_command('createcachetable', verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if cls._memory_settings is not None:
+            connections[DEFAULT_DB_ALIAS].close()
+            connections.settings[DEFAULT_DB_ALIAS] = cls._memory_settings
+            connections[DEFAULT_DB_ALIAS] = cls._memory_connection
+            os.remove(cls._database_file)
+
+
+class ConcurrentBookingTests(FileDatabaseTestCase):
+    thread_count = 8
+
+    def setUp(self):
+        self.user = User.objects.create(name="John Doe", email="johndoe@example.com", timezone="UTC")
+        self.booking_date = date.today() + timedelta(days=1)
+        Availability.objects.create(calendar_owner=self.user, specific_date=self.booking_date,
+                                    start_time=time(9, 0), end_time=time(17, 0))
+
+    def book_concurrently(self, slots):
+        """
+        Fire one booking per slot from its own thread, all released at once, and return the status codes.
+        """
+        barrier = threading.Barrier(len(slots))
+        results = []
+
+        def book(index, start_time, end_time):
+            try:
+                token = BookingService.generate_booking_token(
+                    self.user.id, self.booking_date, [{'start_time': start_time, 'end_time': end_time}]
+                )
+                data = {
+                    "calendar_owner": self.user.id,
+                    "invitee_name": f"Invitee {index}",
+                    "invitee_email": f"invitee{index}@example.com",
+                    "date": self.booking_date.isoformat(),
+                    "start_time": start_time.strftime("%H:%M"),
+                    "end_time": end_time.strftime("%H:%M"),
+                    "status": "pending",
+                    "token": token,
+                }
+                barrier.wait()
+                response = APIClient().post(reverse('book-appointment'), data=json.dumps(data),
+                                            content_type="application/json")
+                results.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=book, args=(index, *slot)) for index, slot in enumerate(slots)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_same_slot_has_exactly_one_winner(self):
+        results = self.book_concurrently([(time(9, 0), time(10, 0))] * self.thread_count)
+
+        self.assertEqual(results.count(status.HTTP_201_CREATED), 1)
+        self.assertEqual(results.count(status.HTTP_400_BAD_REQUEST), self.thread_count - 1)
+        self.assertEqual(Meeting.objects.filter(calendar_owner=self.user, date=self.booking_date).count(), 1)
+
+    def test_overlapping_slots_have_exactly_one_winner(self):
+        # Different start times, so only the owner-day lock can keep these apart
+        slots = [(time(9, 0), time(10, 0)), (time(9, 30), time(10, 30))] * (self.thread_count // 2)
+        results = self.book_concurrently(slots)
+
+        self.assertEqual(results.count(status.HTTP_201_CREATED), 1)
+        self.assertEqual(Meeting.objects.filter(calendar_owner=self.user, date=self.booking_date).count(), 1)
@@ -0,0 +1,135 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.cache import cache
+from django.db.models.signals import post_delete
+from django.test import TestCase, override_settings
+from core.models import User, Availability, Meeting, FreeSlotDay
+from core.serializers import SetAvailabilitySerializer
+from core.services import free_time
+from core.services.booking_service import BookingService
+from core.services.free_slot_store import FreeSlotStore
+from datetime import time, date, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(FREE_SLOT_STORE_ENABLED=True, CACHES=LOCMEM_CACHES)
+class FreeSlotStoreTestCase(TestCase):
+    def setUp(self):
+        # Locmem caches are process-wide: start every test from an empty one
+        cache.clear()
+        self.user = User.objects.create(name="John Doe", email="johndoe@example.com", timezone="UTC")
+        self.search_date = date.today() + timedelta(days=7)
+        Availability.objects.create(calendar_owner=self.user, day_of_week=self.search_date.weekday(),
+                                    start_time=time(9, 0), end_time=time(12, 0))
+
+    def stored_starts(self, day=None):
+        row = FreeSlotDay.objects.get(calendar_owner=self.user, date=day or self.search_date)
+        return free_time.unpack_starts(bytes(row.slot_starts))
+
+    def book(self, start_hour):
+        return BookingService.book_appointment({
+            'calendar_owner': self.user, 'invitee_name': "Alice", 'invitee_email': "alice@example.com",
+            'date': self.search_date, 'start_time': time(start_hour, 0), 'end_time': time(start_hour + 1, 0),
+            'status': 'booked',
+        })
+
+    def test_search_materializes_and_then_reads_one_row(self):
+        slots = BookingService.get_available_slots(self.user, self.search_date)['time_slots']
+        self.assertEqual(len(slots), 3)
+        self.assertEqual(self.stored_starts(), [540, 600, 660])
+
+        BookingService.remove_cached_slots(self.user, self.search_date)
+        with self.assertNumQueries(1):
+            self.assertEqual(BookingService.get_available_slots(self.user, self.search_date)['time_slots'], slots)
+
+    def book_while_computing(self):
+        """
+        Patch compute_days so that its first caller's result predates a booking of 10:00 made meanwhile.
+        """
+        compute_days = FreeSlotStore.compute_days
+        calls = []
+
+        def compute_then_book(owner_ids, dates):
+            starts = compute_days(owner_ids, dates)
+            if not calls:
+                calls.append(dates)
+                self.book(10)
+            return starts
+        return patch.object(FreeSlotStore, 'compute_days', side_effect=compute_then_book)
+
+    def test_search_keeps_the_row_of_a_concurrent_booking(self):
+        with self.book_while_computing():
+            BookingService.get_available_slots(self.user, self.search_date)
+        self.assertEqual(self.stored_starts(), [540, 660])
+
+    def test_rebuild_keeps_the_row_of_a_concurrent_booking(self):
+        with self.book_while_computing():
+            call_command('rebuild_free_slot_store', start_date=self.search_date.isoformat(), days=7, stdout=StringIO())
+        self.assertEqual(self.stored_starts(), [540, 660])
+
+    def test_booking_and_cancellation_update_the_day(self):
+        BookingService.get_available_slots(self.user, self.search_date)
+        meeting = self.book(10)
+        self.assertEqual(self.stored_starts(), [540, 660])
+
+        meeting.status = 'cancelled'
+        meeting.save()
+        self.assertEqual(self.stored_starts(), [540, 600, 660])
+
+    def test_bulk_booking_updates_the_day(self):
+        slots = BookingService.get_available_slots(self.user, self.search_date)['time_slots']
+        BookingService.book_appointments([
+            {'calendar_owner': self.user, 'invitee_name': "Alice", 'invitee_email': "alice@example.com",
+             'date': self.search_date, 'start_time': slot['start_time'], 'end_time': slot['end_time'],
+             'token': BookingService.generate_booking_token(self.user.id, self.search_date, [slot])}
+            for slot in slots if slot['start_time'].hour in (9, 11)
+        ])
+        self.assertEqual(self.stored_starts(), [600])
+
+    def test_rule_change_updates_materialized_weekdays(self):
+        next_week = self.search_date + timedelta(days=7)
+        BookingService.get_available_slots_for_range(self.user, self.search_date, next_week)
+        serializer = SetAvailabilitySerializer(data={'user_id': self.user.id, 'availabilities': [
+            {'day_of_week': self.search_date.weekday(), 'start_time': '13:00', 'end_time': '15:00'},
+        ]})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        self.assertEqual(self.stored_starts(), [780, 840])
+        self.assertEqual(self.stored_starts(next_week), [780, 840])
+
+    def test_rule_deletion_updates_materialized_weekdays(self):
+        other_day = self.search_date + timedelta(days=1)
+        Availability.objects.create(calendar_owner=self.user, day_of_week=other_day.weekday(),
+                                    start_time=time(9, 0), end_time=time(10, 0))
+        BookingService.get_available_slots_for_range(self.user, self.search_date, other_day)
+
+        Availability.objects.filter(calendar_owner=self.user, day_of_week=self.search_date.weekday()).delete()
+
+        self.assertEqual(self.stored_starts(), [])
+        self.assertEqual(self.stored_starts(other_day), [540])
+
+    def test_deletions_are_only_listened_to_while_enabled(self):
+        self.assertTrue(post_delete.has_listeners(Meeting))
+        self.assertTrue(post_delete.has_listeners(Availability))
+        with override_settings(FREE_SLOT_STORE_ENABLED=False):
+            # Without receivers, deleting an owner removes their meetings and rules in one query each
+            self.assertFalse(post_delete.has_listeners(Meeting))
+            self.assertFalse(post_delete.has_listeners(Availability))
+
+    def test_rebuild_and_check_commands(self):
+        call_command('rebuild_free_slot_store', start_date=self.search_date.isoformat(), days=7, stdout=StringIO())
+        self.assertEqual(FreeSlotDay.objects.filter(calendar_owner=self.user).count(), 7)
+        call_command('check_free_slot_store', stdout=StringIO())
+
+        # A write that bypasses the model layer is caught, then repaired
+        self.book(9)
+        Meeting.objects.update(status='cancelled')
+        with self.assertRaises(CommandError):
+            call_command('check_free_slot_store', stdout=StringIO())
+        call_command('check_free_slot_store', fix=True, stdout=StringIO())
+        self.assertEqual(self.stored_starts(), [540, 600, 660])
+        self.assertEqual(FreeSlotStore.find_drift([self.user.id]), [])
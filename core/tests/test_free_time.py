@@ -0,0 +1,75 @@
+from django.test import SimpleTestCase
+from datetime import datetime, time, timedelta, date
+from core.services import free_time
+import random
+
+
+def brute_force_slots(availability_ranges, meeting_ranges):
+    # Reference implementation: compare every candidate slot with every meeting
+    slots = []
+    for start, end in availability_ranges:
+        current_start = datetime.combine(date.today(), start)
+        end_datetime = datetime.combine(date.today(), end)
+        while current_start + timedelta(hours=1) <= end_datetime:
+            current_end = current_start + timedelta(hours=1)
+            if not any(
+                current_start.time() < m_end and current_end.time() > m_start
+                for m_start, m_end in meeting_ranges
+            ):
+                slots.append({"start_time": current_start.time(), "end_time": current_end.time()})
+            current_start = current_end
+    return slots
+
+
+class FreeTimeTestCase(SimpleTestCase):
+    def test_merge_intervals(self):
+        merged = free_time.merge_intervals([(600, 660), (540, 600), (700, 720), (710, 800), (900, 900)])
+        self.assertEqual(merged, [(540, 660), (700, 800)])
+
+    def test_busy_intervals_round_outwards(self):
+        busy = free_time.busy_intervals([(time(10, 0, 30), time(10, 59, 30))])
+        self.assertEqual(busy, [(600, 660)])
+
+    def test_free_slot_starts(self):
+        starts = free_time.free_slot_starts([(540, 720)], [(600, 660)])
+        self.assertEqual(starts, [540, 660])
+
+    def test_free_slot_starts_skips_long_meeting(self):
+        starts = free_time.free_slot_starts([(480, 1080)], [(500, 790)])
+        self.assertEqual(starts, [840, 900, 960, 1020])
+
+    def test_day_slot_starts(self):
+        starts = free_time.day_slot_starts(
+            [(time(9, 0), time(12, 0))],
+            [(time(10, 0), time(11, 0))],
+        )
+        self.assertEqual(starts, [540, 660])
+        self.assertEqual(free_time.slots_from_starts(starts), [
+            {"start_time": time(9, 0), "end_time": time(10, 0)},
+            {"start_time": time(11, 0), "end_time": time(12, 0)},
+        ])
+
+    def test_matches_brute_force(self):
+        rng = random.Random(42)
+        for _ in range(200):
+            availability_ranges = []
+            for _ in range(rng.randint(0, 3)):
+                start = rng.randrange(0, 22 * 60, 15)
+                end = rng.randrange(start + 15, 24 * 60, 15)
+                availability_ranges.append((free_time.from_minutes(start), free_time.from_minutes(end)))
+            meeting_ranges = []
+            for _ in range(rng.randint(0, 30)):
+                start = rng.randrange(0, 23 * 60, 5)
+                end = min(start + rng.choice([15, 30, 60, 90]), 24 * 60 - 1)
+                meeting_ranges.append((free_time.from_minutes(start), free_time.from_minutes(end)))
+
+            self.assertEqual(
+                free_time.slots_from_starts(free_time.day_slot_starts(availability_ranges, meeting_ranges)),
+                brute_force_slots(availability_ranges, meeting_ranges),
+            )
+
+    def test_pack_starts(self):
+        starts = [660, 540, 1380]
+        self.assertEqual(len(free_time.pack_starts(starts)), 6)
+        self.assertEqual(free_time.unpack_starts(free_time.pack_starts(starts)), starts)
+        self.assertEqual(free_time.unpack_starts(b''), [])
@@ -0,0 +1,20 @@
+from django.test import SimpleTestCase
+from core.services import ics_feed
+
+
+class IcsFeedTestCase(SimpleTestCase):
+    def test_escape_text(self):
+        self.assertEqual(ics_feed.escape_text("a;b,c\\d\ne"), "a\\;b\\,c\\\\d\\ne")
+
+    def test_line_breaks_never_reach_the_feed(self):
+        self.assertEqual(ics_feed.escape_text("a\rb\r\nc\x00d\te"), "a\\nb\\ncd\te")
+        self.assertEqual(ics_feed.param_value('Eve\r\nBEGIN:VEVENT "x"\x1b'), "Eve  BEGIN:VEVENT x")
+        self.assertEqual(ics_feed.cal_address("eve@example.com\r\nSUMMARY:x"), "mailto:eve@example.comSUMMARY:x")
+
+    def test_fold_line(self):
+        line = "SUMMARY:" + "é" * 60
+        folded = ics_feed.fold_line(line)
+        parts = folded[:-2].split("\r\n ")
+        self.assertEqual("".join(parts), line)
+        self.assertTrue(all(len(part.encode()) <= 75 for part in parts))
+        self.assertEqual(ics_feed.fold_line("END:VEVENT"), "END:VEVENT\r\n")
@@ -0,0 +1,121 @@
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import User, Availability
+from core.services.booking_service import BookingService
+from core.services.import_service import ImportService
+from datetime import date, time
+from io import StringIO
+import json
+import os
+import tempfile
+
+CSV_ROWS = """name,email,timezone,day_of_week,specific_date,start_time,end_time
+Ann,ann@example.com,UTC,0,,09:00,12:00
+Ann,ann@example.com,UTC,0,,14:00,15:00
+Bob,bob@example.com,Europe/Paris,,2025-02-03,08:00,09:00
+Bad,not-an-email,UTC,,,,
+Cid,cid@example.com,Mars/Olympus,,,,
+Dan,dan@example.com,,1,2025-02-04,09:00,10:00
+Eve,eve@example.com,,,,,
+"""
+
+
+class ImportServiceTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def import_csv(self, text, chunk_size=1000):
+        return ImportService.import_records(ImportService.read_csv(StringIO(text)), chunk_size)
+
+    def test_csv_import_reports_bad_rows(self):
+        report = self.import_csv(CSV_ROWS, chunk_size=3)
+
+        self.assertEqual(report['rows'], 7)
+        self.assertEqual(report['users_created'], 3)
+        self.assertEqual(report['rules_created'], 3)
+        self.assertEqual([error['line'] for error in report['errors']], [5, 6, 7])
+        self.assertIn('email', report['errors'][0]['error'])
+        self.assertEqual(report['failed'], 3)
+
+        ann = User.objects.get(email="ann@example.com")
+        self.assertEqual(ann.availabilities.count(), 2)
+        self.assertEqual(User.objects.get(email="bob@example.com").timezone, "Europe/Paris")
+        self.assertEqual(User.objects.get(email="eve@example.com").availabilities.count(), 0)
+
+    def test_existing_owner_rules_are_replaced_per_day(self):
+        owner = User.objects.create(name="Ann", email="ann@example.com", timezone="UTC")
+        Availability.objects.create(calendar_owner=owner, day_of_week=0, start_time=time(8, 0), end_time=time(9, 0))
+        Availability.objects.create(calendar_owner=owner, day_of_week=1, start_time=time(8, 0), end_time=time(9, 0))
+        monday = date(2025, 1, 27)
+        self.assertEqual(len(BookingService.get_available_slots(owner, monday)['time_slots']), 1)
+
+        # The Monday rules span two chunks; the second one must not wipe the first
+        report = self.import_csv("\n".join(CSV_ROWS.splitlines()[:3]), chunk_size=1)
+        self.assertEqual(report['users_created'], 0)
+        self.assertEqual(
+            sorted(owner.availabilities.values_list('day_of_week', 'start_time')),
+            [(0, time(9, 0)), (0, time(14, 0)), (1, time(8, 0))],
+        )
+        # Cached slots of the owner were invalidated once the import finished
+        self.assertEqual(len(BookingService.get_available_slots(owner, monday)['time_slots']), 4)
+
+    def test_ndjson_import(self):
+        lines = [
+            json.dumps({"name": "Ann", "email": "ann@example.com", "availabilities": [
+                {"day_of_week": 0, "start_time": "09:00", "end_time": "10:00"},
+                {"specific_date": "2025-02-03", "start_time": "10:00", "end_time": "11:00"},
+            ]}),
+            "",
+            "{not json",
+            json.dumps(["a", "list"]),
+            json.dumps({"name": "Bob", "email": "bob@example.com", "day_of_week": 2,
+                        "start_time": "11:00", "end_time": "10:00"}),
+            json.dumps({"name": "Cid", "email": "cid@example.com", "availabilities": 5, "day_of_week": 1,
+                        "start_time": "09:00", "end_time": "10:00"}),
+            json.dumps({"name": "Dan", "email": "dan@example.com", "availabilities": {"day_of_week": 1},
+                        "start_time": "09:00", "end_time": "10:00"}),
+        ]
+        report = ImportService.import_records(ImportService.read_ndjson(StringIO("\n".join(lines))))
+
+        self.assertEqual(report['users_created'], 1)
+        self.assertEqual(report['rules_created'], 2)
+        self.assertEqual([error['line'] for error in report['errors']], [3, 4, 5, 6, 7])
+        self.assertEqual(report['errors'][0]['error'], "Invalid JSON.")
+        self.assertEqual(report['errors'][3]['error'], "availabilities must be a list.")
+        self.assertEqual(report['errors'][4]['error'], "availabilities must be a list.")
+
+    def test_chunk_query_count_is_constant(self):
+        rows = "name,email,day_of_week,start_time,end_time\n" + "".join(
+            f"User {index},user{index}@example.com,{index % 7},09:00,17:00\n" for index in range(50)
+        )
+        # Savepoint, email lookup, user insert, id lookup, existing rules, rule insert, release
+        with self.settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}), \
+                self.assertNumQueries(7):
+            report = self.import_csv(rows)
+        self.assertEqual(report['users_created'], 50)
+
+    def test_import_users_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+            handle.write(CSV_ROWS)
+        self.addCleanup(os.remove, handle.name)
+
+        out, err = StringIO(), StringIO()
+        call_command('import_users', handle.name, chunk_size=2, stdout=out, stderr=err)
+        self.assertIn("Imported 4 of 7 rows: 3 users and 3 availability rules created", out.getvalue())
+        self.assertIn("line 5:", err.getvalue())
+
+    def test_import_users_api(self):
+        upload = SimpleUploadedFile("owners.csv", CSV_ROWS.encode(), content_type="text/csv")
+        response = APIClient().post(reverse('import-users'), {"file": upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['users_created'], 3)
+        self.assertEqual(response.data['failed'], 3)
+
+        upload = SimpleUploadedFile("owners.txt", b"", content_type="text/plain")
+        response = APIClient().post(reverse('import-users'), {"file": upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,52 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from core.models import User, Meeting
+from core.serializers import MeetingSerializer
+from core.services.json_rows import DRFRowEncoder, DjangoRowEncoder
+from core.services.meeting_service import EXPORT_FIELDS
+from datetime import date, time
+import json
+
+
+class AsciiIndentedRenderer(JSONRenderer):
+    ensure_ascii = True
+    compact = False
+
+
+class JSONRowsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(name="John Doe", email="johndoe@example.com", timezone="UTC")
+        for name, start_time in [('Zoë "Z" O\'Brien', time(9, 0)), ('Line\u2028sep\\tab\t', time(10, 15, 30)),
+                                 ('日本 🎉', time(11, 0, 0, 250000)), ('', time(0, 0))]:
+            Meeting.objects.create(
+                calendar_owner=self.user, invitee_name=name, invitee_email="invitee@example.com",
+                date=date(2025, 1, 27), start_time=start_time, end_time=time(23, 59), status='booked'
+            )
+        self.meetings = Meeting.objects.order_by('id')
+
+    def test_drf_rows_match_serializer(self):
+        for renderer in (JSONRenderer(), AsciiIndentedRenderer()):
+            encoder = DRFRowEncoder(MeetingSerializer(), renderer)
+            self.assertNotIn('token', encoder.sources)
+
+            expected = renderer.render(MeetingSerializer(self.meetings, many=True).data)
+            self.assertEqual(encoder.encode_list(self.meetings.values(*encoder.sources)).encode(), expected)
+
+    def test_drf_page_matches_renderer(self):
+        renderer = JSONRenderer()
+        encoder = DRFRowEncoder(MeetingSerializer(), renderer)
+        page = {'count': 4, 'next': 'http://testserver/?page=2&q=é', 'previous': None}
+
+        expected = renderer.render({**page, 'results': MeetingSerializer(self.meetings, many=True).data})
+        self.assertEqual(encoder.render_page({**page, 'results': None}, self.meetings.values(*encoder.sources)),
+                         expected)
+
+    def test_django_rows_match_django_encoder(self):
+        encoder = DjangoRowEncoder(Meeting, EXPORT_FIELDS)
+        for row in self.meetings.values(*EXPORT_FIELDS):
+            self.assertEqual(encoder.encode(row), json.dumps(row, cls=DjangoJSONEncoder, separators=(',', ':')))
+
+    def test_unsupported_field(self):
+        with self.assertRaises(ValueError):
+            DjangoRowEncoder(User, ['availabilities'])
@@ -0,0 +1,36 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from datetime import date, time
+
+
+class BookingGuardsMigrationTests(TransactionTestCase):
+    before = [('core', '0004_delete_cachedkey')]
+    after = [('core', '0005_booking_guards')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_double_bookings_are_cancelled_before_the_constraint(self):
+        apps = self.migrate(self.before)
+        User = apps.get_model('core', 'User')
+        Meeting = apps.get_model('core', 'Meeting')
+        owner = User.objects.create(name="John Doe", email="johndoe@example.com", timezone="UTC")
+        slot = {'calendar_owner': owner, 'date': date(2025, 1, 27), 'start_time': time(9, 0), 'end_time': time(10, 0)}
+        first = Meeting.objects.create(invitee_name="Alice", invitee_email="alice@example.com", status="booked", **slot)
+        later = Meeting.objects.create(invitee_name="Bob", invitee_email="bob@example.com", status="rescheduled", **slot)
+        cancelled = Meeting.objects.create(invitee_name="Carol", invitee_email="carol@example.com",
+                                           status="cancelled", **slot)
+
+        apps = self.migrate(self.after)
+        Meeting = apps.get_model('core', 'Meeting')
+        self.assertEqual(
+            dict(Meeting.objects.values_list('id', 'status')),
+            {first.id: "booked", later.id: "cancelled", cancelled.id: "cancelled"},
+        )
@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.models import User, Availability, Meeting
+from core.services.booking_service import BookingService
+from core.services.slot_cache import SlotCache
+from datetime import time, date, timedelta
+
+# Count database queries only, not the round-trips of the database cache backend
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHES, SLOT_CACHE_LOCAL_MAX_ENTRIES=0)
+class HotQueryCountTests(TestCase):
+    """
+    Regression guards for the number of queries issued by the hot read and booking paths.
+    """
+    def setUp(self):
+        # Locmem caches are process-wide: start every test from an empty one
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create(name="John Doe", email="johndoe@example.com", timezone="UTC")
+        self.search_date = date.today() + timedelta(days=7)
+        Availability.objects.create(
+            calendar_owner=self.user, day_of_week=self.search_date.weekday(),
+            start_time=time(9, 0), end_time=time(17, 0),
+        )
+        for hour in range(9, 13):
+            Meeting.objects.create(
+                calendar_owner=self.user, date=self.search_date,
+                start_time=time(hour, 0), end_time=time(hour, 30),
+                invitee_name="Invitee", invitee_email="invitee@example.com", status="booked",
+            )
+
+    def test_local_tier_is_disabled(self):
+        # The override reaches the slot cache backend, which is otherwise built once at import
+        self.assertIsNone(SlotCache.backend.local)
+
+    def test_available_slots_queries(self):
+        # Specific rules, weekly rules and meetings on a miss; nothing on a hit
+        with self.assertNumQueries(3):
+            BookingService.get_available_slots(self.user, self.search_date)
+        with self.assertNumQueries(0):
+            BookingService.get_available_slots(self.user, self.search_date)
+
+    def test_booking_queries(self):
+        slots = BookingService.get_available_slots(self.user, self.search_date)['time_slots']
+        token = BookingService.generate_booking_token(self.user.id, self.search_date, slots)
+        data = {
+            "calendar_owner": self.user.id, "date": self.search_date.isoformat(), "start_time": "15:00", "end_time": "16:00",
+            "invitee_name": "Jane Doe", "invitee_email": "jane@example.com", "token": token,
+        }
+        # Owner lookup, savepoint, day lock (update + first-time insert), one validation query,
+        # insert, release
+        with self.assertNumQueries(7):
+            response = self.client.post(reverse('book-appointment'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_list_meetings_queries_do_not_grow_with_page_size(self):
+        # ETag (owner lookup + aggregate), then owner lookup, count and page, however many meetings are on the page
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('list-meetings', kwargs={'user_id': self.user.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # A matching If-None-Match stops after the ETag
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('list-meetings', kwargs={'user_id': self.user.id}),
+                                       HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -1,8 +1,10 @@
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from rest_framework.exceptions import ValidationError
 from rest_framework.test import APITestCase
 from datetime import time, date
-from core.models import User, Availability, Meeting
+from core.models import User, Availability
 from core.serializers import (
     UserSerializer,
     AvailabilitySerializer,
@@ -10,6 +12,8 @@ from core.serializers import (
     MeetingSerializer,
 )
 from core.enums import MeetingStatus
+from core.services.booking_service import BookingService
+from core.services.slot_cache import SlotCache
 
 class UserSerializerTestCase(TestCase):
     def setUp(self):
@@ -119,6 +123,62 @@ class SetAvailabilitySerializerTestCase(TestCase):
         self.assertEqual(availability.end_time, time(17, 0))
 
 
+    def test_save_replaces_only_given_days(self):
+        Availability.objects.create(calendar_owner=self.user, day_of_week=1,
+                                    start_time=time(8, 0), end_time=time(9, 0))
+        Availability.objects.create(calendar_owner=self.user, day_of_week=2,
+                                    start_time=time(8, 0), end_time=time(9, 0))
+        data = dict(self.availability_data, availabilities=[
+            {'day_of_week': 1, 'start_time': '09:00', 'end_time': '12:00'},
+            {'day_of_week': 1, 'start_time': '13:00', 'end_time': '17:00'},
+            {'specific_date': '2025-03-03', 'start_time': '10:00', 'end_time': '11:00'},
+        ])
+        serializer = SetAvailabilitySerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        self.assertEqual(
+            sorted(self.user.availabilities.filter(day_of_week=1).values_list('start_time', flat=True)),
+            [time(9, 0), time(13, 0)]
+        )
+        self.assertTrue(self.user.availabilities.filter(day_of_week=2, start_time=time(8, 0)).exists())
+        self.assertTrue(self.user.availabilities.filter(specific_date=date(2025, 3, 3)).exists())
+
+    def test_save_weekly_template_query_count(self):
+        data = dict(self.availability_data, availabilities=[
+            {'day_of_week': day, 'start_time': f'{hour:02d}:00', 'end_time': f'{hour:02d}:30'}
+            for day in range(7) for hour in range(7, 14)
+        ])
+        serializer = SetAvailabilitySerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+
+        # One select and one bulk insert; the delete is skipped because no old rules match
+        with CaptureQueriesContext(connection) as queries:
+            serializer.save()
+        self.assertEqual(len([query for query in queries if 'core_availability' in query['sql']]), 2)
+        self.assertEqual(self.user.availabilities.count(), 49)
+
+        # Saving the same template again only reads
+        with self.assertNumQueries(3):
+            serializer.save()
+
+    def test_save_invalidates_only_changed_days(self):
+        Availability.objects.create(calendar_owner=self.user, day_of_week=0,
+                                    start_time=time(9, 0), end_time=time(12, 0))
+        Availability.objects.create(calendar_owner=self.user, day_of_week=1,
+                                    start_time=time(9, 0), end_time=time(12, 0))
+        monday, tuesday = date(2025, 3, 3), date(2025, 3, 4)
+        BookingService.get_available_slots(self.user, monday)
+        BookingService.get_available_slots(self.user, tuesday)
+
+        serializer = SetAvailabilitySerializer(data=self.availability_data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        self.assertIsNotNone(SlotCache.get(self.user.id, monday)[1])
+        self.assertIsNone(SlotCache.get(self.user.id, tuesday)[1])
+        self.assertEqual(len(BookingService.get_available_slots(self.user, tuesday)['time_slots']), 8)
+
 
 class MeetingSerializerTestCase(APITestCase):
     def setUp(self):
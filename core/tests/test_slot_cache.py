@@ -0,0 +1,176 @@
+from django.test import TestCase, override_settings
+from django.core.cache import cache
+from unittest.mock import MagicMock, patch
+from datetime import date, timedelta
+from django.db import connection
+from django.utils import timezone
+from core.services.slot_cache import SlotCache
+import threading
+import time
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class SlotCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner_id = 1
+        self.first = date(2025, 1, 27)
+        self.second = date(2025, 1, 28)
+
+    def test_get_and_set(self):
+        cache_key, cached = SlotCache.get(self.owner_id, self.first)
+        self.assertIsNone(cached)
+
+        SlotCache.set(cache_key, {'time_slots': []})
+        self.assertEqual(SlotCache.get(self.owner_id, self.first), (cache_key, {'time_slots': []}))
+
+    def test_invalidate_date(self):
+        for day in (self.first, self.second):
+            cache_key, _ = SlotCache.get(self.owner_id, day)
+            SlotCache.set(cache_key, {'search_date': day})
+
+        SlotCache.invalidate(self.owner_id, self.first)
+
+        self.assertIsNone(SlotCache.get(self.owner_id, self.first)[1])
+        self.assertEqual(SlotCache.get(self.owner_id, self.second)[1], {'search_date': self.second})
+
+    def test_invalidate_owner(self):
+        for day in (self.first, self.second):
+            cache_key, _ = SlotCache.get(self.owner_id, day)
+            SlotCache.set(cache_key, {'search_date': day})
+        other_key, _ = SlotCache.get(2, self.first)
+        SlotCache.set(other_key, {'search_date': self.first})
+
+        SlotCache.invalidate(self.owner_id)
+
+        _, cached = SlotCache.get_many(self.owner_id, [self.first, self.second])
+        self.assertEqual(cached, {})
+        self.assertIsNotNone(SlotCache.get(2, self.first)[1])
+
+    def test_evicted_owner_version_does_not_revive_old_entries(self):
+        cache_key, _ = SlotCache.get(self.owner_id, self.first)
+        SlotCache.set(cache_key, {'search_date': self.first})
+
+        cache.delete(SlotCache._owner_version_key(self.owner_id))
+
+        self.assertIsNone(SlotCache.get(self.owner_id, self.first)[1])
+
+    def test_version_counters_expire(self):
+        SlotCache.version_tag(self.owner_id, [self.first])
+        SlotCache.invalidate_days(self.owner_id, weekdays=[self.first.weekday()])
+        version_keys = [
+            cache.make_key(SlotCache._owner_version_key(self.owner_id)),
+            cache.make_key(SlotCache._weekday_version_key(self.owner_id, self.first.weekday())),
+            cache.make_key(SlotCache._date_version_key(self.owner_id, self.first)),
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT expires FROM cache_table WHERE cache_key IN ({', '.join(['%s'] * len(version_keys))})",
+                version_keys,
+            )
+            expires = [row[0] for row in cursor.fetchall()]
+
+        # Stored as naive UTC, like DatabaseCache itself writes them
+        latest = timezone.now().replace(tzinfo=None) + timedelta(seconds=SlotCache.version_timeout)
+        self.assertEqual(len(expires), 3)
+        self.assertTrue(all(expiry <= latest for expiry in expires), expires)
+
+    def test_local_tier_stays_coherent_with_versions(self):
+        cache_key, _ = SlotCache.get(self.owner_id, self.first)
+        SlotCache.set(cache_key, {'search_date': self.first})
+
+        # Only the generation counters are read from the shared cache on a local hit
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(SlotCache.get(self.owner_id, self.first)[1])
+
+        SlotCache.invalidate(self.owner_id, self.first)
+        self.assertIsNone(SlotCache.get(self.owner_id, self.first)[1])
+
+    def test_invalidate_weekdays(self):
+        # 2025-01-27 and 2025-02-03 are Mondays, 2025-01-28 is a Tuesday
+        days = [self.first, self.second, date(2025, 2, 3)]
+        for day in days:
+            cache_key, _ = SlotCache.get(self.owner_id, day)
+            SlotCache.set(cache_key, {'search_date': day})
+
+        SlotCache.invalidate_days(self.owner_id, weekdays=[0])
+
+        _, cached = SlotCache.get_many(self.owner_id, days)
+        self.assertEqual(list(cached), [self.second])
+
+
+@override_settings(CACHES=LOCMEM_CACHES, SLOT_CACHE_LEASE_WAIT=1)
+class SingleFlightTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner_id = 1
+        self.day = date(2025, 1, 27)
+        self.before = SlotCache.stats()
+
+    def counted(self, name):
+        return SlotCache.stats()[name] - self.before[name]
+
+    def hold_lease(self):
+        cache_key, _ = SlotCache.get(self.owner_id, self.day)
+        cache.add(f"{cache_key}_lease", True)
+        return cache_key
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'search_date': self.day}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(SlotCache.get_or_compute(self.owner_id, self.day, compute)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'search_date': self.day}] * 8)
+        self.assertEqual(self.counted('coalesced'), 7)
+
+    def test_waits_for_lease_holder(self):
+        cache_key = self.hold_lease()
+        threading.Timer(0.05, SlotCache.set, args=(cache_key, {'search_date': self.day})).start()
+
+        compute = MagicMock()
+        self.assertEqual(SlotCache.get_or_compute(self.owner_id, self.day, compute), {'search_date': self.day})
+        compute.assert_not_called()
+
+    @override_settings(SLOT_CACHE_LEASE_WAIT=0.05)
+    def test_computes_when_lease_holder_is_too_slow(self):
+        self.hold_lease()
+        self.assertEqual(SlotCache.get_or_compute(self.owner_id, self.day, lambda: {'fresh': True}), {'fresh': True})
+        self.assertEqual(self.counted('lease_timeouts'), 1)
+
+    @override_settings(SLOT_CACHE_LEASE_WAIT=0.5)
+    def test_waiters_back_off(self):
+        self.hold_lease()
+        with patch.object(SlotCache.backend, 'get', wraps=SlotCache.backend.get) as entry_get, \
+                patch.object(cache, 'get', wraps=cache.get) as lease_get:
+            SlotCache.get_or_compute(self.owner_id, self.day, lambda: {'fresh': True})
+        # One lookup before waiting, then polls after 10, 20, 40, 80, 160 and the remaining ms instead of 25 of 20 ms
+        polls = entry_get.call_count - 1
+        self.assertLessEqual(polls, 6)
+        lease_checks = [call for call in lease_get.call_args_list if call.args[0].endswith('_lease')]
+        self.assertEqual(len(lease_checks), polls // SlotCache.lease_check_every)
+
+    @override_settings(SLOT_CACHE_STALE_WINDOW=30)
+    def test_serves_stale_value_during_recomputation(self):
+        SlotCache.get_or_compute(self.owner_id, self.day, lambda: {'version': 1})
+        SlotCache.invalidate(self.owner_id, self.day)
+
+        self.hold_lease()
+        compute = MagicMock()
+        self.assertEqual(SlotCache.get_or_compute(self.owner_id, self.day, compute), {'version': 1})
+        compute.assert_not_called()
+        self.assertEqual(self.counted('stale_served'), 1)
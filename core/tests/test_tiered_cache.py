@@ -0,0 +1,61 @@
+from django.test import TestCase, SimpleTestCase
+from django.core.cache import cache
+from unittest.mock import patch
+from core.services.tiered_cache import LocalLRUCache, TwoTierCache
+
+
+class LocalLRUCacheTestCase(SimpleTestCase):
+    def test_get_and_set(self):
+        local = LocalLRUCache(max_entries=2, timeout=60)
+        local.set('a', 1)
+        self.assertEqual(local.get('a'), 1)
+        self.assertIsNone(local.get('b'))
+        self.assertEqual(local.stats()['hits'], 1)
+        self.assertEqual(local.stats()['misses'], 1)
+
+    def test_evicts_least_recently_used(self):
+        local = LocalLRUCache(max_entries=2, timeout=60)
+        local.set('a', 1)
+        local.set('b', 2)
+        local.get('a')
+        local.set('c', 3)
+
+        self.assertEqual(local.get('a'), 1)
+        self.assertIsNone(local.get('b'))
+        self.assertEqual(local.stats()['evictions'], 1)
+
+    def test_expires_entries(self):
+        local = LocalLRUCache(max_entries=2, timeout=60)
+        with patch('core.services.tiered_cache.time.monotonic', return_value=100):
+            local.set('a', 1)
+        with patch('core.services.tiered_cache.time.monotonic', return_value=161):
+            self.assertIsNone(local.get('a'))
+        self.assertEqual(local.stats()['expirations'], 1)
+
+    def test_disabled_when_empty(self):
+        local = LocalLRUCache(max_entries=0)
+        local.set('a', 1)
+        self.assertIsNone(local.get('a'))
+
+
+class TwoTierCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tiers = TwoTierCache(local=LocalLRUCache(max_entries=10, timeout=60), shared=cache)
+
+    def test_local_hit_skips_shared_cache(self):
+        self.tiers.set('key', 'value', timeout=3600)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.tiers.get('key'), 'value')
+
+    def test_shared_hit_fills_local_tier(self):
+        cache.set('key', 'value')
+        self.assertEqual(self.tiers.get('key'), 'value')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.tiers.get_many(['key']), {'key': 'value'})
+
+    def test_delete(self):
+        self.tiers.set('key', 'value')
+        self.tiers.delete('key')
+        self.assertIsNone(self.tiers.get('key'))
+        self.assertIsNone(cache.get('key'))
@@ -1,7 +1,8 @@
 from django.test import TestCase
 from datetime import date, time, datetime
-from core.utils import convert_to_utc
+from core.utils import convert_to_utc, prefix_upper_bound
 import pytz
+import sys
 
 class UtilsTestCase(TestCase):
     def test_convert_to_utc(self):
@@ -24,4 +25,9 @@ class UtilsTestCase(TestCase):
         ist_time = time(12, 0, 0)
         ist_timezone = 'Asia/Kolkata'
         expected_utc_time = pytz.UTC.localize(datetime(2023, 10, 1, 6, 30, 0))
-        self.assertEqual(convert_to_utc(ist_date, ist_time, ist_timezone), expected_utc_time)
\ No newline at end of file
+        self.assertEqual(convert_to_utc(ist_date, ist_time, ist_timezone), expected_utc_time)
+
+    def test_prefix_upper_bound(self):
+        self.assertEqual(prefix_upper_bound('jo'), 'jp')
+        self.assertEqual(prefix_upper_bound('a' + chr(sys.maxunicode)), 'b')
+        self.assertIsNone(prefix_upper_bound(chr(sys.maxunicode)))
@@ -1,11 +1,16 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.core.cache import cache
 from django.urls import reverse
+from django.utils import timezone
 from unittest.mock import patch
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from core.models import User, Availability, Meeting
-from datetime import time, date
+from core.services.booking_service import BookingService
+from datetime import datetime, time, date, timedelta
 import json
+import pytz
 
 class UserTests(TestCase):
     def setUp(self):
@@ -21,7 +26,53 @@ class UserTests(TestCase):
         User.objects.create(**self.user_data)
         response = self.client.get(reverse('user-list-create'))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
+
+
+class UserListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('user-list-create')
+        for name, email in [("John Doe", "johndoe@example.com"), ("joanna Smith", "Joanna@example.com"),
+                            ("Jo", "jp@example.com"), ("Mary Major", "mary@example.com")]:
+            User.objects.create(name=name, email=email, timezone="UTC")
+        self.expected = list(User.objects.order_by('id').values_list('id', flat=True))
+
+    def test_prefix_search_ignores_case(self):
+        response = self.client.get(self.url, {"email": "JO"})
+        self.assertEqual({user["email"] for user in response.data["results"]},
+                         {"johndoe@example.com", "Joanna@example.com"})
+
+        response = self.client.get(self.url, {"name": "jo", "email": "j"})
+        self.assertEqual({user["name"] for user in response.data["results"]}, {"John Doe", "joanna Smith", "Jo"})
+
+        response = self.client.get(self.url, {"name": "Mary M", "email": "jo"})
+        self.assertEqual(response.data["results"], [])
+
+    def test_prefix_search_non_ascii(self):
+        User.objects.create(name="ÅSA Berg", email="asa@example.com", timezone="UTC")
+        for prefix in ("ÅSA", "ÅS", "Ås"):
+            response = self.client.get(self.url, {"name": prefix})
+            self.assertEqual([user["name"] for user in response.data["results"]], ["ÅSA Berg"], prefix)
+
+    def test_cursor_pagination(self):
+        response = self.client.get(self.url, {"page_size": 3})
+        self.assertEqual([user["id"] for user in response.data["results"]], self.expected[:3])
+        self.assertIsNone(response.data["previous"])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual([user["id"] for user in response.data["results"]], self.expected[3:])
+        self.assertIsNone(response.data["next"])
+
+    def test_stream_matches_list(self):
+        response = self.client.get(self.url, {"stream": "true", "email": "jo"})
+        self.assertEqual(response["Content-Type"], "application/json")
+        streamed = b"".join(response.streaming_content)
+        page = self.client.get(self.url, {"email": "jo"}).data["results"]
+        self.assertEqual(streamed, JSONRenderer().render(page))
+
+        response = self.client.get(self.url, {"stream": "true", "email": "nobody"})
+        self.assertEqual(b"".join(response.streaming_content), b"[]")
 
 
 class UserDetailTests(TestCase):
@@ -93,14 +144,91 @@ class MeetingTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
 
+    def test_list_meetings_date_range(self):
+        for days in (-3, 0, 2, 5):
+            Meeting.objects.create(
+                calendar_owner=self.user, invitee_name="Alice", invitee_email="alice@example.com",
+                date=date.today() + timedelta(days=days), start_time=time(10, 0), end_time=time(11, 0),
+                status="booked"
+            )
+        response = self.client.get(reverse('list-meetings', kwargs={'user_id': self.user.id}), {
+            "start_date": date.today().isoformat(),
+            "end_date": (date.today() + timedelta(days=2)).isoformat(),
+        })
+        self.assertEqual([meeting["date"] for meeting in response.data["results"]],
+                         [date.today().isoformat(), (date.today() + timedelta(days=2)).isoformat()])
+
+    def test_list_upcoming_meetings_in_owner_timezone(self):
+        self.user.timezone = "Asia/Kolkata"
+        self.user.save()
+        for day, hour in [(date(2025, 3, 9), 23), (date(2025, 3, 10), 9), (date(2025, 3, 10), 14), (date(2025, 3, 11), 8)]:
+            Meeting.objects.create(
+                calendar_owner=self.user, invitee_name="Alice", invitee_email="alice@example.com",
+                date=day, start_time=time(hour, 0), end_time=time(hour, 30), status="booked"
+            )
+
+        # 06:30 UTC is 12:00 in Kolkata: only the afternoon meeting and the next day remain
+        local_now = pytz.UTC.localize(datetime(2025, 3, 10, 6, 30)).astimezone(pytz.timezone("Asia/Kolkata"))
+        with patch('core.services.meeting_service.now_in_timezone', return_value=local_now):
+            response = self.client.get(reverse('list-meetings', kwargs={'user_id': self.user.id}), {"upcoming": "true"})
+        self.assertEqual([(meeting["date"], meeting["start_time"]) for meeting in response.data["results"]],
+                         [("2025-03-10", "14:00:00"), ("2025-03-11", "08:00:00")])
+
     @patch('core.views.BookingService.validate_token_and_slot', return_value=True)
     def test_book_appointment(self, mock_validate_token_and_slot):
         mock_validate_token_and_slot.return_value = True
+        Availability.objects.create(
+            calendar_owner=self.user,
+            specific_date=date.today(),
+            start_time=time(9, 0),
+            end_time=time(17, 0)
+        )
         response = self.client.post(reverse('book-appointment'), data=json.dumps(self.meeting_data), content_type="application/json")
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Meeting.objects.count(), 1)
 
+    @patch('core.views.BookingService.validate_token_and_slot', return_value=True)
+    def test_book_appointment_outside_availability(self, mock_validate_token_and_slot):
+        # Availability changed after the search: the slot is no longer covered by any rule
+        Availability.objects.create(
+            calendar_owner=self.user,
+            specific_date=date.today(),
+            start_time=time(13, 0),
+            end_time=time(17, 0)
+        )
+        response = self.client.post(reverse('book-appointment'), data=json.dumps(self.meeting_data), content_type="application/json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Meeting.objects.count(), 0)
+
+    def test_search_and_book_with_token(self):
+        booking_date = date.today() + timedelta(days=1)
+        Availability.objects.create(
+            calendar_owner=self.user,
+            specific_date=booking_date,
+            start_time=time(9, 0),
+            end_time=time(11, 0)
+        )
+        response = self.client.get(
+            reverse('search-available-slots', kwargs={'user_id': self.user.id}),
+            {"date": booking_date.isoformat()}
+        )
+        token = response.data["token"]
+
+        booking = dict(self.meeting_data, date=booking_date.isoformat(), start_time="09:00",
+                       end_time="10:00", token=token)
+        response = self.client.post(reverse('book-appointment'), data=json.dumps(booking),
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        # The token can only be redeemed once
+        booking.update(start_time="10:00", end_time="11:00")
+        response = self.client.post(reverse('book-appointment'), data=json.dumps(booking),
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Meeting.objects.count(), 1)
+
     def test_search_available_slots(self):
         Availability.objects.create(
             calendar_owner=self.user,
@@ -114,3 +242,434 @@ class MeetingTests(TestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("available_slots", response.data)
+
+    def test_search_available_slots_range(self):
+        Availability.objects.create(
+            calendar_owner=self.user,
+            day_of_week=date.today().weekday(),
+            start_time=time(9, 0),
+            end_time=time(11, 0)
+        )
+        start_date = date.today()
+        end_date = start_date + timedelta(days=13)
+        response = self.client.get(
+            reverse('search-available-slots', kwargs={'user_id': self.user.id}),
+            {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("token", response.data)
+        self.assertEqual(len(response.data["available_slots"]), 14)
+        self.assertEqual(len(response.data["available_slots"][0]["time_slots"]), 2)
+        self.assertEqual(len(response.data["available_slots"][7]["time_slots"]), 2)
+        self.assertEqual(response.data["available_slots"][1]["time_slots"], [])
+
+    def test_search_available_slots_range_invalid(self):
+        url = reverse('search-available-slots', kwargs={'user_id': self.user.id})
+        response = self.client.get(url, {"start_date": "2025-02-10", "end_date": "2025-02-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {"start_date": "2025-01-01", "end_date": "2025-03-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {"start_date": "2025-01-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CommonSlotsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.first = User.objects.create(name="John Doe", email="johndoe@example.com", timezone="UTC")
+        self.second = User.objects.create(name="Jane Doe", email="janedoe@example.com", timezone="UTC")
+        for user, start, end in [(self.first, time(9, 0), time(13, 0)), (self.second, time(11, 0), time(17, 0))]:
+            Availability.objects.create(calendar_owner=user, specific_date=date(2025, 3, 3),
+                                        start_time=start, end_time=end)
+
+    def test_common_slots(self):
+        response = self.client.get(reverse('common-available-slots'),
+                                   {"user_ids": f"{self.first.id},{self.second.id}", "date": "2025-03-03"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["user_ids"], [self.first.id, self.second.id])
+        self.assertEqual(response.data["available_slots"][0]["time_slots"], [
+            {"start_time": time(11, 0), "end_time": time(12, 0)},
+            {"start_time": time(12, 0), "end_time": time(13, 0)},
+        ])
+
+    def test_common_slots_unknown_user(self):
+        response = self.client.get(reverse('common-available-slots'),
+                                   {"user_ids": f"{self.first.id},999", "date": "2025-03-03"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_common_slots_requires_user_ids(self):
+        response = self.client.get(reverse('common-available-slots'), {"date": "2025-03-03"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BulkBookingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name="John Doe", email="johndoe@example.com", timezone="UTC")
+        self.booking_date = date.today() + timedelta(days=1)
+        Availability.objects.create(calendar_owner=self.user, specific_date=self.booking_date,
+                                    start_time=time(9, 0), end_time=time(13, 0))
+        response = self.client.get(
+            reverse('search-available-slots', kwargs={'user_id': self.user.id}),
+            {"date": self.booking_date.isoformat()}
+        )
+        self.token = response.data["token"]
+
+    def booking(self, start_time, end_time, **overrides):
+        return {
+            "calendar_owner": self.user.id,
+            "invitee_name": "Alice",
+            "invitee_email": "alice@example.com",
+            "date": self.booking_date.isoformat(),
+            "start_time": start_time,
+            "end_time": end_time,
+            "token": self.token,
+            **overrides,
+        }
+
+    def offer_token(self, hour):
+        # A token offering a single slot, as a search made after other bookings would issue
+        return BookingService.generate_booking_token(self.user.id, self.booking_date, [{"start_time": time(hour, 0)}])
+
+    def test_bulk_book_appointments(self):
+        bookings = [
+            self.booking("09:00", "10:00"),
+            self.booking("10:00", "11:00", token=self.offer_token(10)),
+            self.booking("09:00", "10:00", token=self.offer_token(9)),  # Conflicts with the first booking of the batch
+            self.booking("11:00", "12:00"),  # Reuses the token of the first booking
+            self.booking("11:00", "10:00"),  # Invalid
+            self.booking("12:00", "13:00", calendar_owner=999),
+        ]
+        response = self.client.post(reverse('bulk-book-appointments'), data=json.dumps({"bookings": bookings}),
+                                    content_type="application/json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["booked"], 2)
+        self.assertEqual([result["status"] for result in response.data["results"]],
+                         ["booked", "booked", "error", "error", "error", "error"])
+        self.assertEqual(response.data["results"][2]["error"], "The requested time slot is already booked.")
+        self.assertIn("already been used", response.data["results"][3]["error"])
+        self.assertEqual(Meeting.objects.filter(calendar_owner=self.user).count(), 2)
+
+        # Each meeting redeemed its own token, and the booked slots are gone from the next search
+        self.assertEqual(Meeting.objects.exclude(token=None).count(), 2)
+        response = self.client.get(
+            reverse('search-available-slots', kwargs={'user_id': self.user.id}),
+            {"date": self.booking_date.isoformat()}
+        )
+        self.assertEqual(response.data["available_slots"]["time_slots"], [
+            {"start_time": time(11, 0), "end_time": time(12, 0)},
+            {"start_time": time(12, 0), "end_time": time(13, 0)},
+        ])
+
+    def test_bulk_book_with_used_token(self):
+        self.client.post(reverse('bulk-book-appointments'),
+                         data=json.dumps({"bookings": [self.booking("09:00", "10:00")]}),
+                         content_type="application/json")
+        response = self.client.post(reverse('bulk-book-appointments'),
+                                    data=json.dumps({"bookings": [self.booking("11:00", "12:00")]}),
+                                    content_type="application/json")
+
+        self.assertEqual(response.data["booked"], 0)
+        self.assertIn("already been used", response.data["results"][0]["error"])
+
+    def test_bulk_book_requires_bookings(self):
+        response = self.client.post(reverse('bulk-book-appointments'), data=json.dumps({"bookings": []}),
+                                    content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class MeetingPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name="John Doe", email="johndoe@example.com", timezone="UTC")
+        # Created out of order, with several meetings sharing a date and a start time
+        for day, hour, meeting_status in [(3, 9, "booked"), (1, 10, "booked"), (2, 9, "booked"), (1, 9, "booked"),
+                                          (1, 9, "pending"), (3, 8, "booked"), (2, 11, "booked")]:
+            Meeting.objects.create(
+                calendar_owner=self.user, invitee_name="Alice", invitee_email="alice@example.com",
+                date=date.today() + timedelta(days=day), start_time=time(hour, 0), end_time=time(hour, 30),
+                status=meeting_status
+            )
+        self.expected = list(
+            Meeting.objects.order_by('date', 'start_time', 'id').values_list('id', flat=True)
+        )
+        self.url = reverse('list-meetings', kwargs={'user_id': self.user.id})
+
+    def test_page_number_mode_is_ordered(self):
+        response = self.client.get(self.url, {"page_size": 4, "page": 2})
+        self.assertEqual(response.data["count"], 7)
+        self.assertEqual([meeting["id"] for meeting in response.data["results"]], self.expected[4:])
+
+    def test_cursor_mode_walks_forward_and_back(self):
+        response = self.client.get(self.url, {"pagination": "cursor", "page_size": 3})
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["previous"])
+
+        seen = []
+        pages = [response]
+        while True:
+            seen.extend(meeting["id"] for meeting in response.data["results"])
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+            pages.append(response)
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(pages), 3)
+
+        # Going back from the last page returns the middle page again
+        response = self.client.get(pages[-1].data["previous"])
+        self.assertEqual([meeting["id"] for meeting in response.data["results"]], self.expected[3:6])
+        self.assertIsNotNone(response.data["next"])
+
+        response = self.client.get(response.data["previous"])
+        self.assertEqual([meeting["id"] for meeting in response.data["results"]], self.expected[:3])
+        self.assertIsNone(response.data["previous"])
+
+    def test_fast_json_matches_serializer(self):
+        for params in ({"page_size": 4, "page": 2}, {"pagination": "cursor", "page_size": 3}):
+            response = self.client.get(self.url, params)
+            fast_response = self.client.get(self.url, {**params, "fast_json": "true"})
+            self.assertEqual(fast_response.status_code, status.HTTP_200_OK)
+            self.assertEqual(fast_response["Content-Type"], "application/json")
+            # Identical apart from the links carrying the extra query parameter
+            self.assertEqual(fast_response.content.replace(b"fast_json=true&", b""), response.content)
+
+        # Links of a fast page keep working
+        next_link = json.loads(fast_response.content)["next"]
+        results = json.loads(self.client.get(next_link).content)["results"]
+        self.assertEqual([meeting["id"] for meeting in results], self.expected[3:6])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ExportMeetingsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name="John Doe", email="johndoe@example.com", timezone="UTC")
+        for days, meeting_status in [(1, "booked"), (2, "cancelled"), (3, "pending")]:
+            Meeting.objects.create(
+                calendar_owner=self.user, invitee_name="Alice", invitee_email="alice@example.com",
+                date=date.today() + timedelta(days=days), start_time=time(10, 0), end_time=time(11, 0),
+                status=meeting_status
+            )
+        self.url = reverse('export-meetings', kwargs={'user_id': self.user.id})
+
+    def read(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_ndjson(self):
+        response = self.client.get(self.url, {"start_date": (date.today() + timedelta(days=2)).isoformat()})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([row["status"] for row in rows], ["cancelled", "pending"])
+        self.assertEqual(rows[0]["calendar_owner"], self.user.id)
+        self.assertEqual(rows[0]["start_time"], "10:00:00")
+        self.assertNotIn("token", rows[0])
+
+    def test_export_csv(self):
+        response = self.client.get(self.url, {"export_format": "csv"})
+        self.assertEqual(response["Content-Type"], "text/csv")
+
+        lines = self.read(response).splitlines()
+        self.assertEqual(lines[0], "id,calendar_owner,invitee_name,invitee_email,date,start_time,end_time,status,"
+                                   "last_modified")
+        self.assertEqual(len(lines), 4)
+
+    def test_export_modified_since(self):
+        Meeting.objects.filter(status="pending").update(last_modified=datetime(2030, 1, 1, tzinfo=pytz.UTC))
+        response = self.client.get(self.url, {"modified_since": "2029-12-31T00:00:00"})
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([row["status"] for row in rows], ["pending"])
+
+    def test_export_rejects_bad_parameters(self):
+        self.assertEqual(self.client.get(self.url, {"export_format": "xml"}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {"modified_since": "yesterday"}).status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(MEETING_CHANGES_SETTLE_SECONDS=0)
+class MeetingChangesTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name="John Doe", email="johndoe@example.com", timezone="UTC")
+        self.meetings = [
+            Meeting.objects.create(
+                calendar_owner=self.user, invitee_name="Alice", invitee_email="alice@example.com",
+                date=date.today() + timedelta(days=1), start_time=time(hour, 0), end_time=time(hour, 30),
+                status="booked"
+            )
+            for hour in (9, 10, 11)
+        ]
+        self.url = reverse('meeting-changes', kwargs={'user_id': self.user.id})
+
+    def test_full_sync_in_pages(self):
+        response = self.client.get(self.url, {"page_size": 2})
+        self.assertEqual(len(response.data["upserts"]), 2)
+        self.assertTrue(response.data["has_more"])
+
+        response = self.client.get(self.url, {"page_size": 2, "cursor": response.data["cursor"]})
+        self.assertEqual([meeting["id"] for meeting in response.data["upserts"]], [self.meetings[2].id])
+        self.assertFalse(response.data["has_more"])
+
+    def test_incremental_sync(self):
+        cursor = self.client.get(self.url).data["cursor"]
+
+        # Nothing changed: empty delta, same cursor
+        response = self.client.get(self.url, {"cursor": cursor})
+        self.assertEqual(response.data["upserts"], [])
+        self.assertEqual(response.data["cursor"], cursor)
+
+        cancelled = self.meetings[0]
+        cancelled.status = "cancelled"
+        cancelled.save()
+        response = self.client.get(self.url, {"cursor": cursor})
+        self.assertEqual(response.data["upserts"], [])
+        self.assertEqual(response.data["cancellations"], [cancelled.id])
+        self.assertNotEqual(response.data["cursor"], cursor)
+
+    @override_settings(MEETING_CHANGES_SETTLE_SECONDS=5)
+    def test_late_commit_behind_cursor_is_not_skipped(self):
+        started = timezone.now()
+        Meeting.objects.filter(calendar_owner=self.user).update(last_modified=started - timedelta(seconds=60))
+        # Saved 1 s ago by a transaction that already committed
+        recent = self.meetings[2]
+        Meeting.objects.filter(id=recent.id).update(last_modified=started - timedelta(seconds=1))
+
+        response = self.client.get(self.url)
+        self.assertEqual([meeting["id"] for meeting in response.data["upserts"]],
+                         [self.meetings[0].id, self.meetings[1].id])
+        cursor = response.data["cursor"]
+
+        # A booking saved 2 s ago commits only now, stamped before the recent change
+        late = Meeting.objects.create(
+            calendar_owner=self.user, invitee_name="Bob", invitee_email="bob@example.com",
+            date=date.today() + timedelta(days=1), start_time=time(14, 0), end_time=time(14, 30), status="booked"
+        )
+        Meeting.objects.filter(id=late.id).update(last_modified=started - timedelta(seconds=2))
+
+        with patch('core.views.now', return_value=started + timedelta(seconds=5)):
+            response = self.client.get(self.url, {"cursor": cursor})
+        self.assertEqual([meeting["id"] for meeting in response.data["upserts"]], [late.id, recent.id])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name="John Doe", email="johndoe@example.com", timezone="UTC")
+        self.search_date = date.today() + timedelta(days=1)
+        Availability.objects.create(calendar_owner=self.user, specific_date=self.search_date,
+                                    start_time=time(9, 0), end_time=time(12, 0))
+        self.search_url = reverse('search-available-slots', kwargs={'user_id': self.user.id})
+        self.search_params = {"date": self.search_date.isoformat(), "include_token": "false"}
+
+    def test_slot_search_not_modified_until_booking(self):
+        response = self.client.get(self.search_url, self.search_params)
+        self.assertNotIn("token", response.data)
+        etag = response["ETag"]
+
+        with patch('core.views.BookingService.get_available_slots') as get_available_slots:
+            response = self.client.get(self.search_url, self.search_params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        get_available_slots.assert_not_called()
+
+        # Book through a separately issued token: the next poll gets the new slots
+        token = self.client.get(reverse('booking-token', kwargs={'user_id': self.user.id}),
+                                {"date": self.search_date.isoformat()}).data["token"]
+        response = self.client.post(reverse('book-appointment'), data=json.dumps({
+            "calendar_owner": self.user.id, "invitee_name": "Alice", "invitee_email": "alice@example.com",
+            "date": self.search_date.isoformat(), "start_time": "09:00", "end_time": "10:00", "token": token,
+        }), content_type="application/json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get(self.search_url, self.search_params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["available_slots"]["time_slots"]), 2)
+
+    def test_slot_search_unknown_user_has_no_etag(self):
+        url = reverse('search-available-slots', kwargs={'user_id': self.user.id + 1})
+        response = self.client.get(url, self.search_params)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.has_header("ETag"))
+        self.assertIsNone(cache.get(f"timeslots_version_user_{self.user.id + 1}"))
+
+    def test_slot_search_with_token_has_no_etag(self):
+        response = self.client.get(self.search_url, {"date": self.search_date.isoformat()})
+        self.assertIn("token", response.data)
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_meeting_list_not_modified_until_change(self):
+        url = reverse('list-meetings', kwargs={'user_id': self.user.id})
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Meeting.objects.create(calendar_owner=self.user, invitee_name="Alice", invitee_email="alice@example.com",
+                               date=self.search_date, start_time=time(9, 0), end_time=time(10, 0), status="booked")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+
+
+class CalendarFeedTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create(name="John Doe", email="johndoe@example.com", timezone="Asia/Kolkata")
+        self.meeting = Meeting.objects.create(
+            calendar_owner=self.user, invitee_name="Alice, Jr.", invitee_email="alice@example.com",
+            date=date(2030, 1, 15), start_time=time(10, 0), end_time=time(11, 0), status="booked"
+        )
+        Meeting.objects.create(
+            calendar_owner=self.user, invitee_name="Bob", invitee_email="bob@example.com",
+            date=date(2030, 1, 16), start_time=time(10, 0), end_time=time(11, 0), status="cancelled"
+        )
+        self.url = reverse('calendar-feed', kwargs={'user_id': self.user.id})
+
+    def test_feed_in_utc(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="text/calendar")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+
+        body = b"".join(response.streaming_content).decode()
+        self.assertTrue(body.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertIn(f"UID:meeting-{self.meeting.id}@calendar-booking-system\r\n", body)
+        # 10:00 in Kolkata is 04:30 UTC
+        self.assertIn("DTSTART:20300115T043000Z\r\n", body)
+        self.assertIn("SUMMARY:Meeting with Alice\\, Jr.\r\n", body)
+        self.assertEqual(body.count("BEGIN:VEVENT"), 1)
+
+    def test_invitee_cannot_inject_feed_lines(self):
+        Meeting.objects.create(
+            calendar_owner=self.user, invitee_name="Eve\r\nBEGIN:VEVENT\r\nSUMMARY:Injected",
+            invitee_email="eve@example.com\nSUMMARY:Injected", date=date(2030, 1, 17),
+            start_time=time(10, 0), end_time=time(11, 0), status="booked"
+        )
+        body = b"".join(self.client.get(self.url).streaming_content).decode()
+        lines = body.replace("\r\n ", "").split("\r\n")
+        self.assertEqual(lines.count("BEGIN:VEVENT"), 2)
+        self.assertNotIn("SUMMARY:Injected", lines)
+        self.assertIn('ATTENDEE;CN="Eve  BEGIN:VEVENT  SUMMARY:Injected":mailto:eve@example.comSUMMARY:Injected', lines)
+        self.assertIn("SUMMARY:Meeting with Eve\\nBEGIN:VEVENT\\nSUMMARY:Injected", lines)
+        # Every line break in the body belongs to the CRLF line structure
+        self.assertNotIn("\n", body.replace("\r\n", ""))
+        self.assertNotIn("\r", body.replace("\r\n", ""))
+
+    def test_feed_is_cached_and_conditional(self):
+        response = self.client.get(self.url)
+        streamed = b"".join(response.streaming_content)
+        etag = response["ETag"]
+
+        # The rendered feed is served from the cache, then skipped entirely for a matching ETag
+        response = self.client.get(self.url)
+        self.assertEqual(response.content, streamed)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+
+        self.user.timezone = "UTC"
+        self.user.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("DTSTART:20300115T100000Z", b"".join(response.streaming_content).decode())
@@ -1,26 +1,55 @@
 from django.urls import path
-from .views import UserListCreateView, UserDetailView
+from .views import UserListCreateView, UserDetailView, ImportUsersView
 from .views import SetAvailabilityView
-from .views import ListMeetingsView
+from .views import ListMeetingsView, ExportMeetingsView, MeetingChangesView
 # from .views import CreateMeetingView, ListMeetingsView, RescheduleMeetingView, UpdateMeetingStatusView
-from .views import SearchAvailableSlotsView, BookAppointmentView
+from .views import SearchAvailableSlotsView, BookAppointmentView, BookingTokenView
+from .views import CalendarFeedView
+from .async_views import AsyncSearchAvailableSlotsView, AsyncBookAppointmentView
+from .views import CommonAvailableSlotsView, BulkBookAppointmentView
 
 urlpatterns = [
     path('users/', UserListCreateView.as_view(), name='user-list-create'),
     path('users/<int:pk>/', UserDetailView.as_view(), name='user-detail'),
+
+    # Create owners and their availability rules in bulk from a CSV or NDJSON file
+    path('users/import/', ImportUsersView.as_view(), name='import-users'),
     path('set-availability/', SetAvailabilityView.as_view(), name='set-availability'),
     # path('meetings/', CreateMeetingView.as_view(), name='create-meeting'),
 
     # List all meetings for a calendar owner
     path('meetings/<int:user_id>/', ListMeetingsView.as_view(), name='list-meetings'),
 
+    # Stream every meeting of a calendar owner as NDJSON or CSV
+    path('meetings/<int:user_id>/export/', ExportMeetingsView.as_view(), name='export-meetings'),
+
+    # Meetings changed since a cursor, for incremental sync
+    path('meetings/<int:user_id>/changes/', MeetingChangesView.as_view(), name='meeting-changes'),
+
     # Reschedule an existing meeting
     # path('meetings/<int:meeting_id>/reschedule/', RescheduleMeetingView.as_view(), name='reschedule-meeting'),
 
     # Update status of a meeting
     path('calendar/<int:user_id>/available-slots/', SearchAvailableSlotsView.as_view(), name='search-available-slots'),
+
+    # iCalendar subscription feed of a calendar owner's meetings
+    path('calendar/<int:user_id>/feed.ics', CalendarFeedView.as_view(), name='calendar-feed'),
+
+    # Booking token for the slots of a date or range, issued apart from the cacheable search
+    path('calendar/<int:user_id>/booking-token/', BookingTokenView.as_view(), name='booking-token'),
+
+    # Slots where several calendar owners are all free
+    path('calendar/common-slots/', CommonAvailableSlotsView.as_view(), name='common-available-slots'),
     
     # Book Appointment
     path('calendar/book-appointment/', BookAppointmentView.as_view(), name='book-appointment'),
+
+    # Book several appointments in one request
+    path('calendar/book-appointments/', BulkBookAppointmentView.as_view(), name='bulk-book-appointments'),
     # path('meetings/<int:meeting_id>/status/', UpdateMeetingStatusView.as_view(), name='update-meeting-status'),
+
+    # Async (ASGI) variants of slot search and booking
+    path('async/calendar/<int:user_id>/available-slots/', AsyncSearchAvailableSlotsView.as_view(),
+         name='async-search-available-slots'),
+    path('async/calendar/book-appointment/', AsyncBookAppointmentView.as_view(), name='async-book-appointment'),
 ]
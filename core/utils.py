@@ -1,4 +1,5 @@
 import pytz
+import sys
 from datetime import datetime
 from django.utils.timezone import make_aware
 
@@ -16,3 +17,18 @@ def convert_to_utc(date, time, timezone_str):
     # Convert to UTC
     utc_time = localized_time.astimezone(pytz.UTC)
     return utc_time
+
+def now_in_timezone(timezone_str):
+    """
+    Returns the current time as an aware datetime in the given timezone.
+    """
+    return datetime.now(pytz.UTC).astimezone(pytz.timezone(timezone_str))
+
+def prefix_upper_bound(prefix):
+    """
+    Returns the smallest string sorting after every string that starts with prefix, or None if there is none.
+    """
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
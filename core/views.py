@@ -1,37 +1,197 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.parsers import MultiPartParser
+from rest_framework.renderers import JSONRenderer
 from .models import User, Meeting, Availability
 from .serializers import UserSerializer
 from .serializers import SetAvailabilitySerializer
 from .serializers import MeetingSerializer
+from .serializers import BulkBookingSerializer, BulkBookingItemSerializer
 from .enums import MeetingStatus
-from django.utils.dateparse import parse_date
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware, now
+from django.conf import settings
 from rest_framework.pagination import PageNumberPagination
-from .pagenation import MeetingPagination
-from django.core.cache import cache
-from datetime import datetime
+from .pagenation import MeetingPagination, MeetingCursorPagination, MeetingChangesPagination, UserCursorPagination
+from datetime import datetime, timedelta
+from django.db.models import Count, Max
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from .services.booking_service import BookingService
+from .services.meeting_service import MeetingService
+from .services.user_service import UserService
+from .services.import_service import ImportService, IMPORT_FORMATS
+from .services.slot_cache import SlotCache
+from .services import ics_feed, json_rows
 from .utils import convert_to_utc
+import io
 import pytz
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 
+def parse_date_range(query_params, max_range_days):
+    """
+    Parse either a single `date` or a `start_date`/`end_date` pair from query params.
+    """
+    if 'start_date' not in query_params and 'end_date' not in query_params:
+        try:
+            search_date = datetime.strptime(query_params.get('date', ''), "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError("A date (YYYY-MM-DD) or a start_date/end_date range is required.")
+        return search_date, search_date
+
+    try:
+        start_date = datetime.strptime(query_params.get('start_date', ''), "%Y-%m-%d").date()
+        end_date = datetime.strptime(query_params.get('end_date', ''), "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError("Both start_date and end_date are required (YYYY-MM-DD).")
+
+    if end_date < start_date:
+        raise ValueError("end_date must not be before start_date.")
+    if (end_date - start_date).days >= max_range_days:
+        raise ValueError(f"The date range cannot span more than {max_range_days} days.")
+    return start_date, end_date
+
+
+def parse_meeting_filters(query_params):
+    """
+    Parse the optional `start_date`/`end_date` filters of the meeting listing APIs.
+    """
+    parsed = {}
+    for name in ('start_date', 'end_date'):
+        value = query_params.get(name)
+        parsed[name] = parse_date(value) if value else None
+        if value and not parsed[name]:
+            raise ValueError(f"Invalid {name} format. Use YYYY-MM-DD.")
+    return parsed['start_date'], parsed['end_date']
+
+
+def include_token(query_params):
+    """
+    Slot searches issue a booking token unless `include_token=false` asks for the cacheable body only.
+    """
+    return query_params.get('include_token', 'true').lower() not in ('0', 'false')
+
+
+def is_upcoming(query_params):
+    return query_params.get('upcoming', '').lower() in ('1', 'true')
+
+
+def use_fast_json(request):
+    """
+    `fast_json=true` renders listings from values() rows without the serializer; the body is byte-for-byte the same.
+    """
+    return request.query_params.get('fast_json', '').lower() in ('1', 'true') and json_rows.renders_plain_json(request)
+
+
+def slot_search_etag(request, user_id):
+    """
+    ETag of a token-less slot search, derived from the slot cache generations of the searched dates.
+    """
+    if include_token(request.query_params):
+        return None  # Every token is unique, so such responses are never "not modified"
+    try:
+        start_date, end_date = parse_date_range(request.query_params, SearchAvailableSlotsView.max_range_days)
+    except ValueError:
+        return None
+    # Unknown owners get a plain 404, without seeding cache counters for their id
+    if not User.objects.filter(id=user_id).exists():
+        return None
+
+    dates = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+    # A single date and a one-day range have different response shapes
+    shape = 'range' if 'start_date' in request.query_params else 'date'
+    return f"{shape}-{SlotCache.version_tag(user_id, dates)}"
+
+
+def meeting_list_etag(request, user_id):
+    """
+    ETag of a meeting listing: the number of matching meetings and their latest modification.
+    """
+    try:
+        start_date, end_date = parse_meeting_filters(request.query_params)
+        calendar_owner = User.objects.get(id=user_id)
+    except (ValueError, User.DoesNotExist):
+        return None
+
+    meetings = MeetingService.list_meetings(
+        calendar_owner, start_date, end_date, upcoming=is_upcoming(request.query_params),
+    )
+    # Meetings leaving the filter (cancelled, moved, or past for "upcoming") change the count
+    summary = meetings.aggregate(count=Count('id'), last_modified=Max('last_modified'))
+    last_modified = summary['last_modified'].timestamp() if summary['last_modified'] else 0
+    return f"{summary['count']}-{last_modified}"
+
+
 class UserListCreateView(APIView):
     """
     Handles listing all users and creating a new user.
     """
     # decorate with swagger_auto_schema for this get method
     @swagger_auto_schema(
-        operation_description="Get all users",
+        operation_description="Get users in id order, a page at a time; use stream=true for a full dump",
         tags=['1.Users'],
-        responses={200: UserSerializer(many=True)}
+        manual_parameters=[
+            openapi.Parameter(
+                name='email',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='Only users whose email starts with this prefix (case-insensitive)',
+                required=False
+            ),
+            openapi.Parameter(
+                name='name',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='Only users whose name starts with this prefix (case-insensitive)',
+                required=False
+            ),
+            openapi.Parameter(
+                name='page_size',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description='Number of users per page (default 100, at most 1000)',
+                required=False
+            ),
+            openapi.Parameter(
+                name='cursor',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='Cursor taken from a next/previous link',
+                required=False
+            ),
+            openapi.Parameter(
+                name='stream',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_BOOLEAN,
+                description='Stream every matching user in id order with constant server memory, for full dumps',
+                required=False
+            ),
+        ],
+        responses={200: openapi.Response(
+            description="A page of users with opaque next/previous links, or the streamed list of every user",
+            examples={"application/json": {"next": "...", "previous": None, "results": []}},
+        )}
     )
     def get(self, request):
-        users = User.objects.all()
-        serializer = UserSerializer(users, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        users = UserService.search_users(request.query_params.get('email'), request.query_params.get('name'))
+
+        # Full dumps are encoded from values() chunks as they are read
+        if request.query_params.get('stream', '').lower() in ('1', 'true'):
+            encoder = json_rows.drf_row_encoder(UserSerializer, JSONRenderer)
+            rows = UserService.dump_rows(users, encoder.sources)
+            return StreamingHttpResponse(encoder.stream_list(rows), content_type=JSONRenderer.media_type)
+
+        # Otherwise one page at a time, so no request materializes the whole table
+        paginator = UserCursorPagination()
+        page = paginator.paginate_queryset(users, request)
+        return paginator.get_paginated_response(UserSerializer(page, many=True).data)
 
     @swagger_auto_schema(
         operation_description="Create a new user",
@@ -47,6 +207,70 @@ class UserListCreateView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class ImportUsersView(APIView):
+    """
+    API to create calendar owners and their availability rules in bulk from an uploaded CSV or NDJSON file.
+    """
+    parser_classes = [MultiPartParser]
+
+    @swagger_auto_schema(
+        operation_description="Import calendar owners, matched by email, and their availability rules from a CSV "
+                              "or NDJSON file. Invalid rows are reported by line number and skipped",
+        tags=['1.Users'],
+        manual_parameters=[
+            openapi.Parameter(
+                name='file',
+                in_=openapi.IN_FORM,
+                type=openapi.TYPE_FILE,
+                description='Rows of name, email, timezone and optionally day_of_week/specific_date/start_time/'
+                            'end_time (NDJSON may list rules under availabilities)',
+                required=True
+            ),
+            openapi.Parameter(
+                name='import_format',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=list(IMPORT_FORMATS),
+                description='Input format (default: from the file extension)',
+                required=False
+            ),
+        ],
+        responses={200: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'rows': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'failed': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'users_created': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'rules_created': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'errors': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            'line': openapi.Schema(type=openapi.TYPE_INTEGER),
+                            'error': openapi.Schema(type=openapi.TYPE_OBJECT),
+                        }
+                    )
+                )
+            }
+        )}
+    )
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "Upload the rows as a 'file' form field."}, status=status.HTTP_400_BAD_REQUEST)
+
+        import_format = request.query_params.get('import_format') or ImportService.format_for_file_name(upload.name)
+        if import_format not in IMPORT_FORMATS:
+            return Response({"error": "import_format must be one of: csv, ndjson."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # Uploads beyond FILE_UPLOAD_MAX_MEMORY_SIZE are spooled to disk, and lines are read from there
+        lines = io.TextIOWrapper(upload.file, encoding='utf-8-sig', errors='replace', newline='')
+        report = ImportService.import_records(ImportService.read(lines, import_format))
+        return Response(report, status=status.HTTP_200_OK)
+
+
 class UserDetailView(APIView):
     """
     Handles retrieving, updating, and deleting a single user.
@@ -90,6 +314,8 @@ class UserDetailView(APIView):
         try:
             user = User.objects.get(pk=pk)
             user.delete()
+            # Moves the owner's slot ETags on, so pollers see the 404
+            SlotCache.invalidate(pk)
             return Response({"message": "User deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
         except User.DoesNotExist:
             return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -127,20 +353,50 @@ class ListMeetingsView(APIView):
                 name='start_date',
                 in_=openapi.IN_QUERY,
                 type=openapi.TYPE_STRING,
-                description='Filter meetings starting from this date (YYYY-MM-DD)',
+                description='Filter meetings on or after this date (YYYY-MM-DD)',
                 required=False
             ),
             openapi.Parameter(
                 name='end_date',
                 in_=openapi.IN_QUERY,
                 type=openapi.TYPE_STRING,
-                description='Filter meetings ending on this date (YYYY-MM-DD)',
+                description='Filter meetings on or before this date (YYYY-MM-DD)',
+                required=False
+            ),
+            openapi.Parameter(
+                name='upcoming',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_BOOLEAN,
+                description="Only meetings starting now or later, in the calendar owner's timezone",
+                required=False
+            ),
+            openapi.Parameter(
+                name='pagination',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=['page', 'cursor'],
+                description='Pagination mode. "cursor" returns opaque next/previous links instead of page numbers '
+                            'and stays fast on deep pages (default: page)',
+                required=False
+            ),
+            openapi.Parameter(
+                name='cursor',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='Cursor taken from a next/previous link; implies cursor pagination',
+                required=False
+            ),
+            openapi.Parameter(
+                name='fast_json',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_BOOLEAN,
+                description='Render the page without the serializer, for large pages; the JSON is identical',
                 required=False
             ),
         ],
-        responses={200: MeetingSerializer(many=True)}
+        responses={200: MeetingSerializer(many=True), 304: 'Not modified since the ETag sent in If-None-Match'}
     )
-
+    @method_decorator(condition(etag_func=meeting_list_etag))
     def get(self, request, user_id):
         try:
             calendar_owner = User.objects.get(id=user_id)
@@ -148,28 +404,31 @@ class ListMeetingsView(APIView):
             return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
 
         # Get optional query parameters for filtering
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
+        try:
+            start_date, end_date = parse_meeting_filters(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         # Filter meetings and exclude cancelled ones
-        meetings = calendar_owner.meetings.exclude(status=MeetingStatus.CANCELLED.value)
+        meetings = MeetingService.list_meetings(
+            calendar_owner, start_date, end_date,
+            upcoming=is_upcoming(request.query_params),
+        )
 
-        if start_date:
-            start_date_parsed = parse_date(start_date)
-            if not start_date_parsed:
-                return Response({"error": "Invalid start_date format. Use YYYY-MM-DD."},
-                                status=status.HTTP_400_BAD_REQUEST)
-            meetings = meetings.filter(start_time__date__gte=start_date_parsed)
+        # Apply pagination, always in (date, start_time, id) order so pages are stable
+        if request.query_params.get('pagination') == 'cursor' or 'cursor' in request.query_params:
+            paginator = MeetingCursorPagination()
+        else:
+            paginator = MeetingPagination()
+            meetings = meetings.order_by(*MeetingCursorPagination.ordering)
 
-        if end_date:
-            end_date_parsed = parse_date(end_date)
-            if not end_date_parsed:
-                return Response({"error": "Invalid end_date format. Use YYYY-MM-DD."},
-                                status=status.HTTP_400_BAD_REQUEST)
-            meetings = meetings.filter(end_time__date__lte=end_date_parsed)
+        # The fast path encodes values() rows straight to the bytes the serializer would produce
+        if use_fast_json(request):
+            encoder = json_rows.drf_row_encoder(MeetingSerializer, type(request.accepted_renderer))
+            rows = paginator.paginate_queryset(meetings.values(*encoder.sources), request)
+            page = paginator.get_paginated_response(None).data
+            return HttpResponse(encoder.render_page(page, rows), content_type=request.accepted_renderer.media_type)
 
-        # Apply pagination
-        paginator = MeetingPagination()
         paginated_meetings = paginator.paginate_queryset(meetings, request)
 
         # Serialize and return paginated response
@@ -178,20 +437,186 @@ class ListMeetingsView(APIView):
     
 
 
+class ExportMeetingsView(APIView):
+    """
+    API to stream every meeting of a calendar owner as NDJSON or CSV, for bulk loads.
+    """
+    formats = {
+        'ndjson': ('application/x-ndjson', MeetingService.stream_ndjson),
+        'csv': ('text/csv', MeetingService.stream_csv),
+    }
+
+    @swagger_auto_schema(
+        operation_description="Stream all meetings of a calendar owner, cancelled ones included, "
+                              "in a single response",
+        tags=['4.Meetings'],
+        manual_parameters=[
+            openapi.Parameter(
+                name='export_format',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                enum=['ndjson', 'csv'],
+                description='Output format (default: ndjson)',
+                required=False
+            ),
+            openapi.Parameter(
+                name='start_date',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='Only meetings on or after this date (YYYY-MM-DD)',
+                required=False
+            ),
+            openapi.Parameter(
+                name='end_date',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='Only meetings on or before this date (YYYY-MM-DD)',
+                required=False
+            ),
+            openapi.Parameter(
+                name='modified_since',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='Only meetings modified at or after this ISO 8601 datetime (UTC when no offset is given)',
+                required=False
+            ),
+        ],
+        responses={200: 'Streamed NDJSON or CSV'}
+    )
+    def get(self, request, user_id):
+        try:
+            calendar_owner = User.objects.get(id=user_id)
+        except User.DoesNotExist:
+            return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in self.formats:
+            return Response({"error": "export_format must be one of: ndjson, csv."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            start_date, end_date = parse_meeting_filters(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        modified_since = request.query_params.get('modified_since')
+        if modified_since:
+            try:
+                modified_since = parse_datetime(modified_since)
+            except ValueError:
+                modified_since = None
+            if not modified_since:
+                return Response({"error": "Invalid modified_since format. Use an ISO 8601 datetime."},
+                                status=status.HTTP_400_BAD_REQUEST)
+            if is_naive(modified_since):
+                modified_since = make_aware(modified_since, pytz.UTC)
+
+        content_type, encode = self.formats[export_format]
+        rows = MeetingService.export_rows(calendar_owner, start_date, end_date, modified_since)
+        response = StreamingHttpResponse(encode(rows), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="meetings-{calendar_owner.id}.{export_format}"'
+        return response
+
+
+class MeetingChangesView(APIView):
+    """
+    API returning the meetings of a calendar owner modified since a cursor, for incremental sync.
+    """
+    @swagger_auto_schema(
+        operation_description="Meetings of a calendar owner created or modified since the given cursor. "
+                              "Call without a cursor for a full sync, then pass back the returned cursor; "
+                              "repeat while has_more is true. A change is listed once it is "
+                              "MEETING_CHANGES_SETTLE_SECONDS (a few seconds) old, so a commit in flight "
+                              "is not skipped",
+        tags=['4.Meetings'],
+        manual_parameters=[
+            openapi.Parameter(
+                name='cursor',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='Cursor returned by the previous call',
+                required=False
+            ),
+            openapi.Parameter(
+                name='page_size',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description='Maximum number of changes to return (default 100, at most 500)',
+                required=False
+            ),
+        ],
+        responses={200: openapi.Response(
+            description="Upserted meetings, ids of cancelled meetings and the cursor to resume from",
+            examples={"application/json": {"upserts": [], "cancellations": [], "cursor": "...", "has_more": False}},
+        )}
+    )
+    def get(self, request, user_id):
+        try:
+            calendar_owner = User.objects.get(id=user_id)
+        except User.DoesNotExist:
+            return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        # last_modified is stamped when a row is saved, not when its transaction commits: only rows older
+        # than the longest booking transaction are listed, so the cursor never passes one still in flight
+        settled_before = now() - timedelta(seconds=settings.MEETING_CHANGES_SETTLE_SECONDS)
+        paginator = MeetingChangesPagination()
+        changes = paginator.paginate_queryset(calendar_owner.meetings.filter(last_modified__lt=settled_before), request)
+
+        upserts = [meeting for meeting in changes if meeting.status != MeetingStatus.CANCELLED.value]
+        cancellations = [meeting.id for meeting in changes if meeting.status == MeetingStatus.CANCELLED.value]
+        # With nothing new the client keeps polling from where it already is
+        cursor = (
+            paginator.make_cursor(paginator.get_position(changes[-1])) if changes
+            else request.query_params.get(paginator.cursor_query_param)
+        )
+        return Response({
+            "upserts": MeetingSerializer(upserts, many=True).data,
+            "cancellations": cancellations,
+            "cursor": cursor,
+            "has_more": paginator.next_position is not None,
+        })
+
+
 class SearchAvailableSlotsView(APIView):
     """
-    API to search available slots for a given calendar owner on a specific date.
+    API to search available slots for a given calendar owner on a specific date or date range.
     """
+    max_range_days = 31
+
     @swagger_auto_schema(
-        operation_description="Search available slots for a calendar owner on a specific date",
+        operation_description="Search available slots for a calendar owner on a specific date, "
+                              "or for every date between start_date and end_date",
         tags=['3.Calendar'],
         manual_parameters=[
             openapi.Parameter(
                 name='date',
                 in_=openapi.IN_QUERY,
                 type=openapi.TYPE_STRING,
-                description='Search date (YYYY-MM-DD)',
-                required=True
+                description='Search date (YYYY-MM-DD). Required unless start_date and end_date are given',
+                required=False
+            ),
+            openapi.Parameter(
+                name='start_date',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='First date of a range search (YYYY-MM-DD)',
+                required=False
+            ),
+            openapi.Parameter(
+                name='end_date',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='Last date of a range search (YYYY-MM-DD); a range of at most 31 days, inclusive',
+                required=False
+            ),
+            openapi.Parameter(
+                name='include_token',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_BOOLEAN,
+                description='Issue a booking token with the slots (default: true). With false the response carries '
+                            'an ETag and If-None-Match polls get 304 Not Modified; fetch the token from the '
+                            'booking-token API before booking',
+                required=False
             ),
         ],
         responses={200: openapi.Schema(
@@ -209,8 +634,9 @@ class SearchAvailableSlotsView(APIView):
                     )
                 )
             }
-        )}
+        ), 304: 'Not modified since the ETag sent in If-None-Match'}
     )
+    @method_decorator(condition(etag_func=slot_search_etag))
     def get(self, request, user_id):
         # Fetch the calendar owner ---
         try:
@@ -218,6 +644,9 @@ class SearchAvailableSlotsView(APIView):
         except User.DoesNotExist:
             return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
 
+        if 'start_date' in request.query_params or 'end_date' in request.query_params:
+            return self.get_range(request, calendar_owner)
+
         # Parse the requested date (YYYY-MM-DD) ---
         search_date_str = request.query_params.get('date')
         if not search_date_str:
@@ -236,12 +665,11 @@ class SearchAvailableSlotsView(APIView):
 
         # Fetch available slots (no timezone logic) ---
         time_slots = BookingService.get_available_slots(calendar_owner, search_date)
+        if not include_token(request.query_params):
+            return Response({"available_slots": time_slots}, status=status.HTTP_200_OK)
 
-        # Generate booking token (optional, not timezone-related) ---
-        token = BookingService.generate_booking_token(calendar_owner.id, search_date)
-
-        # Save the time_slots in the cache under the token (valid for 1 hour)
-        cache.set(token, time_slots, timeout=3600)
+        # Generate a signed booking token for the offered slots (valid for 1 hour) ---
+        token = BookingService.generate_booking_token(calendar_owner.id, search_date, time_slots['time_slots'])
 
         # Return the response ---
         return Response(
@@ -249,9 +677,229 @@ class SearchAvailableSlotsView(APIView):
             status=status.HTTP_200_OK
         )
 
+    def get_range(self, request, calendar_owner):
+        """
+        Search every date between start_date and end_date with a single batched lookup.
+        """
+        try:
+            start_date, end_date = parse_date_range(request.query_params, self.max_range_days)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        days = BookingService.get_available_slots_for_range(calendar_owner, start_date, end_date)
+        if not include_token(request.query_params):
+            return Response({"available_slots": days}, status=status.HTTP_200_OK)
+
+        # One signed token covers every day of the range
+        token = BookingService.generate_range_booking_token(calendar_owner.id, days)
+
+        return Response(
+            {"token": token, "available_slots": days},
+            status=status.HTTP_200_OK
+        )
+
 
     
 
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """
+    Always use the first renderer, so clients sending `Accept: text/calendar` are not refused with 406.
+    """
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class CalendarFeedView(APIView):
+    """
+    API serving a calendar owner's meetings as an iCalendar subscription feed.
+    """
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    @swagger_auto_schema(
+        operation_description="iCalendar (ICS) feed of a calendar owner's meetings, for subscribing from "
+                              "calendar apps. Supports If-None-Match",
+        tags=['4.Meetings'],
+        responses={200: 'text/calendar feed', 304: 'Not modified since the ETag sent in If-None-Match'}
+    )
+    def get(self, request, user_id):
+        try:
+            calendar_owner = User.objects.get(id=user_id)
+        except User.DoesNotExist:
+            return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        # Subscription clients poll: answer from the version alone whenever possible
+        version = ics_feed.feed_version(calendar_owner)
+        etag = quote_etag(version)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            cached = ics_feed.get_cached_feed(calendar_owner, version)
+            if cached is not None:
+                response = HttpResponse(cached, content_type='text/calendar; charset=utf-8')
+            else:
+                response = StreamingHttpResponse(
+                    ics_feed.stream_feed(calendar_owner, version), content_type='text/calendar; charset=utf-8'
+                )
+            response['Content-Disposition'] = f'inline; filename="calendar-{calendar_owner.id}.ics"'
+        response['ETag'] = etag
+        return response
+
+
+class BookingTokenView(APIView):
+    """
+    API issuing a booking token for the currently available slots, separately from the cacheable slot search.
+    """
+    @swagger_auto_schema(
+        operation_description="Issue a signed booking token covering the slots currently available on a date "
+                              "or date range (valid for 1 hour)",
+        tags=['3.Calendar'],
+        manual_parameters=[
+            openapi.Parameter(
+                name='date',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='Search date (YYYY-MM-DD). Required unless start_date and end_date are given',
+                required=False
+            ),
+            openapi.Parameter(
+                name='start_date',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='First date of the range (YYYY-MM-DD)',
+                required=False
+            ),
+            openapi.Parameter(
+                name='end_date',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='Last date of the range (YYYY-MM-DD); a range of at most 31 days, inclusive',
+                required=False
+            ),
+        ],
+        responses={200: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={'token': openapi.Schema(type=openapi.TYPE_STRING)}
+        )}
+    )
+    def get(self, request, user_id):
+        try:
+            calendar_owner = User.objects.get(id=user_id)
+        except User.DoesNotExist:
+            return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            start_date, end_date = parse_date_range(request.query_params, SearchAvailableSlotsView.max_range_days)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        days = BookingService.get_available_slots_for_range(calendar_owner, start_date, end_date)
+        return Response(
+            {"token": BookingService.generate_range_booking_token(calendar_owner.id, days)},
+            status=status.HTTP_200_OK
+        )
+
+
+class CommonAvailableSlotsView(APIView):
+    """
+    API to find the slots where several calendar owners are all free.
+    """
+    max_owners = 50
+    max_range_days = 31
+
+    @swagger_auto_schema(
+        operation_description="Find the slots on a date or date range where every given calendar owner is free",
+        tags=['3.Calendar'],
+        manual_parameters=[
+            openapi.Parameter(
+                name='user_ids',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='Comma-separated calendar owner ids (at most 50)',
+                required=True
+            ),
+            openapi.Parameter(
+                name='date',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='Search date (YYYY-MM-DD). Required unless start_date and end_date are given',
+                required=False
+            ),
+            openapi.Parameter(
+                name='start_date',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='First date of a range search (YYYY-MM-DD)',
+                required=False
+            ),
+            openapi.Parameter(
+                name='end_date',
+                in_=openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description='Last date of a range search (YYYY-MM-DD); a range of at most 31 days, inclusive',
+                required=False
+            ),
+        ],
+        responses={200: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'user_ids': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)),
+                'available_slots': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            'search_date': openapi.Schema(type=openapi.TYPE_STRING),
+                            'time_slots': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={
+                                    'start_time': openapi.Schema(type=openapi.TYPE_STRING),
+                                    'end_time': openapi.Schema(type=openapi.TYPE_STRING)
+                                }
+                            ))
+                        }
+                    )
+                )
+            }
+        )}
+    )
+    def get(self, request):
+        # Parse and de-duplicate the owner ids, keeping their order ---
+        user_ids = []
+        for value in request.query_params.getlist('user_ids'):
+            for user_id in value.split(','):
+                try:
+                    user_id = int(user_id)
+                except ValueError:
+                    return Response({"error": "user_ids must be a comma-separated list of integers."},
+                                    status=status.HTTP_400_BAD_REQUEST)
+                if user_id not in user_ids:
+                    user_ids.append(user_id)
+
+        if not user_ids:
+            return Response({"error": "user_ids is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(user_ids) > self.max_owners:
+            return Response({"error": f"At most {self.max_owners} user_ids can be searched together."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            start_date, end_date = parse_date_range(request.query_params, self.max_range_days)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        existing_ids = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True))
+        missing_ids = [user_id for user_id in user_ids if user_id not in existing_ids]
+        if missing_ids:
+            return Response({"error": f"Users not found: {missing_ids}"}, status=status.HTTP_404_NOT_FOUND)
+
+        common_slots = BookingService.get_common_slots(user_ids, start_date, end_date)
+        return Response(
+            {"user_ids": user_ids, "available_slots": common_slots},
+            status=status.HTTP_200_OK
+        )
+
+
 class BookAppointmentView(APIView):
     """
     API to book an appointment for a given calendar owner on a specific date and time slot."""
@@ -276,23 +924,84 @@ class BookAppointmentView(APIView):
             # Validate token and slot
             BookingService.validate_token_and_slot(calendar_owner, token, date, start_time, end_time)
 
-            # Validate overlapping meetings
-            BookingService.validate_no_overlap(calendar_owner, date, start_time, end_time)
+            # Check for overlapping meetings and save the meeting in one transaction
+            serializer.instance = BookingService.book_appointment({
+                **serializer.validated_data,
+                'status': 'booked',
+                'token': BookingService.token_fingerprint(token),
+            })
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Save the meeting
-        serializer.save(
-            calendar_owner=calendar_owner,
-            date=date,
-            start_time=start_time,
-            end_time=end_time,
-            status='booked'
-        )
-
         # Remove cached time slots for the calendar owner
         BookingService.remove_cached_slots(calendar_owner, date)
-        BookingService.remove_cached_token(token)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+
+class BulkBookAppointmentView(APIView):
+    """
+    API to book several appointments, possibly for different calendar owners, in one request.
+    """
+    @swagger_auto_schema(
+        operation_description="Book up to 100 appointments in one request. Each booking needs a token from "
+                              "the search API, and each token books one appointment only, as on the single booking API",
+        tags=['3.Calendar'],
+        request_body=BulkBookingSerializer,
+        responses={200: openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'booked': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'failed': openapi.Schema(type=openapi.TYPE_INTEGER),
+                'results': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            'index': openapi.Schema(type=openapi.TYPE_INTEGER),
+                            'status': openapi.Schema(type=openapi.TYPE_STRING),
+                            'meeting': openapi.Schema(type=openapi.TYPE_OBJECT),
+                            'error': openapi.Schema(type=openapi.TYPE_STRING),
+                        }
+                    )
+                )
+            }
+        )}
+    )
+    def post(self, request):
+        serializer = BulkBookingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['bookings']
+
+        # Validate every booking on its own, so one bad entry does not reject the batch ---
+        results = [None] * len(items)
+        valid = []
+        for index, item in enumerate(items):
+            item_serializer = BulkBookingItemSerializer(data=item)
+            if item_serializer.is_valid():
+                valid.append((index, item_serializer.validated_data))
+            else:
+                results[index] = {"index": index, "status": "error", "error": item_serializer.errors}
+
+        owners = User.objects.in_bulk({booking['calendar_owner'] for _, booking in valid})
+        bookings = []
+        for index, booking in valid:
+            calendar_owner = owners.get(booking['calendar_owner'])
+            if calendar_owner is None:
+                results[index] = {"index": index, "status": "error", "error": "User not found"}
+            else:
+                bookings.append((index, {**booking, 'calendar_owner': calendar_owner}))
+
+        # Book everything that passed in one transaction ---
+        outcomes = BookingService.book_appointments([booking for _, booking in bookings])
+        for (index, _), (meeting, error) in zip(bookings, outcomes):
+            if meeting is not None:
+                results[index] = {"index": index, "status": "booked", "meeting": MeetingSerializer(meeting).data}
+            else:
+                results[index] = {"index": index, "status": "error", "error": error}
+
+        booked = sum(1 for result in results if result["status"] == "booked")
+        return Response(
+            {"booked": booked, "failed": len(results) - booked, "results": results},
+            status=status.HTTP_200_OK
+        )